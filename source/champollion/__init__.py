@@ -4,27 +4,65 @@ import os
 
 from ._version import __version__
 
-from .directive.js_data import AutoDataDirective
-from .directive.js_function import AutoFunctionDirective
-from .directive.js_class import (
-    AutoClassDirective, AutoMethodDirective, AutoAttributeDirective
+from .parser import (
+    fetch_environment, create_environment, merge_environment, LazyEnvironment
 )
-from .directive.js_module import AutoModuleDirective
-
-from .viewcode import ViewCode
-from .parser import fetch_environment
+from .parser.resolver import ExportResolver
+from .parser.background import BackgroundEnvironment
+from .parser import snapshot
+from .parser import storage
+from .parser import pattern
 
 
 def setup(app):
-    """Register callbacks and directives."""
+    """Register callbacks and directives.
+
+    The directives and the source code pages depend on :term:`Sphinx`, so
+    they are only imported here in order to keep :mod:`champollion.parser`
+    importable without it.
+
+    """
+    from .directive.js_data import AutoDataDirective
+    from .directive.js_function import AutoFunctionDirective
+    from .directive.js_class import (
+        AutoClassDirective, AutoMethodDirective, AutoAttributeDirective
+    )
+    from .directive.js_module import AutoModuleDirective
+    from .viewcode import ViewCode
+
     app.add_config_value("js_source", None, True)
     app.add_config_value("js_sources", [], True)
     app.add_config_value("js_environment", None, True)
+    app.add_config_value("js_lazy_parsing", False, True)
+    app.add_config_value("js_direct_rendering", False, True)
+    app.add_config_value("js_fragment_cache", False, False)
+    app.add_config_value("js_pattern_statistics", False, False)
+    app.add_config_value("js_read_workers", 0, False)
+    app.add_config_value("js_parse_workers", 0, False)
+    app.add_config_value("js_queue_size", None, False)
+    app.add_config_value("js_batch_size", 0, False)
+    app.add_config_value("js_stream_size", None, False)
+    app.add_config_value("js_snapshot", False, False)
+    app.add_config_value("js_snapshot_rescan", False, False)
+    app.add_config_value("js_value_max_length", None, "env")
+    app.add_config_value("js_environment_index", False, False)
+    app.add_config_value("js_background_parsing", False, False)
     app.add_config_value("js_class_options", [], True)
     app.add_config_value("js_module_options", [], True)
 
+    app.connect("builder-inited", enable_pattern_statistics)
     app.connect("builder-inited", fetch_javascript_environment)
+    app.connect("builder-inited", create_rst_cache)
+    app.connect("builder-inited", create_export_resolver)
+    app.connect("builder-inited", load_fragment_cache)
+    app.connect("env-before-read-docs", wait_javascript_environment)
+    app.connect("env-merge-info", merge_fragment_records)
+    app.connect("env-updated", update_fragment_cache)
+    app.connect("build-finished", save_fragment_cache)
+    app.connect("build-finished", report_pattern_statistics)
     app.connect("doctree-read", ViewCode.add_source_code_links)
+    app.connect("env-purge-doc", ViewCode.purge_modules)
+    app.connect("env-merge-info", ViewCode.merge_modules)
     app.connect("html-collect-pages", ViewCode.create_code_pages)
     app.connect("missing-reference", ViewCode.create_missing_code_link)
 
@@ -36,7 +74,9 @@ def setup(app):
     app.add_directive_to_domain("js", "automodule", AutoModuleDirective)
 
     return {
-        "version": __version__
+        "version": __version__,
+        "parallel_read_safe": True,
+        "parallel_write_safe": True
     }
 
 
@@ -47,6 +87,39 @@ def fetch_javascript_environment(app):
     the path provided via the **js_source** or **js_sources** configuration
     value.
 
+    If the **js_lazy_parsing** configuration is set to True, a
+    :class:`~champollion.parser.environment.LazyEnvironment` is used so that
+    folders are only listed and files only parsed when one of their elements
+    is first required.
+
+    Otherwise, the files are read and parsed concurrently with the number of
+    threads and processes defined by the **js_read_workers** and
+    **js_parse_workers** configuration values, and the **js_queue_size**
+    configuration value bounds the number of files waiting in between.
+    The **js_batch_size** configuration value can be set to parse the small
+    files within batches, and the **js_stream_size** configuration value can
+    be set to parse the large files as streams.
+
+    The **js_value_max_length** configuration value can be set to truncate
+    the data and attribute values recorded.
+
+    If the **js_snapshot** configuration is set to True, the folder listings
+    and the files parsed are recorded within the doctree directory, so that
+    the folders and files which have not been modified are neither listed
+    nor parsed again in the next build. The **js_snapshot_rescan**
+    configuration value can be set to True to list all the folders again.
+
+    If the **js_environment_index** configuration is set to True, the
+    environment is then written into an index within the doctree directory
+    and replaced by a read-only
+    :class:`~champollion.parser.storage.EnvironmentIndex` mapped in memory,
+    which is shared with the processes reading documents in parallel.
+
+    If the **js_background_parsing** configuration is set to True, a
+    :class:`~champollion.parser.background.BackgroundEnvironment` is used
+    instead so that the documents can be read while the environment is
+    fetched. The environment index is not written in this case.
+
     This function is called with the ``builder-inited`` Sphinx event, emitted
     when the builder object is created.
 
@@ -59,22 +132,247 @@ def fetch_javascript_environment(app):
         return
 
     if app.config.js_source is not None:
-        path = os.path.abspath(app.config.js_source)
-        app.config.js_environment = fetch_environment(path)
+        paths = [os.path.abspath(app.config.js_source)]
 
     elif len(app.config.js_sources) > 0:
-        app.config.js_environment = {}
-
-        for path in app.config.js_sources:
-            path = os.path.abspath(path)
-
-            _environment = fetch_environment(path)
-            for key in _environment.keys():
-                app.config.js_environment.setdefault(key, {})
-                app.config.js_environment[key].update(_environment[key])
+        paths = [os.path.abspath(path) for path in app.config.js_sources]
 
     else:
         raise RuntimeError(
             "Either the 'js_source' or the 'js_sources' configuration value "
             "must be provided."
         )
+
+    max_value_length = app.config.js_value_max_length
+
+    if app.config.js_lazy_parsing:
+        app.config.js_environment = LazyEnvironment(
+            *paths, max_value_length=max_value_length
+        )
+
+    else:
+        options = {
+            "workers": app.config.js_read_workers,
+            "parse_workers": app.config.js_parse_workers,
+            "queue_size": app.config.js_queue_size,
+            "batch_size": app.config.js_batch_size,
+            "stream_size": app.config.js_stream_size,
+            "max_value_length": max_value_length
+        }
+
+        if app.config.js_snapshot:
+            options["snapshot"] = snapshot.DirectorySnapshot(
+                os.path.join(app.doctreedir, snapshot.FILE_NAME),
+                max_value_length=max_value_length
+            )
+            options["snapshot"].load()
+            options["rescan"] = app.config.js_snapshot_rescan
+
+        if app.config.js_background_parsing:
+            app.config.js_environment = BackgroundEnvironment(
+                *paths, **options
+            )
+
+            if app.config.js_snapshot:
+                app.config.js_environment.add_done_callback(
+                    lambda _: options["snapshot"].save()
+                )
+
+            return
+
+        if len(paths) == 1:
+            app.config.js_environment = fetch_environment(paths[0], **options)
+
+        else:
+            app.config.js_environment = create_environment()
+
+            for path in paths:
+                merge_environment(
+                    app.config.js_environment,
+                    fetch_environment(path, **options)
+                )
+
+        if app.config.js_snapshot:
+            options["snapshot"].save()
+
+        if app.config.js_environment_index:
+            path = os.path.join(app.doctreedir, storage.FILE_NAME)
+            storage.write_index(app.config.js_environment, path)
+            app.config.js_environment = storage.EnvironmentIndex(path)
+
+
+def wait_javascript_environment(app, env, docnames):
+    """Wait for the environment fetched in the background if necessary.
+
+    The :term:`Javascript` environment must be entirely fetched before the
+    documents are read in parallel, as the background thread is not running
+    within the processes forked to read the documents.
+
+    This function is called with the ``env-before-read-docs`` Sphinx event,
+    emitted before the documents are read.
+
+    """
+    js_environment = app.config.js_environment
+
+    if isinstance(js_environment, BackgroundEnvironment) and app.parallel > 1:
+        js_environment.wait()
+
+
+def create_rst_cache(app):
+    """Create the cache of member elements generated by the directives.
+
+    The :term:`reStructuredText` elements generated for the members of each
+    module and class are recorded per element identifier and options for the
+    lifetime of the build, so that an element documented several times is
+    only generated once. The cache is dropped if the :term:`Javascript`
+    environment changes.
+
+    This function is called with the ``builder-inited`` Sphinx event, after
+    the :term:`Javascript` environment is fetched.
+
+    .. seealso::
+
+        :class:`~champollion.directive.rst_generator.RstElementCache`
+
+    """
+    from .directive.rst_generator import RstElementCache
+
+    app.js_rst_cache = RstElementCache()
+
+
+def create_export_resolver(app):
+    """Create the resolver of elements exported by each module.
+
+    The elements exported by each module are resolved once for the lifetime
+    of the build, following the re-export chains between modules.
+
+    This function is called with the ``builder-inited`` Sphinx event, after
+    the :term:`Javascript` environment is fetched.
+
+    .. seealso::
+
+        :class:`~champollion.parser.resolver.ExportResolver`
+
+    """
+    app.js_export_resolver = ExportResolver(app.config.js_environment)
+
+
+def load_fragment_cache(app):
+    """Load the cache of nodes rendered by the directives if required.
+
+    The cache is stored within the doctree directory and is only used if the
+    **js_fragment_cache** configuration value is set to True. The keys
+    computed from the elements rendered by each directive are memoized for
+    the lifetime of the build.
+
+    This function is called with the ``builder-inited`` Sphinx event.
+
+    .. seealso::
+
+        :ref:`configuration/js_fragment_cache`
+
+    """
+    app.js_fragment_cache = None
+    app.js_dependency_digests = {}
+
+    if not app.config.js_fragment_cache:
+        return
+
+    from .directive import fragment_cache
+
+    app.js_fragment_cache = fragment_cache.FragmentCache(
+        os.path.join(app.doctreedir, fragment_cache.FILE_NAME)
+    )
+    app.js_fragment_cache.load()
+
+
+def merge_fragment_records(app, builder_env, docnames, other):
+    """Merge the fragments recorded in *other* builder environment.
+
+    The fragments used by the processes reading documents in parallel are
+    recorded in their own builder environment, which is merged into the
+    main one.
+
+    This function is called with the ``env-merge-info`` Sphinx event.
+
+    """
+    if getattr(app, "js_fragment_cache", None) is None:
+        return
+
+    from .directive import fragment_cache
+
+    fragment_cache.merge_records(builder_env, other)
+
+
+def update_fragment_cache(app, builder_env):
+    """Update the cache of nodes with the fragments used in *builder_env*.
+
+    This function is called with the ``env-updated`` Sphinx event, once all
+    documents have been read.
+
+    """
+    if getattr(app, "js_fragment_cache", None) is None:
+        return
+
+    app.js_fragment_cache.update(builder_env)
+
+
+def save_fragment_cache(app, exception):
+    """Save the cache of nodes rendered by the directives if required.
+
+    The cache is not saved if the build failed.
+
+    This function is called with the ``build-finished`` Sphinx event.
+
+    """
+    if getattr(app, "js_fragment_cache", None) is None or exception:
+        return
+
+    app.js_fragment_cache.save()
+
+
+def enable_pattern_statistics(app):
+    """Record regular expression calls if required by the *app* configuration.
+
+    This function is called with the ``builder-inited`` Sphinx event, before
+    the :term:`Javascript` environment is fetched.
+
+    .. seealso::
+
+        :ref:`configuration/js_pattern_statistics`
+
+    """
+    if not app.config.js_pattern_statistics:
+        return
+
+    pattern.reset_statistics()
+    pattern.enable_instrumentation()
+
+
+def report_pattern_statistics(app, exception):
+    """Log regular expression calls recorded during the build.
+
+    Patterns are sorted by cumulative time spent, in descending order.
+
+    This function is called with the ``build-finished`` Sphinx event.
+
+    """
+    if not pattern.is_instrumented():
+        return
+
+    from sphinx.util import logging
+
+    logger = logging.getLogger(__name__)
+    pattern.disable_instrumentation()
+
+    statistics = pattern.statistics()
+    logger.info("Regular expression statistics:")
+
+    for name in sorted(
+        statistics.keys(), key=lambda _name: -statistics[_name]["time"]
+    ):
+        logger.info(
+            "    {name}: {calls} calls, {time:.4f}s".format(
+                name=name, **statistics[name]
+            )
+        )
@@ -1,8 +1,9 @@
 # :coding: utf-8
 
 from sphinx.domains.javascript import JSObject
+import docutils.nodes
 
-from .rst_generator import rst_string
+from .rst_generator import rst_string, render_rst_element
 
 
 class BaseDirective(JSObject):
@@ -49,7 +50,31 @@ class BaseDirective(JSObject):
         self.state.document.settings.env.element_environment = env
         self.state.document.settings.env.module_environment = module_env
 
-        return super(BaseDirective, self).run()
+        #: Nodes rendered directly and inserted before the content.
+        self.import_nodes = []
+
+        #: Member elements rendered directly and added after the content.
+        self.member_elements = []
+
+        nodes = super(BaseDirective, self).run()
+
+        if self.direct_rendering:
+            content_node = nodes[-1][-1]
+            content_node[0:0] = self.import_nodes
+
+            for rst_element in self.member_elements:
+                content_node.extend(render_rst_element(rst_element, self))
+
+        return nodes
+
+    @property
+    def direct_rendering(self):
+        """Indicate whether nodes should be rendered without parsing.
+
+        .. seealso:: :ref:`configuration/js_direct_rendering`
+
+        """
+        return self.state.document.settings.env.config.js_direct_rendering
 
     def generate_import_statement(
         self, environment, module_environment, force_partial_import=False
@@ -76,6 +101,10 @@ class BaseDirective(JSObject):
             import element from "module"
             import {partialElement} from "module"
 
+        If :attr:`direct_rendering` is enabled, the statement is built as a
+        literal node inserted before the content and an empty element is
+        returned.
+
         """
         name = self.options.get("alias", environment["name"])
         module_id = environment["module_id"]
@@ -86,20 +115,28 @@ class BaseDirective(JSObject):
         is_default = environment["default"]
 
         if exported and is_default and not force_partial_import:
-            return rst_string(
-                "``import {name} from \"{module}\"``\n".format(
-                    name=name, module=module_path
-                )
+            statement = "import {name} from \"{module}\"".format(
+                name=name, module=module_path
             )
 
-        if exported and (not is_default or force_partial_import):
-            return rst_string(
-                "``import {{{name}}} from \"{module}\"``\n".format(
-                    name=name, module=module_path
-                )
+        elif exported and (not is_default or force_partial_import):
+            statement = "import {{{name}}} from \"{module}\"".format(
+                name=name, module=module_path
             )
 
-        return rst_string()
+        else:
+            return rst_string()
+
+        # Build the literal node directly to prevent parsing the statement.
+        if self.direct_rendering:
+            self.import_nodes = [
+                docutils.nodes.paragraph(
+                    "", "", docutils.nodes.literal(statement, statement)
+                )
+            ]
+            return rst_string()
+
+        return rst_string("``{0}``\n".format(statement))
 
     def generate_description(self, environment):
         """Return description generated from *environment*.
@@ -0,0 +1,382 @@
+# :coding: utf-8
+
+"""Persistent cache of the nodes rendered by the directives.
+
+The nodes rendered for an element are recorded with a key computed from the
+content of the element, the directive options and the version of this
+extension, so that an element which has not changed is not rendered again
+when a page is read in a subsequent build::
+
+    >>> cache = FragmentCache("/path/to/doctrees/champollion.pickle")
+    >>> cache.load()
+    >>> nodes = cache.fetch(directive, key, directive.generate_nodes)
+    >>> cache.update(builder_env)
+    >>> cache.save()
+
+The objects registered in the :term:`Javascript` domain and the reference
+context left by the directive are recorded with the nodes so that they can
+be restored on a cache hit.
+
+The fragments used while reading documents are recorded in the builder
+environment, so that the records of the parallel readers can be merged
+before the cache is updated.
+
+"""
+
+import copy
+import hashlib
+import json
+import os
+import pickle
+
+try:
+    from collections.abc import Mapping, MutableMapping
+except ImportError:  # Python 2
+    from collections import Mapping, MutableMapping
+
+from sphinx import addnodes
+import docutils.nodes
+
+from .._version import __version__
+
+
+#: Name of the file storing the cache within the doctree directory.
+FILE_NAME = "champollion.pickle"
+
+
+def compute_key(*elements):
+    """Return unique key from *elements* and the extension version.
+
+    *elements* can be any value composed of dictionaries, lists and
+    primitive types which can be serialized in JSON. Mappings such as lazy
+    environments are converted into dictionaries.
+
+    """
+    content = json.dumps(
+        [__version__, elements], sort_keys=True, default=_serialize
+    )
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def fetch_digest(app, identifier, generator):
+    """Return key computed from the elements returned by *generator*.
+
+    *identifier* can be any hashable value identifying the elements. The key
+    is only computed once per build and memoized in the
+    *app.js_dependency_digests* dictionary, so that *generator* is not called
+    again for each directive rendering the same elements.
+
+    """
+    digests = app.js_dependency_digests
+
+    if identifier not in digests:
+        digests[identifier] = compute_key(generator())
+
+    return digests[identifier]
+
+
+def _serialize(value):
+    """Return JSON serializable value from *value*."""
+    if isinstance(value, Mapping):
+        return dict(value)
+
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+
+    raise TypeError("{0!r} is not serializable".format(value))
+
+
+def fetch_records(builder_env):
+    """Return fragments recorded while reading documents in *builder_env*.
+
+    The records are kept in the 'js_fragment_records' attribute of the
+    builder environment so that they are merged from the parallel readers.
+    The result is in the form of::
+
+        {
+            "fragments": {
+                "1b2f...": {"document": "index", "nodes": [...], ...},
+                ...
+            },
+            "used_keys": {"1b2f...": "index", ...},
+            "read_documents": {"index", ...}
+        }
+
+    """
+    if getattr(builder_env, "js_fragment_records", None) is None:
+        builder_env.js_fragment_records = {
+            "fragments": {},
+            "used_keys": {},
+            "read_documents": set(),
+        }
+
+    return builder_env.js_fragment_records
+
+
+def merge_records(builder_env, other):
+    """Merge fragments recorded in *other* builder environment."""
+    records = fetch_records(builder_env)
+    other_records = fetch_records(other)
+
+    records["fragments"].update(other_records["fragments"])
+    records["used_keys"].update(other_records["used_keys"])
+    records["read_documents"].update(other_records["read_documents"])
+
+
+class FragmentCache(object):
+    """Cache of the nodes rendered by the directives.
+
+    The cache is stored in *path* if provided. Fragments which have not been
+    used while their document was read again are dropped when the cache is
+    saved.
+
+    """
+
+    def __init__(self, path=None):
+        """Initiate empty cache which can be stored in *path*."""
+        self.path = path
+
+        self._fragments = {}
+        self._used_keys = set()
+        self._read_documents = set()
+
+    def __len__(self):
+        """Return number of fragments recorded."""
+        return len(self._fragments)
+
+    def load(self):
+        """Load fragments from :attr:`path` if available.
+
+        Fragments are ignored if the file can not be read.
+
+        """
+        if self.path is None or not os.path.isfile(self.path):
+            return
+
+        try:
+            with open(self.path, "rb") as stream:
+                fragments = pickle.load(stream)
+        except Exception:
+            return
+
+        if isinstance(fragments, dict):
+            self._fragments = fragments
+
+    def update(self, builder_env):
+        """Update fragments from the records of *builder_env*.
+
+        The records are removed from *builder_env* so that they are not
+        pickled with it.
+
+        """
+        records = fetch_records(builder_env)
+        builder_env.js_fragment_records = None
+
+        self._fragments.update(records["fragments"])
+        self._read_documents.update(records["read_documents"])
+
+        for key, document in records["used_keys"].items():
+            if key in self._fragments:
+                self._fragments[key]["document"] = document
+                self._used_keys.add(key)
+
+    def save(self):
+        """Save fragments into :attr:`path`.
+
+        Fragments recorded for documents which have been read again but which
+        have not been used are dropped.
+
+        """
+        self._fragments = dict(
+            (key, fragment) for key, fragment in self._fragments.items()
+            if key in self._used_keys
+            or fragment["document"] not in self._read_documents
+        )
+
+        if self.path is None:
+            return
+
+        with open(self.path, "wb") as stream:
+            pickle.dump(self._fragments, stream, pickle.HIGHEST_PROTOCOL)
+
+    def fetch(self, directive, key, generator):
+        """Return nodes rendered by *directive* for *key*.
+
+        *generator* is called without arguments to render the nodes if they
+        are not recorded yet or if they can not be restored in the current
+        document.
+
+        The nodes rendered are recorded in the builder environment until
+        :meth:`update` is called. Nodes which contain errors or named targets
+        are never recorded.
+
+        """
+        env = directive.state.document.settings.env
+        document = directive.state.document
+
+        records = fetch_records(env)
+        records["read_documents"].add(env.docname)
+
+        fragment = records["fragments"].get(key, self._fragments.get(key))
+        if fragment is not None and _is_restorable(fragment, document):
+            records["used_keys"][key] = env.docname
+            return _restore(fragment, directive)
+
+        domain_data = env.domaindata["js"]
+        recorders = {}
+
+        for category in ["objects", "modules"]:
+            recorders[category] = _Recorder(
+                domain_data.setdefault(category, {})
+            )
+            domain_data[category] = recorders[category]
+
+        try:
+            nodes = generator()
+        finally:
+            for category, recorder in recorders.items():
+                domain_data[category] = recorder.mapping
+
+        if not all(_is_recordable(node) for node in nodes):
+            return nodes
+
+        records["used_keys"][key] = env.docname
+        records["fragments"][key] = {
+            "document": env.docname,
+            "nodes": [_copy(node) for node in nodes],
+            "objects": recorders["objects"].items_recorded(),
+            "modules": recorders["modules"].items_recorded(),
+            "ref_context": copy.deepcopy(env.ref_context),
+        }
+
+        return nodes
+
+
+class _Recorder(MutableMapping):
+    """Mapping recording the keys set in the wrapped *mapping*.
+
+    The domain data are wrapped while the nodes are rendered so that only
+    the entries added by the directive are recorded.
+
+    """
+
+    def __init__(self, mapping):
+        """Initiate recorder for *mapping*."""
+        self.mapping = mapping
+        self._keys = set()
+
+    def __getitem__(self, key):
+        """Return value for *key* from the wrapped mapping."""
+        return self.mapping[key]
+
+    def __setitem__(self, key, value):
+        """Set *value* for *key* in the wrapped mapping and record *key*."""
+        self.mapping[key] = value
+        self._keys.add(key)
+
+    def __delitem__(self, key):
+        """Remove *key* from the wrapped mapping."""
+        del self.mapping[key]
+        self._keys.discard(key)
+
+    def __iter__(self):
+        """Iterate over the keys of the wrapped mapping."""
+        return iter(self.mapping)
+
+    def __len__(self):
+        """Return number of items in the wrapped mapping."""
+        return len(self.mapping)
+
+    def items_recorded(self):
+        """Return list of items set since the recorder was created."""
+        return [(key, self.mapping[key]) for key in sorted(self._keys)]
+
+
+def _is_recordable(node):
+    """Indicate whether *node* can be recorded.
+
+    Errors must be reported each time the node is rendered, and named targets
+    must be registered in the document.
+
+    """
+    for _node in node.traverse(docutils.nodes.Element):
+        if isinstance(_node, docutils.nodes.system_message):
+            return False
+
+        if len(_node["names"]) > 0:
+            return False
+
+    return True
+
+
+def _copy(node):
+    """Return copy of *node* detached from its document."""
+    node = node.deepcopy()
+
+    for _node in node.traverse():
+        _node.document = None
+
+    return node
+
+
+def _is_restorable(fragment, document):
+    """Indicate whether *fragment* nodes can be added to *document*.
+
+    Identifiers of the nodes must not already be used in the *document*.
+
+    """
+    for node in fragment["nodes"]:
+        for _node in node.traverse(docutils.nodes.Element):
+            if any(_id in document.ids for _id in _node["ids"]):
+                return False
+
+    return True
+
+
+def _restore(fragment, directive):
+    """Return copy of *fragment* nodes added to the *directive* document.
+
+    Objects registered in the domain and the reference context are restored.
+
+    """
+    env = directive.state.document.settings.env
+    document = directive.state.document
+    source, line = directive.state_machine.get_source_and_line(
+        directive.lineno
+    )
+
+    nodes = [node.deepcopy() for node in fragment["nodes"]]
+
+    for node in nodes:
+        for _node in node.traverse(docutils.nodes.Element):
+            _node.source, _node.line = source, line
+
+            if isinstance(_node, addnodes.pending_xref):
+                _node["refdoc"] = env.docname
+
+            for _id in _node["ids"]:
+                document.ids[_id] = _node
+
+    domain_data = env.domaindata["js"]
+
+    for category in ["objects", "modules"]:
+        for identifier, value in fragment[category]:
+            domain_data[category][identifier] = _relocate(value, env.docname)
+
+    env.ref_context.clear()
+    env.ref_context.update(copy.deepcopy(fragment["ref_context"]))
+
+    return nodes
+
+
+def _relocate(value, document_name):
+    """Return domain *value* referencing *document_name*.
+
+    The domain values are either the document name or a tuple starting with
+    the document name.
+
+    """
+    if isinstance(value, tuple):
+        return (document_name,) + value[1:]
+
+    return document_name
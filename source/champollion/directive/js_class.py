@@ -6,6 +6,7 @@ from sphinx import addnodes
 import docutils.parsers.rst.directives
 
 from .base import BaseDirective
+from .fragment_cache import compute_key, fetch_digest
 
 from .rst_generator import (
     get_rst_attribute_elements,
@@ -20,6 +21,15 @@ def _parse_members(argument):
     return [arg.strip() for arg in argument.split(",")]
 
 
+def _fetch_dependencies(environment, class_id):
+    """Return class and module environments rendered for *class_id*."""
+    class_environment = environment["class"][class_id]
+    return [
+        class_environment,
+        environment["module"].get(class_environment["module_id"])
+    ]
+
+
 class AutoClassDirective(BaseDirective):
     """Directive to render :term:`Javascript` class documentation.
 
@@ -91,6 +101,30 @@ class AutoClassDirective(BaseDirective):
         "force-partial-import": lambda x: True,
     }
 
+    def run(self):
+        """Run the directive."""
+        signature = self.arguments[0]
+
+        js_env = self.env.app.config.js_environment
+        if (
+            self.env.app.js_fragment_cache is None or
+            signature not in js_env["class"].keys()
+        ):
+            return super(AutoClassDirective, self).run()
+
+        key = compute_key(
+            "autoclass", signature, self.options,
+            self.env.config.js_class_options, self.env.ref_context,
+            fetch_digest(
+                self.env.app, ("class", signature),
+                lambda: _fetch_dependencies(js_env, signature)
+            )
+        )
+
+        return self.env.app.js_fragment_cache.fetch(
+            self, key, super(AutoClassDirective, self).run
+        )
+
     def handle_signature(self, signature, node):
         """Update the signature *node*."""
         env = self.state.document.settings.env.element_environment
@@ -138,7 +172,49 @@ class AutoClassDirective(BaseDirective):
         # Automatic boolean options
         options = self.env.config.js_class_options
 
-        # Options manually set
+        members = self.options.get("members", "members" in options)
+        if members:
+            whitelist = (
+                members if isinstance(members, collections.Iterable) else None
+            )
+
+            # Generated elements only depend on the effective options.
+            key = (
+                env["id"],
+                tuple(whitelist) if whitelist is not None else None
+            ) + tuple(
+                self.options.get(name, name in options) for name in (
+                    "skip-constructor", "undoc-members", "private-members",
+                    "skip-attribute-value"
+                )
+            )
+
+            rst_elements = self.env.app.js_rst_cache.fetch(
+                self.env.app.config.js_environment, key,
+                lambda: self.generate_rst_elements(
+                    env, options, whitelist_names=whitelist
+                )
+            )
+
+            # Members are rendered once the content is parsed.
+            if self.direct_rendering:
+                self.member_elements = rst_elements
+                return
+
+            for rst_element in rst_elements:
+                self.content += rst_element
+
+    def generate_rst_elements(self, env, options, whitelist_names=None):
+        """Return list of member :term:`reStructuredText` elements from class
+        *env* in the line order.
+
+        *options* is the dictionary of class options that can affect the
+        display of members
+
+        *whitelist_names* is an optional list of element names that
+        should be displayed exclusively.
+
+        """
         skip_constructor = self.options.get(
             "skip-constructor", "skip-constructor" in options
         )
@@ -149,41 +225,37 @@ class AutoClassDirective(BaseDirective):
             "private-members", "private-members" in options
         )
 
-        members = self.options.get("members", "members" in options)
-        if members:
-            rst_elements = {}
-
-            whitelist = (
-                members if isinstance(members, collections.Iterable) else None
-            )
-
-            # Gather class attributes
-            rst_elements = get_rst_attribute_elements(
-                env,
-                whitelist_names=whitelist,
-                blacklist_ids=env["method"].keys(),
-                undocumented_members=undoc_members,
-                private_members=private_members,
-                skip_value=self.options.get(
-                    "skip-attribute-value", "skip-attribute-value" in options
-                ),
-                rst_elements=rst_elements
-            )
+        rst_elements = {}
+
+        # Gather class attributes
+        rst_elements = get_rst_attribute_elements(
+            env,
+            whitelist_names=whitelist_names,
+            blacklist_ids=env["method"].keys(),
+            undocumented_members=undoc_members,
+            private_members=private_members,
+            skip_value=self.options.get(
+                "skip-attribute-value", "skip-attribute-value" in options
+            ),
+            rst_elements=rst_elements
+        )
 
-            # Gather class methods
-            rst_elements = get_rst_method_elements(
-                env,
-                whitelist_names=whitelist,
-                skip_constructor=skip_constructor,
-                undocumented_members=undoc_members,
-                private_members=private_members,
-                rst_elements=rst_elements,
-            )
+        # Gather class methods
+        rst_elements = get_rst_method_elements(
+            env,
+            whitelist_names=whitelist_names,
+            skip_constructor=skip_constructor,
+            undocumented_members=undoc_members,
+            private_members=private_members,
+            rst_elements=rst_elements,
+        )
 
-            # Add content while respecting the line order
-            for line_number in sorted(rst_elements.keys()):
-                for rst_element in rst_elements[line_number]:
-                    self.content += rst_element
+        # Respect the line order
+        return [
+            rst_element
+            for line_number in sorted(rst_elements.keys())
+            for rst_element in rst_elements[line_number]
+        ]
 
 
 class AutoMethodDirective(BaseDirective):
@@ -1,11 +1,14 @@
 # :coding: utf-8
 
 import collections
+import functools
 
+import sphinx
 from sphinx import addnodes
 import docutils.parsers.rst
 import docutils.parsers.rst.directives
 import docutils.nodes
+from docutils.statemachine import StringList
 
 # import rst_generator
 from .rst_generator import (
@@ -13,8 +16,96 @@ from .rst_generator import (
     get_rst_function_elements,
     get_rst_data_elements,
     get_rst_export_elements,
+    render_rst_element,
     rst_string
 )
+from .fragment_cache import compute_key, fetch_digest
+
+
+#: Comment separating the member elements parsed together.
+MEMBER_SEPARATOR = "champollion-member"
+
+
+def _fetch_dependencies(environment, module_id):
+    """Return list of module identifiers rendered for *module_id*.
+
+    Modules referenced by the imported and exported elements of each module
+    are recursively included.
+
+    """
+    dependencies = []
+
+    module_ids = [module_id]
+    visited = set(module_ids)
+
+    while len(module_ids) > 0:
+        _module_id = module_ids.pop()
+        dependencies.append(_module_id)
+
+        if _module_id not in environment["module"].keys():
+            continue
+
+        file_environment = environment["file"].get(
+            environment["module"][_module_id]["file_id"]
+        )
+        if file_environment is None:
+            continue
+
+        for category in ["import", "export"]:
+            for element in file_environment[category].values():
+                if element["module"] is not None and (
+                    element["module"] not in visited
+                ):
+                    visited.add(element["module"])
+                    module_ids.append(element["module"])
+
+    return dependencies
+
+
+def _fetch_dependency_digest(app, module_id):
+    """Return digest of the module and file environments rendered for
+    *module_id*.
+
+    The digest is built from the digest of each module returned by
+    :func:`_fetch_dependencies`, and each file environment is only
+    serialized once per build.
+
+    """
+    environment = app.config.js_environment
+
+    def _generate():
+        """Return list of digests of each module rendered."""
+        return [
+            fetch_digest(
+                app, ("module", _module_id),
+                functools.partial(_fetch_module_elements, app, _module_id)
+            )
+            for _module_id in _fetch_dependencies(environment, module_id)
+        ]
+
+    return fetch_digest(app, ("dependencies", module_id), _generate)
+
+
+def _fetch_module_elements(app, module_id):
+    """Return elements identifying the environments of *module_id*.
+
+    The file environment of the module is replaced by its digest.
+
+    """
+    environment = app.config.js_environment
+
+    if module_id not in environment["module"].keys():
+        return [module_id, None, None]
+
+    module_environment = environment["module"][module_id]
+    file_id = module_environment["file_id"]
+
+    return [
+        module_id, module_environment, fetch_digest(
+            app, ("file", file_id),
+            lambda: environment["file"].get(file_id)
+        )
+    ]
 
 
 def _parse_members(argument):
@@ -66,6 +157,11 @@ class AutoModuleDirective(docutils.parsers.rst.Directive):
         Indicate whether each import statement display within the module
         should be indicated with partial import.
 
+    * export-chain:
+        List of module identifiers which are already documented through
+        wildcard exports. It is used internally to prevent cyclic re-exports
+        from being documented endlessly.
+
     .. seealso::
 
         :ref:`directive/automodule`
@@ -99,6 +195,7 @@ class AutoModuleDirective(docutils.parsers.rst.Directive):
         "module-alias": docutils.parsers.rst.directives.unchanged_required,
         "module-path-alias": docutils.parsers.rst.directives.unchanged_required,
         "force-partial-import": lambda x: True,
+        "export-chain": lambda x: [arg.strip() for arg in x.split(",")],
     }
 
     def run(self):
@@ -114,6 +211,24 @@ class AutoModuleDirective(docutils.parsers.rst.Directive):
                 )
             )
 
+        env = self.state.document.settings.env
+        if env.app.js_fragment_cache is None:
+            return self.generate_nodes()
+
+        key = compute_key(
+            "automodule", signature, self.options,
+            env.config.js_module_options, env.config.js_class_options,
+            env.ref_context, _fetch_dependency_digest(env.app, signature)
+        )
+        return env.app.js_fragment_cache.fetch(
+            self, key, self.generate_nodes
+        )
+
+    def generate_nodes(self):
+        """Return list of nodes documenting the module."""
+        signature = self.arguments[0]
+
+        js_env = self.state.document.settings.env.app.config.js_environment
         env = self.state.document.settings.env
         module_environment = js_env["module"][signature]
 
@@ -129,17 +244,31 @@ class AutoModuleDirective(docutils.parsers.rst.Directive):
 
         # Add target to reference this module
         module_id = module_environment["id"]
-        env.domaindata["js"]["modules"][module_id] = env.docname
-        env.domaindata['js']["objects"][module_id] = (env.docname, "module")
+        node_id = "module-" + module_id
+
+        # Domain entries also record the node identifier since Sphinx 3.
+        if sphinx.version_info >= (3, 0):
+            env.domaindata["js"]["modules"][module_id] = (
+                env.docname, node_id
+            )
+            env.domaindata["js"]["objects"][module_id] = (
+                env.docname, node_id, "module"
+            )
+        else:
+            env.domaindata["js"]["modules"][module_id] = env.docname
+            env.domaindata["js"]["objects"][module_id] = (
+                env.docname, "module"
+            )
+
         target_node = docutils.nodes.target(
-            "", "", ids=["module-" + module_id], ismod=True
+            "", "", ids=[node_id], ismod=True
         )
 
         self.state.document.note_explicit_target(target_node)
         nodes.append(target_node)
         index_text = "{0} (module)".format(module_id)
         index_node = addnodes.index(
-            entries=[("single", index_text, "module-" + module_id, "", None)]
+            entries=[("single", index_text, node_id, "", None)]
         )
         nodes.append(index_node)
 
@@ -177,6 +306,13 @@ class AutoModuleDirective(docutils.parsers.rst.Directive):
         file_environment = js_env["file"][file_id]
         return file_environment
 
+    def _export_chain(self, module_environment):
+        """Return list of module identifiers documented through wildcard
+        exports, including *module_environment*.
+        """
+        export_chain = self.options.get("export-chain", [])
+        return export_chain + [module_environment["id"]]
+
     def generate_members(
         self, module_environment, options, whitelist_names=None
     ):
@@ -189,7 +325,79 @@ class AutoModuleDirective(docutils.parsers.rst.Directive):
         should be displayed exclusively.
 
         """
-        js_env = self.state.document.settings.env.app.config.js_environment
+        app = self.state.document.settings.env.app
+
+        # Generated elements only depend on the effective options.
+        key = (
+            module_environment["id"],
+            tuple(whitelist_names) if whitelist_names is not None else None,
+            self.options.get("module-alias"),
+            self.options.get("module-path-alias"),
+            self.options.get("force-partial-import", False),
+            tuple(self._export_chain(module_environment)),
+        ) + tuple(
+            self.options.get(name, name in options) for name in (
+                "undoc-members", "private-members", "skip-data-value",
+                "skip-attribute-value"
+            )
+        )
+
+        rst_elements = app.js_rst_cache.fetch(
+            app.config.js_environment, key, lambda: self.generate_rst_elements(
+                module_environment, options, whitelist_names=whitelist_names
+            )
+        )
+
+        if app.config.js_direct_rendering:
+            nodes = []
+
+            for rst_element in rst_elements:
+                node = docutils.nodes.paragraph()
+                node.extend(render_rst_element(rst_element, self))
+                nodes.append(node)
+
+            return nodes
+
+        # Parse all members at once, separated by comments which indicate
+        # where each member starts.
+        content = StringList()
+
+        for rst_element in rst_elements:
+            content += rst_string("\n.. {0}\n".format(MEMBER_SEPARATOR))
+            content += rst_element
+
+        container = docutils.nodes.container()
+        self.state.nested_parse(content, 0, container)
+
+        # Wrap the nodes of each member in a paragraph.
+        nodes = []
+
+        for child in list(container.children):
+            if (
+                isinstance(child, docutils.nodes.comment) and
+                child.astext() == MEMBER_SEPARATOR
+            ):
+                nodes.append(docutils.nodes.paragraph())
+                continue
+
+            nodes[-1].append(child)
+
+        return nodes
+
+    def generate_rst_elements(
+        self, module_environment, options, whitelist_names=None
+    ):
+        """Return list of member :term:`reStructuredText` elements from
+        *module_environment* in the line order.
+
+        *options* is the dictionary of module options that can affect the
+        display of members
+
+        *whitelist_names* is an optional list of element names that
+        should be displayed exclusively.
+
+        """
+        app = self.state.document.settings.env.app
         file_environment = self._file_environment(module_environment)
 
         module_name = self.options.get(
@@ -255,24 +463,23 @@ class AutoModuleDirective(docutils.parsers.rst.Directive):
 
         # Gather exported elements
         rst_elements = get_rst_export_elements(
-            file_environment, js_env, module_name, module_path_name,
+            app.js_export_resolver.fetch_export_table(
+                module_environment["id"]
+            ),
+            module_name, module_path_name,
             skip_data_value=self.options.get(
                 "skip-data-value", "skip-data-value" in options
             ),
             skip_attribute_value=self.options.get(
                 "skip-attribute-value", "skip-attribute-value" in options
             ),
+            export_chain=self._export_chain(module_environment),
             rst_elements=rst_elements,
         )
 
-        # Add content while respecting the line order
-        nodes = []
-
-        for line_number in sorted(rst_elements.keys()):
-            for rst_element in rst_elements[line_number]:
-                node = docutils.nodes.paragraph()
-                self.state.nested_parse(rst_element, 0, node)
-
-                nodes.append(node)
-
-        return nodes
+        # Respect the line order
+        return [
+            rst_element
+            for line_number in sorted(rst_elements.keys())
+            for rst_element in rst_elements[line_number]
+        ]
@@ -1,6 +1,7 @@
 # :coding: utf-8
 
 from docutils.statemachine import StringList
+from docutils.parsers.rst import DirectiveError
 
 
 def get_rst_class_elements(
@@ -321,14 +322,14 @@ def get_rst_data_elements(
 
 
 def get_rst_export_elements(
-    file_environment, environment, module_name, module_path_name,
-    skip_data_value=False, skip_attribute_value=False, rst_elements=None
+    export_table, module_name, module_path_name, skip_data_value=False,
+    skip_attribute_value=False, export_chain=None, rst_elements=None
 ):
     """Return :term:`reStructuredText` from exported elements within
-    *file_environment*.
+    *export_table*.
 
-    *environment* is the full :term:`Javascript` environment processed
-    in :mod:`~champollion.parser`.
+    *export_table* is the list of resolved exported elements returned by
+    :meth:`champollion.parser.resolver.ExportResolver.fetch_export_table`.
 
     *module_name* is the module alias that should be added to each
     directive.
@@ -341,54 +342,31 @@ def get_rst_export_elements(
     *skip_attribute_value* indicate whether attribute value should not be
     displayed.
 
+    *export_chain* is an optional list of module identifiers which are
+    currently documented through wildcard exports. Wildcard exports from one
+    of these modules are skipped to prevent cyclic re-exports from being
+    documented endlessly.
+
     *rst_elements* can be an initial dictionary that will be updated and
     returned.
 
     """
-    export_environment = file_environment["export"]
-    import_environment = file_environment["import"]
-
     if rst_elements is None:
         rst_elements = {}
 
-    for _exported_env_id, _exported_env in export_environment.items():
-        from_module_id = _exported_env["module"]
-        line_number = _exported_env["line_number"]
+    if export_chain is None:
+        export_chain = []
+
+    for element in export_table:
+        line_number = element["line_number"]
 
         if line_number not in rst_elements.keys():
             rst_elements[line_number] = []
 
-        name = _exported_env["name"]
-        alias = _exported_env["alias"]
-        if alias is None:
-            alias = name
-
-        # Update module origin and name from import if necessary
-        if (from_module_id is None and
-                _exported_env_id in import_environment.keys()):
-            name = import_environment[_exported_env_id]["name"]
-            from_module_id = import_environment[_exported_env_id]["module"]
-
-        # Ignore element if the origin module can not be found
-        if from_module_id not in environment["module"].keys():
-            continue
-
-        from_module_environment = environment["module"][from_module_id]
-        from_file_id = from_module_environment["file_id"]
-        from_file_env = environment["file"][from_file_id]
-
-        if name == "default":
-            rst_element = get_rst_default_from_file_environment(
-                from_file_env, alias, module_name, module_path_name,
-                skip_data_value=skip_data_value,
-                skip_attribute_value=skip_attribute_value,
-            )
-            if rst_element is None:
+        if element["wildcard"]:
+            if element["module_id"] in export_chain:
                 continue
 
-            rst_elements[line_number].append(rst_element)
-
-        elif name == "*":
             extra_options = [
                 ":force-partial-import:",
                 ":members:",
@@ -399,165 +377,61 @@ def get_rst_export_elements(
             if skip_attribute_value:
                 extra_options.append(":skip-attribute-value:")
 
+            extra_options.append(
+                ":export-chain: {0}".format(",".join(export_chain))
+            )
+
             rst_element = rst_generate(
                 directive="automodule",
-                element_id=from_module_id,
+                element_id=element["module_id"],
                 module_alias=module_name,
                 module_path_alias=module_path_name,
                 extra_options=extra_options
             )
-            rst_elements[line_number].append(rst_element)
-
-        else:
-            rst_element = get_rst_name_from_file_environment(
-                name, from_file_env, alias, module_name, module_path_name,
-                skip_data_value=skip_data_value,
-                skip_attribute_value=skip_attribute_value,
-            )
-            if rst_element is None:
-                continue
-
-            rst_elements[line_number].append(rst_element)
 
-    return rst_elements
-
-
-def get_rst_default_from_file_environment(
-    file_environment, alias, module_name, module_path_name,
-    skip_data_value=False, skip_attribute_value=False
-):
-    """Return :term:`reStructuredText` from default element in
-    *file_environment*.
-
-    *alias* is the name that should replace the element name.
-
-    *module_name* is the module alias that should replace the element
-    module name.
-
-    *module_path_name* is the module path alias that should be added to each
-    directive.
-
-    *skip_data_value* indicate whether data value should not be displayed.
-
-    *skip_attribute_value* indicate whether attribute value should not be
-    displayed.
-
-    .. warning::
-
-        Return None if no default is found in the file.
-
-    """
-    for class_env in file_environment["class"].values():
-        if class_env["default"]:
+        elif element["category"] == "class":
             extra_options = [":force-partial-import:"]
             if skip_data_value:
                 extra_options.append(":skip-data-value:")
             if skip_attribute_value:
                 extra_options.append(":skip-attribute-value:")
 
-            return rst_generate(
+            rst_element = rst_generate(
                 directive="autoclass",
-                element_id=class_env["id"],
-                alias=alias,
+                element_id=element["element_id"],
+                alias=element["name"],
                 module_alias=module_name,
                 module_path_alias=module_path_name,
                 extra_options=extra_options
             )
 
-    for function_env in file_environment["function"].values():
-        if function_env["default"]:
-            return rst_generate(
+        elif element["category"] == "function":
+            rst_element = rst_generate(
                 directive="autofunction",
-                element_id=function_env["id"],
-                alias=alias,
+                element_id=element["element_id"],
+                alias=element["name"],
                 module_alias=module_name,
                 module_path_alias=module_path_name,
                 extra_options=[":force-partial-import:"]
             )
 
-    for data_env in file_environment["data"].values():
-        if data_env["default"]:
+        else:
             extra_options = [":force-partial-import:"]
             if skip_data_value:
                 extra_options.append(":skip-value:")
 
-            return rst_generate(
+            rst_element = rst_generate(
                 directive="autodata",
-                element_id=data_env["id"],
-                alias=alias,
-                module_alias=module_name,
-                module_path_alias=module_path_name,
-                extra_options=extra_options
-            )
-
-
-def get_rst_name_from_file_environment(
-    name, file_environment, alias, module_name, module_path_name,
-    skip_data_value=False, skip_attribute_value=False
-):
-    """Return :term:`reStructuredText` element in *file_environment* from
-    *name*.
-
-    *alias* is the name that should replace the element name.
-
-    *module_name* is the module name that should replace the element
-    module name.
-
-    *module_path_name* is the module path alias that should be added to each
-    directive.
-
-    *skip_data_value* indicate whether data value should not be displayed.
-
-    *skip_attribute_value* indicate whether attribute value should not be
-    displayed.
-
-    .. warning::
-
-        Return None if the element is not found in the file.
-
-    """
-    for class_env in file_environment["class"].values():
-        if class_env["name"] == name and class_env["exported"]:
-            extra_options = [":force-partial-import:"]
-            if skip_data_value:
-                extra_options.append(":skip-data-value:")
-            if skip_attribute_value:
-                extra_options.append(":skip-attribute-value:")
-
-            return rst_generate(
-                directive="autoclass",
-                element_id=class_env["id"],
-                alias=alias,
+                element_id=element["element_id"],
+                alias=element["name"],
                 module_alias=module_name,
                 module_path_alias=module_path_name,
                 extra_options=extra_options
             )
 
-    for function_env in file_environment["function"].values():
-        if function_env["name"] == name and function_env["exported"]:
-            return rst_generate(
-                directive="autofunction",
-                element_id=function_env["id"],
-                alias=alias,
-                module_alias=module_name,
-                module_path_alias=module_path_name,
-                extra_options=[":force-partial-import:"]
-            )
-
-    for data_env in file_environment["data"].values():
-        if data_env["name"] == name and data_env["exported"]:
-            extra_options = [":force-partial-import:"]
-            if skip_data_value:
-                extra_options.append(":skip-value:")
+        rst_elements[line_number].append(rst_element)
 
-            return rst_generate(
-                directive="autodata",
-                element_id=data_env["id"],
-                alias=alias,
-                module_alias=module_name,
-                module_path_alias=module_path_name,
-                extra_options=extra_options
-            )
+    return rst_elements
 
 
 def rst_generate(
@@ -580,41 +454,136 @@ def rst_generate(
     *module_path_alias* is the module path that should replace the element
     module path.
 
-    *extra_options* can be a list of extra options to add to the directive.
+    *extra_options* can be a list of extra options to add to the directive,
+    with an optional value (e.g. ":members:" or ":export-chain: example").
+
+    The *directive*, *element_id* and options are also recorded as attributes
+    of the `StringList` returned so that it can be rendered without being
+    parsed.
+
+    .. seealso:: :func:`render_rst_element`
 
     """
     if extra_options is None:
         extra_options = []
 
-    element_rst = "\n.. js:{directive}:: {id}\n".format(
-        directive=directive, id=element_id
-    )
+    options = []
 
     if alias is not None:
-        element_rst += "    :alias: {alias}\n".format(
-            alias=alias
-        )
+        options.append(("alias", alias))
 
     if module_alias is not None:
-        element_rst += "    :module-alias: {module}\n".format(
-            module=module_alias
-        )
+        options.append(("module-alias", module_alias))
 
     if module_path_alias is not None:
-        element_rst += "    :module-path-alias: {module}\n".format(
-            module=module_path_alias
-        )
+        options.append(("module-path-alias", module_path_alias))
 
     for option in extra_options:
-        element_rst += "    {option}\n".format(
-            option=option
-        )
+        name, _, value = option.lstrip(":").partition(":")
+        options.append((name, value.strip() or None))
+
+    element_rst = "\n.. js:{directive}:: {id}\n".format(
+        directive=directive, id=element_id
+    )
+
+    for name, value in options:
+        if value is None:
+            element_rst += "    :{name}:\n".format(name=name)
+        else:
+            element_rst += "    :{name}: {value}\n".format(
+                name=name, value=value
+            )
 
     element_rst += "\n"
-    return StringList(element_rst.split("\n"))
+
+    rst_element = StringList(element_rst.split("\n"))
+    rst_element.directive = directive
+    rst_element.element_id = element_id
+    rst_element.options = options
+    return rst_element
+
+
+def render_rst_element(rst_element, directive):
+    """Return nodes rendered from *rst_element* without parsing it.
+
+    *rst_element* must be a `StringList` returned by :func:`rst_generate`.
+    The corresponding directive is run directly with the arguments recorded,
+    which avoids parsing the :term:`reStructuredText` element.
+
+    *directive* is the directive instance which generated the element and
+    whose state is used to render it.
+
+    An error node is returned if the directive fails.
+
+    """
+    env = directive.state.document.settings.env
+    directive_class = env.get_domain("js").directive(rst_element.directive)
+
+    options = dict(
+        (name, directive_class.option_spec[name](value))
+        for name, value in rst_element.options
+    )
+
+    element_directive = directive_class(
+        rst_element.directive, [rst_element.element_id], options,
+        StringList(), directive.lineno, directive.content_offset, "",
+        directive.state, directive.state_machine
+    )
+
+    try:
+        return element_directive.run()
+    except DirectiveError as error:
+        return [
+            directive.state_machine.reporter.system_message(
+                error.level, error.msg, line=directive.lineno
+            )
+        ]
 
 
 def rst_string(expression=""):
     """Return `StringList` from *expression*.
     """
     return StringList(expression.split("\n"))
+
+
+class RstElementCache(object):
+    """Memoize :term:`reStructuredText` elements generated for members.
+
+    Elements are recorded per key, which must be composed of the element
+    identifier and all the options affecting the generated elements. All
+    elements are dropped when the :term:`Javascript` environment changes::
+
+        >>> cache = RstElementCache()
+        >>> cache.fetch(environment, key, generate_elements)
+
+    .. warning::
+
+        The elements returned are shared and must not be mutated.
+
+    """
+
+    def __init__(self):
+        """Initiate empty cache."""
+        self.environment = None
+        self._elements = {}
+
+    def fetch(self, environment, key, generator):
+        """Return elements recorded for *key* within *environment*.
+
+        *generator* is called without arguments to generate the elements if
+        they are not recorded yet.
+
+        """
+        if environment is not self.environment:
+            self.clear()
+            self.environment = environment
+
+        if key not in self._elements:
+            self._elements[key] = generator()
+
+        return self._elements[key]
+
+    def clear(self):
+        """Remove all elements recorded."""
+        self.environment = None
+        self._elements = {}
@@ -6,15 +6,66 @@ to document each element from a simple identifier.
 
 import os
 
-from .js_module import fetch_environment as fetch_module_environment
-from .js_file import fetch_environment as fetch_file_environment
-
-
-def fetch_environment(path):
+from .environment import (
+    IncrementalEnvironment,
+    LazyEnvironment,
+    LazyElementMapping,
+    create_environment,
+    merge_environment,
+    fetch_file_entry,
+    is_streamed,
+    parse_files,
+    update_environment
+)
+from .reader import scan_files, read_files
+
+
+def fetch_environment(
+    path, lazy=False, workers=None, parse_workers=None, queue_size=None,
+    snapshot=None, rescan=False, batch_size=None, stream_size=None,
+    max_value_length=None
+):
     """Return :term:`Javascript` environment dictionary from *path* structure.
 
     Raises :exc:`OSError` if the directory is incorrect.
 
+    If *lazy* is set to True, only the module and file identifiers are
+    fetched when walking through the directory. Each file is then parsed when
+    one of its elements is first accessed.
+
+    *workers* is the number of threads used to read the files ahead of the
+    parser, and *parse_workers* is the number of processes used to parse them
+    concurrently. *queue_size* is the maximum number of files waiting in each
+    stage, which bounds the memory used. The files are read and parsed
+    sequentially by default. These options are ignored if *lazy* is set to
+    True as the files are not read.
+
+    *batch_size* is the maximum number of small files concatenated to be
+    parsed at once, which reduces the cost of parsing thousands of files of
+    a few lines. Each file is parsed on its own by default.
+
+    *stream_size* is the number of bytes above which a file is not read
+    entirely but parsed as a stream with
+    :func:`~champollion.parser.block.fetch_stream_environment`, which bounds
+    the memory used to parse very large files.
+
+    *max_value_length* can be the maximum length of the data and attribute
+    values recorded. Longer values are truncated with
+    :func:`~champollion.parser.helper.clean_value`.
+
+    *snapshot* can be a :class:`~champollion.parser.snapshot.DirectorySnapshot`
+    instance used to reuse the listing of the folders which have not been
+    modified and the file environments of the files which have not been
+    modified since the snapshot was recorded. The snapshot is updated with the
+    folders listed and the files parsed. If *rescan* is set to True, all the
+    folders are listed again. These options are ignored if *lazy* is set to
+    True.
+
+    .. seealso::
+
+        :class:`~champollion.parser.js_file.LazyFileEnvironment` and
+        :class:`~champollion.parser.environment.LazyElementMapping`
+
     The environment is in the form of::
 
         {
@@ -92,70 +143,73 @@ def fetch_environment(path):
             "The javascript package directory is incorrect: {0}".format(path)
         )
 
-    environment = {
-        "module": {},
-        "class": {},
-        "method": {},
-        "attribute": {},
-        "function": {},
-        "data": {},
-        "file": {}
-    }
+    environment = create_environment(lazy=lazy)
 
-    repository_name = os.path.basename(path)
+    if lazy:
+        module_names = set()
 
-    extensions = [".js", ".jsx"]
+        for file_id, file_path, files, signature in scan_files(path):
+            module_environment, file_environment = fetch_file_entry(
+                file_id, file_path, files, module_names=module_names,
+                lazy=True, signature=signature,
+                max_value_length=max_value_length
+            )
+            update_environment(
+                environment, module_environment, file_environment
+            )
+            module_names.add(module_environment["name"])
 
-    for root, dirs, files in os.walk(path):
-        root_folders = (
-            [repository_name] + root.split(path)[-1].split(os.sep)[1:]
-        )
+        return environment
 
-        files[:] = [
-            f for f in files
-            if os.path.splitext(f)[1] in extensions
-            and not f.startswith(".")
-        ]
-
-        dirs[:] = [
-            d for d in dirs
-            if not d.startswith(".")
-        ]
-
-        for _file in files:
-            file_id = "/".join(root_folders + [_file])
-            file_path = os.path.join(root, _file)
-
-            # Fetch module environment
-            _module_environment = fetch_module_environment(
-                file_id, files, module_names=[
-                    _module["name"] for _module in
-                    environment["module"].values()
-                ]
-            )
-            module_id = _module_environment["id"]
-            environment["module"][module_id] = _module_environment
+    for module_environment, file_environment in iter_environment(
+        path, workers=workers, parse_workers=parse_workers,
+        queue_size=queue_size, snapshot=snapshot, rescan=rescan,
+        batch_size=batch_size, stream_size=stream_size,
+        max_value_length=max_value_length
+    ):
+        update_environment(environment, module_environment, file_environment)
 
-            # Fetch file environment
-            _file_environment = fetch_file_environment(
-                file_path, file_id, _module_environment["id"]
-            )
-            file_id = _file_environment["id"]
+    return environment
 
-            method_environment = {}
-            attribute_environment = {}
 
-            # Extract methods and attributes from class environment to set it
-            # in the top level environment.
-            for _class in _file_environment["class"].values():
-                method_environment.update(_class["method"].copy())
-                attribute_environment.update(_class["attribute"].copy())
+def iter_environment(
+    path, workers=None, parse_workers=None, queue_size=None, snapshot=None,
+    rescan=False, batch_size=None, stream_size=None, max_value_length=None
+):
+    """Yield tuple with module environment and file environment from *path*.
 
-            environment["file"][file_id] = _file_environment
-            environment["function"].update(_file_environment["function"])
-            environment["data"].update(_file_environment["data"])
-            environment["class"].update(_file_environment["class"])
-            environment["method"].update(method_environment)
-            environment["attribute"].update(attribute_environment)
+    Raises :exc:`OSError` if the directory is incorrect.
 
-    return environment
+    The tuples are yielded as soon as each file is parsed, in the order in
+    which the files are found, so that each module can be used before the
+    entire directory is parsed. The options are the same as for
+    :func:`fetch_environment`.
+
+    """
+    if not os.path.isdir(path) or not os.access(path, os.R_OK):
+        raise OSError(
+            "The javascript package directory is incorrect: {0}".format(path)
+        )
+
+    def _skip(source_file):
+        """Indicate whether *source_file* must not be read in advance."""
+        return (
+            (snapshot is not None and snapshot.is_parsed(source_file)) or
+            is_streamed(source_file, stream_size)
+        )
+
+    if snapshot is not None:
+        source_files = snapshot.scan_files(path, rescan=rescan)
+    else:
+        source_files = scan_files(path)
+
+    entries = read_files(
+        source_files, workers=workers, queue_size=queue_size, skip=_skip
+    )
+
+    for module_environment, file_environment in parse_files(
+        entries, workers=parse_workers, queue_size=queue_size,
+        cache=snapshot, batch_size=batch_size, stream_size=stream_size,
+        max_value_length=max_value_length
+    ):
+        yield module_environment, file_environment
@@ -0,0 +1,223 @@
+# :coding: utf-8
+
+"""Environment fetched in the background while the documents are read.
+
+The :term:`Javascript` environment is fetched within a background thread,
+and each module is made available as soon as its file is parsed::
+
+    >>> environment = BackgroundEnvironment("/path/to/example")
+    >>> environment["class"]["example.utils.AwesomeClass"]
+    {"id": "example.utils.AwesomeClass", ...}
+
+Looking up an identifier only blocks until the identifier is available, or
+until the entire environment is fetched if the identifier does not exist.
+Iterating over a category blocks until the entire environment is fetched.
+
+"""
+
+import os
+import threading
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+try:
+    import concurrent.futures
+except ImportError:  # Python 2 without the 'futures' backport
+    concurrent = None
+
+from . import iter_environment
+from .environment import create_environment, update_environment
+
+
+class BackgroundEnvironment(Mapping):
+    """Environment fetched from *paths* within a background thread.
+
+    *options* are passed to :func:`~champollion.parser.iter_environment`.
+    The environment is fetched synchronously if :mod:`concurrent.futures` is
+    not available.
+
+    """
+
+    def __init__(self, *paths, **options):
+        """Initiate environment and start fetching it from *paths*.
+
+        Raises :exc:`OSError` if a directory is incorrect.
+
+        """
+        for path in paths:
+            if not os.path.isdir(path) or not os.access(path, os.R_OK):
+                raise OSError(
+                    "The javascript package directory is incorrect: "
+                    "{0}".format(path)
+                )
+
+        self._environment = create_environment()
+        self._condition = threading.Condition()
+        self._done = False
+        self._error = None
+        self._callbacks = []
+
+        self._mappings = dict(
+            (category, _BackgroundElementMapping(self, category))
+            for category in self._environment
+        )
+
+        #: :class:`concurrent.futures.Future` instance returning the
+        #: environment when it is entirely fetched, or None if the
+        #: environment has been fetched synchronously.
+        self.future = None
+
+        if concurrent is None:
+            self._fetch(paths, options)
+            return
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.future = executor.submit(self._fetch, paths, options)
+        executor.shutdown(wait=False)
+
+    def __getitem__(self, category):
+        """Return mapping for *category*."""
+        return self._mappings[category]
+
+    def __iter__(self):
+        """Iterate over the environment categories."""
+        return iter(self._mappings)
+
+    def __len__(self):
+        """Return number of categories."""
+        return len(self._mappings)
+
+    def __getstate__(self):
+        """Return state recorded when the environment is pickled.
+
+        The environment is entirely fetched before being pickled.
+
+        """
+        self.wait()
+        return {"environment": self._environment}
+
+    def __setstate__(self, state):
+        """Restore entirely fetched environment from *state*."""
+        self._environment = state["environment"]
+        self._condition = threading.Condition()
+        self._done = True
+        self._error = None
+        self._callbacks = []
+
+        self._mappings = dict(
+            (category, _BackgroundElementMapping(self, category))
+            for category in self._environment
+        )
+
+        self.future = None
+
+    def is_done(self):
+        """Indicate whether the environment is entirely fetched."""
+        with self._condition:
+            return self._done
+
+    def wait(self, category=None, key=None):
+        """Block until *key* is available within *category*.
+
+        Block until the environment is entirely fetched if *key* is not
+        provided or does not exist.
+
+        Raises the exception raised while fetching the environment if
+        any.
+
+        """
+        with self._condition:
+            while not self._done and (
+                key is None or key not in self._environment[category]
+            ):
+                self._condition.wait()
+
+            if self._error is not None:
+                raise self._error
+
+    def add_done_callback(self, callback):
+        """Call *callback* when the environment is entirely fetched.
+
+        *callback* is called with the environment, immediately if it is
+        already fetched. It is not called if an exception was raised while
+        fetching the environment.
+
+        """
+        with self._condition:
+            if not self._done:
+                self._callbacks.append(callback)
+                return
+
+        if self._error is None:
+            callback(self)
+
+    def _fetch(self, paths, options):
+        """Fetch environment from *paths* with *options*."""
+        try:
+            for path in paths:
+                for module_environment, file_environment in iter_environment(
+                    path, **options
+                ):
+                    with self._condition:
+                        update_environment(
+                            self._environment, module_environment,
+                            file_environment
+                        )
+                        self._condition.notify_all()
+
+        except Exception as error:
+            with self._condition:
+                self._error = error
+                self._done = True
+                self._condition.notify_all()
+
+            raise
+
+        with self._condition:
+            self._done = True
+            self._condition.notify_all()
+
+        for callback in self._callbacks:
+            callback(self)
+
+        return self._environment
+
+
+class _BackgroundElementMapping(Mapping):
+    """Element category of a :class:`BackgroundEnvironment`.
+
+    Identifiers are looked up as soon as they are available.
+
+    """
+
+    def __init__(self, environment, category):
+        """Initiate mapping for *category* within *environment*."""
+        self._environment = environment
+        self._category = category
+
+    def __getitem__(self, key):
+        """Return element from *key*."""
+        self._environment.wait(self._category, key)
+        return self._elements()[key]
+
+    def __contains__(self, key):
+        """Indicate whether *key* is in the category."""
+        self._environment.wait(self._category, key)
+        return key in self._elements()
+
+    def __iter__(self):
+        """Iterate over all identifiers."""
+        self._environment.wait()
+        return iter(self._elements())
+
+    def __len__(self):
+        """Return number of identifiers."""
+        self._environment.wait()
+        return len(self._elements())
+
+    def _elements(self):
+        """Return mapping of elements fetched."""
+        return self._environment._environment[self._category]
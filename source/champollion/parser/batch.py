@@ -0,0 +1,316 @@
+# :coding: utf-8
+
+"""Parse many small :term:`Javascript` files at once.
+
+Parsing a file has a fixed cost, as its lines are split and each pattern is
+called over its content, which dwarfs the matching itself for files of a few
+lines only. Small files are therefore concatenated with a :data:`SEPARATOR`
+line so that each pattern is only called once over the batch, and the
+elements matched are mapped back to each file with their line numbers::
+
+    >>> fetch_environments_from_contents([
+    ...     (
+    ...         "export const A = 1;\\n", "/path/to/example/a.js",
+    ...         "example/a.js", "example.a"
+    ...     ),
+    ...     (
+    ...         "export const B = 2;\\n", "/path/to/example/b.js",
+    ...         "example/b.js", "example.b"
+    ...     )
+    ... ])
+    [{"id": "example/a.js", ...}, {"id": "example/b.js", ...}]
+
+The file environments are identical to the ones returned by
+:func:`~champollion.parser.js_file.fetch_environment_from_content`. Only the
+file description is still fetched per file.
+
+"""
+
+import bisect
+import functools
+
+from .js_class import iter_elements as iter_class_elements
+from .js_function import iter_elements as iter_function_elements
+from .js_data import iter_elements as iter_data_elements
+
+from . import pattern
+from .helper import fetch_docstrings, filter_comments, collapse_all
+from .helper import TRUNCATION_MARKER
+from .helper import fetch_line_offsets, get_line_number
+from .js_file import (
+    fetch_environment_from_content, fetch_environment_from_elements,
+    update_export_environment, update_import_environment
+)
+
+
+#: Maximum number of characters of a file parsed within a batch.
+MAX_FILE_SIZE = 2048
+
+#: Line inserted between each file of a batch. The null character can not be
+#: found in the source files, and the semi-colon ends any statement left
+#: opened at the end of the previous file.
+SEPARATOR = "\x00;"
+
+#: Module identifier used to parse the elements of a batch.
+_BATCH_MODULE_ID = "\x00"
+
+
+def is_batchable(content):
+    """Indicate whether *content* can be parsed within a batch.
+
+    The *content* must not exceed :data:`MAX_FILE_SIZE` characters and must
+    end with a new line so that its last line is parsed as if it was the end
+    of the file.
+
+    """
+    return (
+        content is not None and
+        len(content) <= MAX_FILE_SIZE and
+        content.endswith("\n") and
+        "\x00" not in content
+    )
+
+
+def fetch_environments_from_contents(entries, max_value_length=None):
+    """Return list of file environments from *entries*.
+
+    *entries* is a list of tuples with the content, the path, the identifier
+    of the file and the identifier of its module, as for
+    :func:`~champollion.parser.js_file.fetch_environment_from_content`.
+
+    *max_value_length* can be the maximum length of the data and attribute
+    values recorded.
+
+    The file environments are returned in the same order as *entries*, and
+    the file environment is None if the content is None. The files which are
+    not :func:`batchable <is_batchable>`, and the files for which an element
+    has been matched across the :data:`SEPARATOR` of the batch, are parsed on
+    their own.
+
+    """
+    return _fetch_environments(entries, [
+        index for index, entry in enumerate(entries)
+        if is_batchable(entry[0])
+    ], max_value_length)
+
+
+def _fetch_environments(entries, indices, max_value_length):
+    """Return list of file environments from *entries*.
+
+    The *entries* at *indices* are parsed within a batch, and the other
+    entries are parsed on their own.
+
+    """
+    environments = [None] * len(entries)
+    batch_indices = set(indices)
+
+    for index, entry in enumerate(entries):
+        if index not in batch_indices and entry[0] is not None:
+            environments[index] = fetch_environment_from_content(
+                *entry, max_value_length=max_value_length
+            )
+
+    for index, environment in zip(
+        indices, _fetch_batch(
+            [entries[index] for index in indices], max_value_length
+        )
+    ):
+        environments[index] = environment
+
+    return environments
+
+
+def _fetch_batch(entries, max_value_length):
+    """Return list of file environments from batchable *entries*."""
+    if len(entries) < 2:
+        return [
+            fetch_environment_from_content(
+                *entry, max_value_length=max_value_length
+            )
+            for entry in entries
+        ]
+
+    content = (SEPARATOR + "\n").join(entry[0] for entry in entries)
+
+    # First position and first line number of each file within the batch.
+    first_positions = []
+    first_lines = []
+    position = 0
+    line_number = 1
+
+    for entry in entries:
+        first_positions.append(position)
+        first_lines.append(line_number)
+        position += len(entry[0]) + len(SEPARATOR) + 1
+        line_number += entry[0].count("\n") + 1
+
+    # A comment or a nested element opened within a file and closed within
+    # another file collapses the separators in between. These two files are
+    # parsed on their own and the other files are parsed within a new batch.
+    lines = collapse_all(filter_comments(content))[0].split("\n")
+    spanning_indices = set()
+
+    for index in range(1, len(entries)):
+        if lines[first_lines[index] - 2] == SEPARATOR:
+            continue
+
+        if index == 1 or lines[first_lines[index - 1] - 2] == SEPARATOR:
+            spanning_indices.add(index - 1)
+
+        if (
+            index == len(entries) - 1 or
+            lines[first_lines[index + 1] - 2] == SEPARATOR
+        ):
+            spanning_indices.add(index)
+
+    if len(spanning_indices) > 0:
+        return _fetch_environments(entries, [
+            index for index in range(len(entries))
+            if index not in spanning_indices
+        ], max_value_length)
+
+    docstrings = fetch_docstrings(content.split("\n"))
+    line_offsets = fetch_line_offsets(content)
+
+    elements = [
+        {"export": {}, "import": {}, "class": {}, "function": {}, "data": {}}
+        for _ in entries
+    ]
+    invalid_indices = set()
+
+    def _is_spanning(index, text):
+        """Indicate whether *text* matched from the file at *index* spans
+        several files, which must then be parsed on their own."""
+        count = text.count("\x00")
+        if count > 0:
+            invalid_indices.update(range(index, index + count + 1))
+
+        return count > 0
+
+    wildcards_numbers = [0] * len(entries)
+
+    for match in pattern.EXPORTED_ELEMENT_PATTERN.finditer(content):
+        index = bisect.bisect_right(
+            first_positions, match.end("start_regex")
+        ) - 1
+
+        if _is_spanning(index, match.group()):
+            continue
+
+        line_number = (
+            get_line_number(line_offsets, match.start()) +
+            match.group("start_regex").count("\n")
+        )
+
+        wildcards_numbers[index] = update_export_environment(
+            elements[index]["export"], match, entries[index][3],
+            line_number - first_lines[index] + 1,
+            docstrings.get(line_number - 1),
+            wildcards_number=wildcards_numbers[index]
+        )
+
+    wildcards_numbers = [0] * len(entries)
+
+    for match in pattern.IMPORTED_ELEMENT_PATTERN.finditer(content):
+        index = bisect.bisect_right(
+            first_positions, match.end("start_regex")
+        ) - 1
+
+        if _is_spanning(index, match.group()):
+            continue
+
+        wildcards_numbers[index] = update_import_environment(
+            elements[index]["import"], match, entries[index][3],
+            wildcards_number=wildcards_numbers[index]
+        )
+
+    for category, iter_elements in [
+        (
+            "class", functools.partial(
+                iter_class_elements, max_value_length=max_value_length
+            )
+        ),
+        ("function", iter_function_elements),
+        (
+            "data", functools.partial(
+                iter_data_elements, max_value_length=max_value_length
+            )
+        ),
+    ]:
+        for element in iter_elements(
+            content, _BATCH_MODULE_ID, docstrings=docstrings
+        ):
+            index = bisect.bisect_right(
+                first_lines, element["line_number"]
+            ) - 1
+
+            if category == "data":
+                # A value is ended by the semi-colon of the first separator
+                # following the data when the rest of the file does not
+                # contain any semi-colon, in which case no other data can be
+                # matched within the file. A truncated value could have lost
+                # the null character.
+                if "\x00" in element["value"]:
+                    continue
+
+                if (
+                    max_value_length is not None and
+                    element["value"].endswith(TRUNCATION_MARKER)
+                ):
+                    invalid_indices.add(index)
+                    continue
+
+            elif _is_spanning(index, "".join(element.get("arguments", []))):
+                continue
+
+            _relocate(element, entries[index][3], first_lines[index] - 1)
+            elements[index][category][element["id"]] = element
+
+    environments = []
+
+    for index, entry in enumerate(entries):
+        if index in invalid_indices:
+            environments.append(
+                fetch_environment_from_content(
+                    *entry, max_value_length=max_value_length
+                )
+            )
+            continue
+
+        environments.append(
+            fetch_environment_from_elements(*entry, elements=elements[index])
+        )
+
+    return environments
+
+
+def _relocate(element, module_id, line_offset):
+    """Set *module_id* of *element* parsed within a batch.
+
+    The line numbers of the element and of its methods and attributes are
+    decreased by *line_offset*.
+
+    .. warning::
+
+        The *element* is mutated.
+
+    """
+    element["id"] = module_id + element["id"][len(_BATCH_MODULE_ID):]
+    element["module_id"] = module_id
+    element["line_number"] -= line_offset
+
+    if "class_id" in element:
+        element["class_id"] = (
+            module_id + element["class_id"][len(_BATCH_MODULE_ID):]
+        )
+
+    for category in ("method", "attribute"):
+        if category not in element:
+            continue
+
+        members = list(element[category].values())
+        element[category] = {}
+
+        for member in members:
+            _relocate(member, module_id, line_offset)
+            element[category][member["id"]] = member
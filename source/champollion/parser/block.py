@@ -0,0 +1,658 @@
+# :coding: utf-8
+
+"""Parse large :term:`Javascript` files per top-level block.
+
+A large file is split between its top-level statements, and the elements
+parsed from each block are recorded with the digest of its content, so that
+only the blocks which have changed are parsed again when the file is
+modified::
+
+    >>> environment, blocks = fetch_environment_from_blocks(
+    ...     content, "/path/to/example/index.js", "example/index.js", "example"
+    ... )
+    >>> environment, blocks = fetch_environment_from_blocks(
+    ...     modified_content, "/path/to/example/index.js", "example/index.js",
+    ...     "example", blocks=blocks
+    ... )
+
+The line numbers of the elements parsed from the blocks which have not
+changed are shifted to the new position of the block within the file, and
+the file environment is identical to the one returned by
+:func:`~champollion.parser.js_file.fetch_environment_from_content`.
+
+A file too large to be held in memory along with the copies of its content
+made while it is parsed can be read as a stream, so that only a chunk of a
+few top-level blocks is parsed at once::
+
+    >>> environment = fetch_stream_environment(
+    ...     "/path/to/example/index.js", "example/index.js", "example"
+    ... )
+
+"""
+
+import bisect
+import hashlib
+
+from .js_class import iter_elements as iter_class_elements
+from .js_function import iter_elements as iter_function_elements
+from .js_data import iter_elements as iter_data_elements
+
+from . import pattern
+from .helper import fetch_docstrings, filter_comments, collapse_all
+from .helper import clean_value
+from .helper import fetch_line_offsets, get_line_number
+from .js_file import (
+    LazyFileEnvironment, fetch_environment_from_content,
+    fetch_environment_from_elements, fetch_file_description,
+    update_export_environment, update_from_exported_elements,
+    update_import_environment
+)
+
+
+#: Minimum number of characters of a file parsed per block.
+MIN_FILE_SIZE = 20000
+
+#: Minimum number of characters of each chunk parsed from a stream.
+CHUNK_SIZE = 1024 * 1024
+
+#: Line appended to each block when its elements are parsed. It ends the
+#: arguments and the values of any element left opened at the end of the
+#: block, so that these elements include the null character.
+ELEMENT_TERMINATOR = "\x00) => {}) {};"
+
+#: Line appended to each block when its import and export statements are
+#: parsed, which ends any expression left opened at the end of the block.
+STATEMENT_TERMINATOR = "\x00}"
+
+#: State of a block followed by other blocks without top-level semi-colon.
+_BLOCK = "0"
+
+#: State of a block followed by a top-level semi-colon within other blocks.
+_BLOCK_WITH_SEMICOLON_AFTER = "1"
+
+#: State of the block ending the file.
+_LAST_BLOCK = "2"
+
+
+def split_blocks(content):
+    """Return list of (start, end) positions of top-level blocks in *content*.
+
+    The *content* is split before each line which follows an empty line and
+    which is neither within a comment nor within a nested element, so that
+    the docstring of an element is always within the same block as the
+    element. The blocks cover the entire *content*.
+
+    """
+    return _split_blocks(content, _fetch_spans(content))
+
+
+def fetch_environment_from_blocks(
+    content, file_path, file_id, module_id, blocks=None, max_value_length=None
+):
+    """Return tuple with file environment and blocks parsed from *content*.
+
+    The other arguments are the same as for
+    :func:`~champollion.parser.js_file.fetch_environment_from_content`.
+
+    *blocks* can be the dictionary of blocks previously returned for the same
+    file and module, so that the blocks which have not changed are not parsed
+    again. The blocks returned only contain the blocks of *content*.
+
+    A block with an element left opened at its end, such as a data without
+    semi-colon, is merged with the next blocks. The entire *content* is
+    parsed at once if it contains a single block, or if the same function is
+    found in several blocks as its environment would depend on the order in
+    which the function patterns are called.
+
+    """
+    if blocks is None:
+        blocks = {}
+
+    spans = _fetch_spans(content)
+    boundaries = _split_blocks(content, spans)
+    _blocks = {}
+
+    # Nothing can be reused from a file with a single block.
+    if len(boundaries) == 1:
+        return (
+            fetch_environment_from_content(
+                content, file_path, file_id, module_id,
+                max_value_length=max_value_length
+            ),
+            _blocks
+        )
+
+    # The value of a data left opened at the end of a block can only be
+    # ended by a top-level semi-colon within the next blocks.
+    last_semicolon = _fetch_last_semicolon(content, spans, 0, len(content))
+
+    results = []
+    line_offset = 0
+    index = 0
+
+    while index < len(boundaries):
+        start, end = boundaries[index]
+        step = 1
+
+        while True:
+            if end == len(content):
+                state = _LAST_BLOCK
+            elif end <= last_semicolon:
+                state = _BLOCK_WITH_SEMICOLON_AFTER
+            else:
+                state = _BLOCK
+
+            key = _digest(content[start:end], state, max_value_length)
+
+            if key in _blocks:
+                result = _blocks[key]
+
+            elif key in blocks:
+                result = blocks[key]
+
+            else:
+                result = _parse_block(
+                    content[start:end], module_id, state,
+                    max_value_length=max_value_length
+                )
+
+            # A block left opened is recorded as None.
+            _blocks[key] = result
+
+            if result is not None:
+                break
+
+            # The number of blocks merged is doubled each time so that a long
+            # sequence of blocks left opened is not parsed too many times.
+            index = min(index + step, len(boundaries) - 1)
+            end = boundaries[index][1]
+            step *= 2
+
+        results.append((result, line_offset))
+        line_offset += content.count("\n", start, end)
+        index += 1
+
+    elements = _merge_blocks(results, module_id)
+    if elements is None:
+        environment = fetch_environment_from_content(
+            content, file_path, file_id, module_id,
+            max_value_length=max_value_length
+        )
+
+    else:
+        environment = fetch_environment_from_elements(
+            content, file_path, file_id, module_id, elements
+        )
+
+    return environment, _blocks
+
+
+def fetch_stream_environment(
+    file_path, file_id, module_id, signature=None, max_value_length=None
+):
+    """Return file environment parsed from *file_path* read as a stream.
+
+    *file_id* represent the identifier of the file.
+
+    *module_id* represent the identifier of the module.
+
+    A :class:`~champollion.parser.js_file.LazyFileEnvironment` instance is
+    returned with the elements parsed with :func:`iter_elements_from_stream`,
+    so that the content of the file is only read again when it is accessed.
+    *signature* can be the file signature previously recorded, as returned by
+    :func:`~champollion.parser.reader.file_signature`.
+
+    *max_value_length* can be the maximum length of the data and attribute
+    values recorded.
+
+    Return None if the file is not readable.
+
+    """
+    elements = {
+        "export": {}, "import": {}, "class": {}, "function": {}, "data": {}
+    }
+    descriptions = []
+
+    def _iter_chunks(stream):
+        """Yield chunks from *stream* and record the file description."""
+        for chunk in _split_stream(stream):
+            if len(descriptions) == 0:
+                text, last = chunk
+
+                # The description is followed by other characters within
+                # the file if the chunk is not the last one.
+                descriptions.append(
+                    fetch_file_description(text if last else text + "\x00")
+                )
+
+            yield chunk
+
+    try:
+        with open(file_path, "r") as stream:
+            for category, element in _iter_chunk_elements(
+                _iter_chunks(stream), module_id, max_value_length
+            ):
+                elements[category][element["id"]] = element
+
+    except (IOError, OSError):
+        return
+
+    for category in ("class", "function", "data"):
+        for element in elements[category].values():
+            update_from_exported_elements(element, elements["export"])
+
+    elements["description"] = (descriptions or [None])[0]
+
+    return LazyFileEnvironment(
+        file_path, file_id, module_id, signature=signature,
+        environment=elements, max_value_length=max_value_length
+    )
+
+
+def iter_elements_from_stream(stream, module_id, max_value_length=None):
+    """Yield tuple with category and environment of elements from *stream*.
+
+    *stream* is an iterable of the lines of a file, such as a file object,
+    and *module_id* represent the identifier of the module.
+
+    *max_value_length* can be the maximum length of the data and attribute
+    values recorded.
+
+    The lines are gathered into chunks of at least :data:`CHUNK_SIZE`
+    characters which are split between top-level blocks, as with
+    :func:`split_blocks`. Each chunk is parsed on its own, so that only the
+    chunk and the copies made while parsing it are held in memory, and its
+    elements are yielded before the next chunk is read. A chunk with an
+    element left opened at its end is parsed again with the next chunk.
+
+    The elements are yielded with their line numbers within the file, but
+    they are not updated from the export environment. The elements are the
+    same as the ones returned by
+    :func:`~champollion.parser.js_file.fetch_environment_from_content`,
+    except for a function found within several chunks, for which the last
+    environment yielded prevails.
+
+    """
+    for category, element in _iter_chunk_elements(
+        _split_stream(stream), module_id, max_value_length
+    ):
+        yield category, element
+
+
+def _split_stream(stream):
+    """Yield chunks of top-level blocks from *stream*.
+
+    Each chunk is yielded as a tuple with its content and whether it ends the
+    stream.
+
+    """
+    lines = []
+    size = 0
+    threshold = CHUNK_SIZE
+
+    for line in stream:
+        lines.append(line)
+        size += len(line)
+
+        if size < threshold:
+            continue
+
+        content = "".join(lines)
+        boundary = _fetch_chunk_boundary(content)
+
+        # Twice as many characters are read before the content is split
+        # again, so that a long block is not scanned too many times.
+        if boundary is None:
+            lines = [content]
+            threshold = size * 2
+            continue
+
+        yield content[:boundary], False
+
+        lines = [content[boundary:]]
+        size = len(lines[0])
+        threshold = CHUNK_SIZE
+
+    content = "".join(lines)
+    if len(content) > 0:
+        yield content, True
+
+
+def _fetch_chunk_boundary(content):
+    """Return position of the last top-level block in *content*.
+
+    Only the blocks preceding the first comment or nested element which is
+    not closed within *content* are considered, as it could be closed within
+    the rest of the stream.
+
+    Return None if *content* can not be split.
+
+    """
+    filtered = filter_comments(content, keep_content_size=True)
+    limit = filtered.find("/*")
+    if limit == -1:
+        limit = len(content)
+
+    # Top-level nested elements are found with the same pairs of braces as
+    # with collapse_all, in a single scan.
+    spans = [
+        match.span() for match in pattern.COMMENT_PATTERN.finditer(content)
+    ]
+    openings = []
+
+    for match in pattern.BRACE_PATTERN.finditer(filtered, 0, limit):
+        if match.group() == "{":
+            openings.append(match.start())
+
+        elif len(openings) > 0:
+            start = openings.pop()
+            if len(openings) == 0:
+                spans.append((start, match.end()))
+
+    if len(openings) > 0:
+        limit = openings[0]
+
+    spans = _merge_spans(spans)
+    boundary = None
+
+    for start, _ in _split_blocks(content, spans)[1:]:
+        if start > limit:
+            break
+
+        boundary = start
+
+    return boundary
+
+
+def _iter_chunk_elements(chunks, module_id, max_value_length):
+    """Yield tuple with category and environment of elements from *chunks*.
+
+    *chunks* is an iterable of tuples as yielded by :func:`_split_stream`.
+
+    """
+    wildcards_numbers = {"export": 0, "import": 0}
+    line_offset = 0
+    pending = None
+
+    for content, last in chunks:
+        # A chunk left opened is parsed again with the next chunk.
+        if pending is not None:
+            content = pending + content
+            pending = None
+
+        # The rest of the stream is unknown, so the value of a data left
+        # opened is considered to be ended within the next chunks.
+        result = _parse_block(
+            content, module_id,
+            _LAST_BLOCK if last else _BLOCK_WITH_SEMICOLON_AFTER,
+            max_value_length=max_value_length
+        )
+
+        if result is None:
+            pending = content
+            continue
+
+        for category, element in _iter_block_elements(
+            result, module_id, line_offset, wildcards_numbers
+        ):
+            yield category, element
+
+        line_offset += content.count("\n")
+
+
+def _fetch_spans(content):
+    """Return tuple with start and end positions of the comments and of the
+    top-level nested elements in *content*, in ascending order."""
+    return _merge_spans(
+        [match.span() for match in pattern.COMMENT_PATTERN.finditer(content)] +
+        [
+            (start, end) for start, end, _ in collapse_all(
+                content, filter_comment=True
+            )[1].blocks
+        ]
+    )
+
+
+def _merge_spans(spans):
+    """Return tuple with start and end positions of *spans* merged when they
+    are nested or overlapping, in ascending order."""
+    starts = []
+    ends = []
+
+    for start, end in sorted(spans):
+        if len(ends) > 0 and start < ends[-1]:
+            ends[-1] = max(ends[-1], end)
+            continue
+
+        starts.append(start)
+        ends.append(end)
+
+    return starts, ends
+
+
+def _is_within(spans, position):
+    """Indicate whether *position* is strictly within one of *spans*."""
+    starts, ends = spans
+    index = bisect.bisect_left(starts, position) - 1
+    return index >= 0 and position < ends[index]
+
+
+def _split_blocks(content, spans):
+    """Return list of (start, end) positions of top-level blocks in *content*
+    from the comments and nested elements *spans*."""
+    blocks = []
+    position = 0
+
+    for match in pattern.EMPTY_LINES_PATTERN.finditer(content):
+        boundary = match.end()
+        if boundary == len(content):
+            break
+
+        if _is_within(spans, boundary):
+            continue
+
+        blocks.append((position, boundary))
+        position = boundary
+
+    blocks.append((position, len(content)))
+    return blocks
+
+
+def _fetch_last_semicolon(content, spans, start, end):
+    """Return position of the last semi-colon in *content* between *start*
+    and *end* which is not within one of *spans*, or -1."""
+    position = end
+
+    while True:
+        position = content.rfind(";", start, position)
+        if position == -1 or not _is_within(spans, position):
+            return position
+
+
+def _digest(content, state, max_value_length):
+    """Return key of block *content* parsed with *state*.
+
+    The key depends on *max_value_length* as the values are truncated when
+    the block is parsed.
+
+    """
+    digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
+    return "{0}:{1}:{2}".format(digest, state, max_value_length)
+
+
+def _parse_block(content, module_id, state, max_value_length=None):
+    """Return elements parsed from block *content* with *state*.
+
+    *max_value_length* can be the maximum length of the data and attribute
+    values recorded. The values are only truncated once the block is parsed,
+    as a value left opened at the end of the block is detected from the
+    null character of the terminator.
+
+    Return None if an element is left opened at the end of the block, unless
+    the block ends the file.
+
+    """
+    if state == _LAST_BLOCK:
+        statement_terminator = element_terminator = ""
+    else:
+        statement_terminator = STATEMENT_TERMINATOR + "\n"
+        element_terminator = ELEMENT_TERMINATOR + "\n"
+
+    docstrings = fetch_docstrings(content.split("\n"))
+
+    result = {
+        "export": {}, "import": {}, "class": {}, "function": {}, "data": {}
+    }
+
+    statement_content = content + statement_terminator
+    line_offsets = fetch_line_offsets(statement_content)
+    wildcards_number = 0
+
+    for match in pattern.EXPORTED_ELEMENT_PATTERN.finditer(statement_content):
+        if "\x00" in match.group():
+            return
+
+        line_number = (
+            get_line_number(line_offsets, match.start()) +
+            match.group("start_regex").count("\n")
+        )
+
+        wildcards_number = update_export_environment(
+            result["export"], match, module_id, line_number,
+            docstrings.get(line_number - 1),
+            wildcards_number=wildcards_number
+        )
+
+    wildcards_number = 0
+
+    for match in pattern.IMPORTED_ELEMENT_PATTERN.finditer(statement_content):
+        if "\x00" in match.group():
+            return
+
+        wildcards_number = update_import_environment(
+            result["import"], match, module_id,
+            wildcards_number=wildcards_number
+        )
+
+    element_content = content + element_terminator
+
+    for category, iter_elements in [
+        ("class", iter_class_elements),
+        ("function", iter_function_elements),
+        ("data", iter_data_elements),
+    ]:
+        for element in iter_elements(
+            element_content, module_id, docstrings=docstrings
+        ):
+            if category == "data":
+                # The value of a data left opened is ended by a semi-colon
+                # within the next blocks if any, otherwise the data can not
+                # be matched within the file.
+                if "\x00" in element["value"]:
+                    if state == _BLOCK_WITH_SEMICOLON_AFTER:
+                        return
+                    continue
+
+            elif "\x00" in "".join(element.get("arguments", [])):
+                return
+
+            if max_value_length is not None:
+                _truncate_values(category, element, max_value_length)
+
+            result[category][element["id"]] = element
+
+    return result
+
+
+def _truncate_values(category, element, max_value_length):
+    """Truncate values of data or class *element* to *max_value_length*.
+
+    Truncating a cleaned value returns the same value as cleaning it with
+    :func:`~champollion.parser.helper.clean_value` and *max_value_length*.
+
+    """
+    if category == "data":
+        element["value"] = clean_value(
+            element["value"], max_length=max_value_length
+        )
+
+    elif category == "class":
+        for attribute in element["attribute"].values():
+            attribute["value"] = clean_value(
+                attribute["value"], max_length=max_value_length
+            )
+
+
+def _merge_blocks(results, module_id):
+    """Return elements merged from block *results*.
+
+    *results* is a list of tuples with the elements parsed from a block and
+    the number of lines preceding the block within the file.
+
+    Return None if the same function is found in several blocks.
+
+    """
+    elements = {
+        "export": {}, "import": {}, "class": {}, "function": {}, "data": {}
+    }
+    wildcards_numbers = {"export": 0, "import": 0}
+
+    for result, line_offset in results:
+        for category, element in _iter_block_elements(
+            result, module_id, line_offset, wildcards_numbers
+        ):
+            if category == "function" and element["id"] in elements[category]:
+                return
+
+            elements[category][element["id"]] = element
+
+    return elements
+
+
+def _iter_block_elements(result, module_id, line_offset, wildcards_numbers):
+    """Yield tuple with category and element from block *result*.
+
+    The elements are copied with line numbers increased by *line_offset*.
+    *wildcards_numbers* is a dictionary with the number of wildcards
+    previously found within the export and import statements of the file,
+    which is used to number the wildcard identifiers within the entire file.
+
+    .. warning::
+
+        The *wildcards_numbers* are mutated.
+
+    """
+    for category in ("export", "import"):
+        for element in result[category].values():
+            element = dict(element)
+
+            if element["name"] == "*" and element["alias"] is None:
+                wildcards_numbers[category] += 1
+                element["id"] = "{0}.WILDCARD_{1}".format(
+                    module_id, wildcards_numbers[category]
+                )
+
+            if "line_number" in element:
+                element["line_number"] += line_offset
+
+            yield category, element
+
+    for category in ("class", "function", "data"):
+        for element in result[category].values():
+            yield category, _shift(element, line_offset)
+
+
+def _shift(element, line_offset):
+    """Return copy of *element* with line numbers increased by
+    *line_offset*."""
+    element = dict(element)
+    element["line_number"] += line_offset
+
+    for category in ("method", "attribute"):
+        if category in element:
+            element[category] = dict(
+                (member_id, _shift(member, line_offset))
+                for member_id, member in element[category].items()
+            )
+
+    return element
@@ -0,0 +1,945 @@
+# :coding: utf-8
+
+"""Assemble and maintain the :term:`Javascript` environment from the file
+and module environments.
+"""
+
+import os
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+try:
+    import concurrent.futures
+except ImportError:  # Python 2 without the 'futures' backport
+    concurrent = None
+
+from .js_module import fetch_environment as fetch_module_environment
+from .js_file import fetch_environment as fetch_file_environment
+from .js_file import fetch_environment_from_content
+from .batch import fetch_environments_from_contents
+from .block import fetch_environment_from_blocks, fetch_stream_environment
+from . import block
+from .reader import (
+    is_source_file, scan_files, list_folder, file_signature, map_ordered,
+    read_file
+)
+
+
+#: Element categories extracted from the file environments.
+ELEMENT_CATEGORIES = ["class", "method", "attribute", "function", "data"]
+
+
+def create_environment(lazy=False):
+    """Return empty :term:`Javascript` environment dictionary.
+
+    If *lazy* is set to True, each element category is a
+    :class:`LazyElementMapping` which resolves elements from the module and
+    file environments on demand.
+
+    """
+    environment = {"module": {}, "file": {}}
+
+    for category in ELEMENT_CATEGORIES:
+        if lazy:
+            environment[category] = LazyElementMapping(environment, category)
+        else:
+            environment[category] = {}
+
+    return environment
+
+
+def merge_environment(environment, other):
+    """Merge *other* environment into *environment*.
+
+    Lazy element categories are not merged as they are resolved from the
+    module and file environments.
+
+    .. warning::
+
+        The *environment* is mutated.
+
+    """
+    for key, value in other.items():
+        if isinstance(environment.get(key), LazyElementMapping):
+            continue
+
+        environment.setdefault(key, {})
+        environment[key].update(value)
+
+
+def fetch_file_entry(
+    file_id, file_path, files, module_names, lazy=False, signature=None,
+    content=None, max_value_length=None
+):
+    """Return tuple with module environment and file environment.
+
+    *file_id* represent the identifier of the file.
+
+    *files* is the list of the other file names stored in the same
+    directory as the one analyzed.
+
+    *module_names* is the list or set of all the other module names
+    previously fetched to help determine the module name of the current file.
+
+    If *lazy* is set to True, the file environment will only be parsed when
+    accessed. *signature* can be the file signature previously recorded
+    for the lazy file environment.
+
+    *content* can be the content of the file if it has already been read.
+
+    *max_value_length* can be the maximum length of the data and attribute
+    values recorded.
+
+    The file environment is None if the file is not readable.
+
+    """
+    module_environment = fetch_module_environment(
+        file_id, files, module_names=module_names
+    )
+
+    if content is not None and not lazy:
+        file_environment = fetch_environment_from_content(
+            content, file_path, file_id, module_environment["id"],
+            max_value_length=max_value_length
+        )
+    else:
+        file_environment = fetch_file_environment(
+            file_path, file_id, module_environment["id"], lazy=lazy,
+            signature=signature, max_value_length=max_value_length
+        )
+
+    return module_environment, file_environment
+
+
+def parse_files(
+    entries, workers=None, queue_size=None, cache=None, batch_size=None,
+    stream_size=None, max_value_length=None
+):
+    """Yield tuple with module environment and file environment per entry.
+
+    *entries* is an iterable of tuples with a source file, as yielded by
+    :func:`~champollion.parser.reader.scan_files`, and its content, as
+    yielded by :func:`~champollion.parser.reader.read_files`.
+
+    *workers* is the number of processes used to parse the files
+    concurrently. The files are parsed sequentially if it is not provided or
+    if :mod:`concurrent.futures` is not available.
+
+    *queue_size* is the maximum number of files waiting to be parsed or
+    consumed. It is twice the number of *workers* by default.
+
+    *cache* can be a :class:`~champollion.parser.snapshot.DirectorySnapshot`
+    instance used to fetch the file environments previously parsed, and to
+    record the file environments parsed. A file which has not been read is
+    read when its file environment can not be fetched from the *cache*. Large
+    files are parsed per block with
+    :func:`~champollion.parser.block.fetch_environment_from_blocks`, and their
+    blocks are recorded so that only the blocks which have changed are parsed
+    again.
+
+    *batch_size* is the maximum number of consecutive files parsed at once
+    with :func:`~champollion.parser.batch.fetch_environments_from_contents`,
+    which concatenates the small files to parse them within a single batch.
+    Each file is parsed on its own by default. *queue_size* is then the
+    maximum number of batches waiting to be parsed or consumed.
+
+    *stream_size* is the number of bytes above which a file is parsed as a
+    stream with :func:`~champollion.parser.block.fetch_stream_environment`
+    instead of being parsed from its content, which is then ignored.
+
+    *max_value_length* can be the maximum length of the data and attribute
+    values recorded. It is passed to the parser processes with each batch.
+
+    Module environments are fetched sequentially as each module name is
+    guessed from the modules previously fetched. The tuples are yielded in the
+    same order as *entries*, and the file environment is None if the content
+    is None.
+
+    """
+    module_names = set()
+
+    def _fetch_arguments():
+        """Yield module and cached file environments with parser arguments
+        per entry."""
+        for (file_id, file_path, files, signature), content in entries:
+            module_environment = fetch_module_environment(
+                file_id, files, module_names=module_names
+            )
+            module_names.add(module_environment["name"])
+
+            file_environment = None
+            blocks = None
+            stream = is_streamed(
+                (file_id, file_path, files, signature), stream_size
+            )
+
+            # The content of a file parsed as a stream is never held.
+            if stream:
+                content = None
+
+            if cache is not None:
+                file_environment = cache.fetch(
+                    file_path, signature, module_environment["id"]
+                )
+
+                # The content is only read when the file must be parsed.
+                if file_environment is not None:
+                    content = None
+                elif content is None and not stream:
+                    content = read_file(file_path)
+
+                if (
+                    content is not None and
+                    len(content) >= block.MIN_FILE_SIZE
+                ):
+                    blocks = cache.fetch_blocks(
+                        file_path, module_environment["id"]
+                    ) or {}
+
+            yield (module_environment, file_environment, signature), (
+                content, file_path, file_id, module_environment["id"], blocks,
+                stream and file_environment is None
+            )
+
+    def _fetch_batches():
+        """Yield list of tuples with item and parser arguments per batch."""
+        batch = []
+
+        for item, arguments in _fetch_arguments():
+            # A file parsed per block or as a stream is not parsed within a
+            # batch.
+            if arguments[4] is not None or arguments[5]:
+                if len(batch) > 0:
+                    yield batch
+                    batch = []
+
+                yield [(item, arguments)]
+                continue
+
+            batch.append((item, arguments))
+
+            if len(batch) >= (batch_size or 1):
+                yield batch
+                batch = []
+
+        if len(batch) > 0:
+            yield batch
+
+    def _result(item, arguments, result):
+        """Return module and file environment, and record parsed result."""
+        module_environment, cached_file_environment, signature = item
+        file_environment, blocks = result
+
+        if cached_file_environment is not None:
+            return module_environment, cached_file_environment
+
+        if cache is not None:
+            cache.record(
+                arguments[1], signature, module_environment["id"],
+                file_environment, blocks=blocks
+            )
+
+        return module_environment, file_environment
+
+    if not workers or concurrent is None:
+        for batch in _fetch_batches():
+            for (item, arguments), result in zip(
+                batch, _parse_contents(
+                    [arguments for _, arguments in batch], max_value_length
+                )
+            ):
+                yield _result(item, arguments, result)
+        return
+
+    if queue_size is None:
+        queue_size = workers * 2
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch, results in map_ordered(
+            pool, _parse_contents, (
+                (
+                    batch,
+                    ([arguments for _, arguments in batch], max_value_length)
+                )
+                for batch in _fetch_batches()
+            ), queue_size
+        ):
+            for (item, arguments), result in zip(batch, results):
+                yield _result(item, arguments, result)
+
+
+def is_streamed(source_file, stream_size):
+    """Indicate whether *source_file* is parsed as a stream.
+
+    *source_file* is a tuple as yielded by
+    :func:`~champollion.parser.reader.scan_files`, and the file is parsed as
+    a stream if its size exceeds *stream_size* bytes.
+
+    """
+    signature = source_file[3]
+    return (
+        stream_size is not None and signature is not None and
+        signature[1] > stream_size
+    )
+
+
+def _parse_content(
+    content, file_path, file_id, module_id, blocks=None, stream=False,
+    max_value_length=None
+):
+    """Return tuple with file environment and blocks parsed from *content*.
+
+    The file is parsed per block if *blocks* is not None, or read from
+    *file_path* as a stream if *stream* is True. Otherwise, the file
+    environment is None if *content* is None. The blocks are None if the file
+    is not parsed per block.
+
+    """
+    if stream:
+        return fetch_stream_environment(
+            file_path, file_id, module_id, max_value_length=max_value_length
+        ), None
+
+    if content is None:
+        return None, None
+
+    if blocks is not None:
+        return fetch_environment_from_blocks(
+            content, file_path, file_id, module_id, blocks=blocks,
+            max_value_length=max_value_length
+        )
+
+    return fetch_environment_from_content(
+        content, file_path, file_id, module_id,
+        max_value_length=max_value_length
+    ), None
+
+
+def _parse_contents(entries, max_value_length=None):
+    """Return list of tuples with file environment and blocks parsed from
+    parser arguments *entries*."""
+    if len(entries) == 1:
+        return [
+            _parse_content(*entries[0], max_value_length=max_value_length)
+        ]
+
+    return [
+        (file_environment, None) for file_environment in
+        fetch_environments_from_contents(
+            [entry[:4] for entry in entries],
+            max_value_length=max_value_length
+        )
+    ]
+
+
+def update_environment(environment, module_environment, file_environment):
+    """Add *module_environment* and *file_environment* to *environment*.
+
+    Methods and attributes are extracted from the class environments in order
+    to set them in the top level environment.
+
+    .. warning::
+
+        The *environment* is mutated.
+
+    """
+    environment["module"][module_environment["id"]] = module_environment
+
+    if file_environment is None:
+        return
+
+    environment["file"][file_environment["id"]] = file_environment
+
+    if isinstance(environment["class"], LazyElementMapping):
+        return
+
+    for category, elements in iter_file_elements(file_environment):
+        environment[category].update(elements)
+
+
+def remove_environment(environment, file_id):
+    """Remove file and elements associated with *file_id* from *environment*.
+
+    Elements are only removed if they still belong to the file, in case another
+    file registered an element with the same identifier.
+
+    Return the removed file environment, or None if the file is not in the
+    *environment*.
+
+    .. warning::
+
+        The *environment* is mutated.
+
+    """
+    file_environment = environment["file"].pop(file_id, None)
+    module_id = None
+
+    for _module_id, _module in environment["module"].items():
+        if _module["file_id"] == file_id:
+            module_id = _module_id
+            break
+
+    if module_id is not None:
+        del environment["module"][module_id]
+
+    if file_environment is None:
+        return
+
+    for category, elements in iter_file_elements(file_environment):
+        for element_id, element in elements.items():
+            if environment[category].get(element_id) is element:
+                del environment[category][element_id]
+
+    return file_environment
+
+
+def iter_file_elements(file_environment):
+    """Yield tuple with category and element mapping from *file_environment*.
+
+    Methods and attributes are gathered from all classes of the file.
+
+    """
+    method_environment = {}
+    attribute_environment = {}
+
+    for _class in file_environment["class"].values():
+        method_environment.update(_class["method"])
+        attribute_environment.update(_class["attribute"])
+
+    yield "class", file_environment["class"]
+    yield "method", method_environment
+    yield "attribute", attribute_environment
+    yield "function", file_environment["function"]
+    yield "data", file_environment["data"]
+
+
+class LazyElementMapping(Mapping):
+    """Element category of an environment resolved on demand.
+
+    An element identifier is resolved by looking for the modules which
+    identifier is a prefix of the element identifier, from the longest to the
+    shortest, and by parsing the corresponding file environment if necessary.
+
+    Iterating over the mapping requires to parse all file environments.
+
+    """
+
+    def __init__(self, environment, category):
+        """Initiate mapping for *category* within *environment*.
+        """
+        self._environment = environment
+        self._category = category
+
+    def __getitem__(self, element_id):
+        """Return element environment from *element_id*."""
+        for file_environment in self._candidate_files(element_id):
+            elements = self._elements(file_environment)
+            if element_id in elements:
+                return elements[element_id]
+
+        raise KeyError(element_id)
+
+    def __iter__(self):
+        """Iterate over all element identifiers."""
+        for file_environment in list(self._environment["file"].values()):
+            for element_id in self._elements(file_environment):
+                yield element_id
+
+    def __len__(self):
+        """Return number of elements."""
+        return sum(
+            len(self._elements(file_environment))
+            for file_environment in self._environment["file"].values()
+        )
+
+    def __eq__(self, other):
+        """Indicate whether mapping is equal to *other*."""
+        if isinstance(other, LazyElementMapping):
+            return (
+                self._category == other._category and
+                self._environment["file"] == other._environment["file"]
+            )
+
+        return super(LazyElementMapping, self).__eq__(other)
+
+    def __ne__(self, other):
+        """Indicate whether mapping is different from *other*."""
+        return not self == other
+
+    __hash__ = None
+
+    def _candidate_files(self, element_id):
+        """Yield file environments which could define *element_id*."""
+        hierarchy = element_id.split(".")
+
+        for index in reversed(range(1, len(hierarchy))):
+            module_id = ".".join(hierarchy[:index])
+            module_environment = self._environment["module"].get(module_id)
+            if module_environment is None:
+                continue
+
+            file_environment = self._environment["file"].get(
+                module_environment["file_id"]
+            )
+            if file_environment is not None:
+                yield file_environment
+
+    def _elements(self, file_environment):
+        """Return elements of the category from *file_environment*."""
+        if self._category in ("method", "attribute"):
+            return dict(iter_file_elements(file_environment))[self._category]
+
+        return file_environment[self._category]
+
+
+class IncrementalEnvironment(object):
+    """Long-lived :term:`Javascript` environment updated from file events.
+
+    The environment is fetched once from *path* and then patched in place when
+    files are changed, added or removed, so that only the files concerned
+    are parsed again::
+
+        >>> incremental = IncrementalEnvironment("/path/to/example")
+        >>> incremental.file_changed("/path/to/example/index.js")
+        {"module": set(), "file": {"example/index.js"}, "class": {...}, ...}
+
+    Each event returns a dictionary with the identifiers which have been
+    added, modified or removed per category.
+
+    The :meth:`poll` method can be used as a simple polling driver when no
+    file system notification is available.
+
+    """
+
+    def __init__(self, path, max_value_length=None):
+        """Initiate environment from *path*.
+
+        *max_value_length* can be the maximum length of the data and attribute
+        values recorded.
+
+        Raises :exc:`OSError` if the directory is incorrect.
+
+        """
+        if not os.path.isdir(path) or not os.access(path, os.R_OK):
+            raise OSError(
+                "The javascript package directory is incorrect: {0}".format(
+                    path
+                )
+            )
+
+        self.path = path
+        self.environment = create_environment()
+        self._max_value_length = max_value_length
+
+        #: Signature recorded for each file path when last parsed.
+        self._signatures = {}
+
+        #: Names of the modules registered, or None if they must be gathered
+        #: again from the environment after a file has been removed.
+        self._module_names = set()
+
+        for file_id, file_path, files, signature in scan_files(path):
+            self._register(file_id, file_path, files, signature=signature)
+
+    def file_changed(self, file_path):
+        """Parse *file_path* again and return changed identifiers."""
+        return self._update(file_path)
+
+    def file_added(self, file_path):
+        """Parse new *file_path* and return changed identifiers."""
+        return self._update(file_path)
+
+    def file_removed(self, file_path):
+        """Remove *file_path* from environment and return changed identifiers.
+        """
+        return self._update(file_path)
+
+    def poll(self):
+        """Detect modified files since last event and return changed
+        identifiers.
+
+        File signatures are compared with the ones recorded when each file
+        was last parsed.
+
+        """
+        changes = _create_changes()
+
+        current = {}
+        for _, file_path, _, signature in scan_files(self.path):
+            current[file_path] = signature
+
+        # Process index files last as they affect the other files in folder.
+        for file_path in sorted(
+            set(current) | set(self._signatures),
+            key=lambda _path: os.path.basename(_path) == "index.js"
+        ):
+            if file_path not in current:
+                _changes = self.file_removed(file_path)
+            elif file_path not in self._signatures:
+                _changes = self.file_added(file_path)
+            elif current[file_path] != self._signatures[file_path]:
+                _changes = self.file_changed(file_path)
+            else:
+                continue
+
+            for category, identifiers in _changes.items():
+                changes[category].update(identifiers)
+
+        return changes
+
+    def _update(self, file_path):
+        """Register *file_path* again and return changed identifiers.
+
+        The file is removed from the environment if it does not exist anymore.
+
+        """
+        file_id = self._file_id(file_path)
+        if file_id is None:
+            return _create_changes()
+
+        exists = os.path.isfile(file_path)
+
+        # Adding or removing an index file modifies the module identifier of
+        # all the other files within the same folder.
+        if (
+            os.path.basename(file_path) == "index.js" and
+            exists != (file_id in self.environment["file"])
+        ):
+            return self._refresh_folder(file_path)
+
+        previous = _snapshot(self.environment, file_id)
+        remove_environment(self.environment, file_id)
+        self._signatures.pop(file_path, None)
+        self._module_names = None
+
+        if exists:
+            files = self._sibling_files(file_path)
+            self._register(file_id, file_path, files)
+
+        return _compare(previous, _snapshot(self.environment, file_id))
+
+    def _register(self, file_id, file_path, files, signature=None):
+        """Parse *file_path* and add it to the environment.
+
+        *signature* can be the file signature recorded when listing the
+        folder.
+
+        """
+        if self._module_names is None:
+            self._module_names = set(
+                _module["name"] for _module in
+                self.environment["module"].values()
+            )
+
+        module_environment, file_environment = fetch_file_entry(
+            file_id, file_path, files, module_names=self._module_names,
+            max_value_length=self._max_value_length
+        )
+        update_environment(
+            self.environment, module_environment, file_environment
+        )
+        self._module_names.add(module_environment["name"])
+
+        if signature is None:
+            signature = file_signature(file_path)
+
+        self._signatures[file_path] = signature
+
+    def _refresh_folder(self, file_path):
+        """Register all files in *file_path* folder again."""
+        folder = os.path.dirname(file_path)
+        file_paths = set(
+            _path for _path in self._signatures
+            if os.path.dirname(_path) == folder
+        )
+        file_paths.update(
+            os.path.join(folder, _file)
+            for _file in self._sibling_files(file_path)
+        )
+
+        file_ids = [self._file_id(_path) for _path in sorted(file_paths)]
+        previous = _snapshot(self.environment, *file_ids)
+
+        for _path, _file_id in zip(sorted(file_paths), file_ids):
+            remove_environment(self.environment, _file_id)
+            self._signatures.pop(_path, None)
+
+        self._module_names = None
+
+        files = self._sibling_files(file_path)
+        for _path, _file_id in zip(sorted(file_paths), file_ids):
+            if os.path.basename(_path) in files:
+                self._register(_file_id, _path, files)
+
+        return _compare(previous, _snapshot(self.environment, *file_ids))
+
+    def _file_id(self, file_path):
+        """Return file identifier from *file_path*.
+
+        Return None if the file is not part of the environment.
+
+        """
+        relative_path = os.path.relpath(file_path, self.path)
+        hierarchy = relative_path.split(os.sep)
+
+        if hierarchy[0] == os.pardir or not is_source_file(hierarchy[-1]):
+            return
+
+        if any(folder.startswith(".") for folder in hierarchy[:-1]):
+            return
+
+        return "/".join([os.path.basename(self.path)] + hierarchy)
+
+    def _sibling_files(self, file_path):
+        """Return source file names stored in the folder of *file_path*."""
+        files, _ = list_folder(os.path.dirname(file_path))
+        return [file_name for file_name, _ in files]
+
+
+def _create_changes():
+    """Return empty dictionary of changed identifiers per category."""
+    return dict(
+        (category, set()) for category in create_environment().keys()
+    )
+
+
+def _snapshot(environment, *file_ids):
+    """Return environment subset associated with *file_ids*."""
+    snapshot = create_environment()
+
+    for module_id, _module in environment["module"].items():
+        if _module["file_id"] in file_ids:
+            snapshot["module"][module_id] = _module
+
+    for file_id in file_ids:
+        file_environment = environment["file"].get(file_id)
+        if file_environment is None:
+            continue
+
+        snapshot["file"][file_id] = file_environment
+        for category, elements in iter_file_elements(file_environment):
+            snapshot[category].update(elements)
+
+    return snapshot
+
+
+def _compare(previous, current):
+    """Return identifiers which differ between *previous* and *current*
+    snapshots.
+    """
+    changes = _create_changes()
+
+    for category in changes.keys():
+        for element_id in set(previous[category]) | set(current[category]):
+            if (
+                previous[category].get(element_id) !=
+                current[category].get(element_id)
+            ):
+                changes[category].add(element_id)
+
+    return changes
+
+
+class LazyEnvironment(Mapping):
+    """:term:`Javascript` environment resolved on demand from *paths*.
+
+    It can be used as a read-only mapping with the same keys as the
+    dictionary returned by :func:`champollion.parser.fetch_environment`, but
+    nothing is parsed when it is created::
+
+        >>> environment = LazyEnvironment("/path/to/example")
+        >>> environment["class"]["example.utils.AwesomeClass"]
+        {"id": "example.utils.AwesomeClass", ...}
+
+    A module identifier is resolved by listing only the folders along its
+    path, and a file is only parsed when one of its elements is first
+    accessed. Iterating over a category requires to list all the folders.
+
+    .. note::
+
+        As the folders are not all listed, module names are guessed from the
+        modules defined in the parent folders only.
+
+    """
+
+    def __init__(self, *paths, **options):
+        """Initiate environment from *paths*.
+
+        The *max_value_length* option can be the maximum length of the data
+        and attribute values recorded when the files are parsed.
+
+        Raises :exc:`OSError` if a directory is incorrect.
+
+        """
+        self._max_value_length = options.pop("max_value_length", None)
+
+        if len(options) > 0:
+            raise TypeError(
+                "Unexpected options: {0}".format(", ".join(sorted(options)))
+            )
+
+        #: Source path associated with each repository name.
+        self._roots = {}
+
+        for path in paths:
+            if not os.path.isdir(path) or not os.access(path, os.R_OK):
+                raise OSError(
+                    "The javascript package directory is incorrect: "
+                    "{0}".format(path)
+                )
+
+            self._roots[os.path.basename(path)] = path
+
+        #: Module names defined in each folder already listed.
+        self._folders = {}
+
+        self._modules = {}
+        self._files = {}
+
+        self._environment = {
+            "module": _FolderIndexMapping(self, "module"),
+            "file": _FolderIndexMapping(self, "file"),
+        }
+
+        for category in ELEMENT_CATEGORIES:
+            self._environment[category] = LazyElementMapping(self, category)
+
+    def __getitem__(self, key):
+        """Return mapping for *key* category."""
+        return self._environment[key]
+
+    def __iter__(self):
+        """Iterate over the environment categories."""
+        return iter(self._environment)
+
+    def __len__(self):
+        """Return number of categories."""
+        return len(self._environment)
+
+    def resolve_module(self, module_id):
+        """List folders which could contain the *module_id*."""
+        hierarchy = module_id.split(".")
+
+        for index in range(1, len(hierarchy) + 1):
+            self._index_folder(hierarchy[0], tuple(hierarchy[1:index]))
+
+    def resolve_file(self, file_id):
+        """List folder which could contain the *file_id*."""
+        hierarchy = file_id.split("/")
+        self._index_folder(hierarchy[0], tuple(hierarchy[1:-1]))
+
+    def resolve_all(self):
+        """List all folders."""
+        for repository_name, path in self._roots.items():
+            for root, dirs, _ in os.walk(path):
+                dirs[:] = [d for d in dirs if not d.startswith(".")]
+
+                relative_path = os.path.relpath(root, path)
+                folders = ()
+                if relative_path != os.curdir:
+                    folders = tuple(relative_path.split(os.sep))
+
+                self._index_folder(repository_name, folders)
+
+    def _index_folder(self, repository_name, folders):
+        """Register modules and files from *folders* within repository.
+
+        Parent folders are registered first so that their module names can
+        be used to guess the module names of the folder.
+
+        Return list of module names defined in the folder.
+
+        """
+        key = (repository_name,) + folders
+        if key in self._folders:
+            return self._folders[key][0]
+
+        module_names = []
+        sub_folders = []
+        self._folders[key] = (module_names, sub_folders)
+
+        path = self._roots.get(repository_name)
+        if path is None:
+            return module_names
+
+        parent_module_names = []
+
+        for index in range(len(folders)):
+            parent_module_names += self._index_folder(
+                repository_name, folders[:index]
+            )
+
+        if len(folders) > 0:
+            parent_key = key[:-1]
+            if folders[-1] not in self._folders[parent_key][1]:
+                return module_names
+
+            path = os.path.join(path, *folders)
+
+        files, folder_names = list_folder(path)
+        sub_folders.extend(folder_names)
+
+        file_names = [file_name for file_name, _ in files]
+        known_module_names = set(parent_module_names)
+
+        for file_name, signature in files:
+            file_id = "/".join(key + (file_name,))
+
+            module_environment, file_environment = fetch_file_entry(
+                file_id, os.path.join(path, file_name), file_names,
+                module_names=known_module_names, lazy=True,
+                signature=signature, max_value_length=self._max_value_length
+            )
+
+            self._modules[module_environment["id"]] = module_environment
+            module_names.append(module_environment["name"])
+            known_module_names.add(module_environment["name"])
+
+            if file_environment is not None:
+                self._files[file_id] = file_environment
+
+        return module_names
+
+
+class _FolderIndexMapping(Mapping):
+    """Module or file mapping of a :class:`LazyEnvironment`.
+
+    Folders are listed on demand when an identifier is not found.
+
+    """
+
+    def __init__(self, environment, category):
+        """Initiate mapping for *category* within *environment*."""
+        self._environment = environment
+        self._category = category
+
+    def __getitem__(self, key):
+        """Return module or file environment from *key*."""
+        elements = self._elements()
+        if key not in elements:
+            if self._category == "module":
+                self._environment.resolve_module(key)
+            else:
+                self._environment.resolve_file(key)
+
+        return elements[key]
+
+    def __iter__(self):
+        """Iterate over all identifiers."""
+        self._environment.resolve_all()
+        return iter(list(self._elements()))
+
+    def __len__(self):
+        """Return number of identifiers."""
+        self._environment.resolve_all()
+        return len(self._elements())
+
+    def _elements(self):
+        """Return mapping of resolved elements."""
+        if self._category == "module":
+            return self._environment._modules
+
+        return self._environment._files
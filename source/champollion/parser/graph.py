@@ -0,0 +1,209 @@
+# :coding: utf-8
+
+"""Graph of the dependencies between :term:`Javascript` modules.
+
+The graph is built once from a parsed environment and links each module to
+the modules it imports or exports elements from, and the other way around,
+so that the modules affected by a change can be found without walking the
+environment again::
+
+    >>> graph = ModuleGraph(environment)
+    >>> graph.dependencies("example")
+    frozenset(["example.utils"])
+    >>> graph.dependents("example.utils")
+    frozenset(["example"])
+    >>> graph.exporters("example.utils.AwesomeClass")
+    frozenset(["example", "example.utils"])
+
+The graph is not built by the :term:`Sphinx` extension, as the documents
+are all read again when the environment changes. It can be built by tools
+patching an environment, such as
+:class:`~champollion.parser.environment.IncrementalEnvironment`, to find the
+modules affected by a file change.
+
+"""
+
+import collections
+
+from .resolver import ExportResolver, EXPORTED_CATEGORIES
+
+
+class ModuleGraph(object):
+    """Forward and reverse dependencies between modules in *environment*.
+
+    *environment* is the full :term:`Javascript` environment processed in
+    :mod:`~champollion.parser`.
+
+    Only the modules available in the *environment* are linked, the
+    dependencies to external packages are ignored.
+
+    .. warning::
+
+        All files of a lazy environment are parsed when the graph is built.
+
+    """
+
+    def __init__(self, environment):
+        """Initiate graph from *environment*."""
+        self._modules = sorted(environment["module"].keys())
+        self._file_modules = {}
+
+        self._dependencies = collections.defaultdict(set)
+        self._dependents = collections.defaultdict(set)
+        self._exporters = collections.defaultdict(set)
+        self._affected = {}
+
+        for module_id in self._modules:
+            module_environment = environment["module"][module_id]
+            self._file_modules[module_environment["file_id"]] = module_id
+
+            file_environment = environment["file"].get(
+                module_environment["file_id"]
+            )
+            if file_environment is None:
+                continue
+
+            for category in ["import", "export"]:
+                for element in file_environment[category].values():
+                    _module_id = element["module"]
+
+                    if (
+                        _module_id is None or _module_id == module_id or
+                        _module_id not in environment["module"].keys()
+                    ):
+                        continue
+
+                    self._dependencies[module_id].add(_module_id)
+                    self._dependents[_module_id].add(module_id)
+
+        self._index_exporters(environment)
+
+    def _index_exporters(self, environment):
+        """Record the modules exporting each element in *environment*."""
+        resolver = ExportResolver(environment)
+
+        named = collections.defaultdict(set)
+        defaults = collections.defaultdict(set)
+        wildcards = collections.defaultdict(list)
+
+        for module_id in self._modules:
+            file_environment = environment["file"].get(
+                environment["module"][module_id]["file_id"]
+            )
+            if file_environment is None:
+                continue
+
+            for category in EXPORTED_CATEGORIES:
+                for element in file_environment[category].values():
+                    # Default exports are also flagged as exported.
+                    if element["default"]:
+                        defaults[module_id].add(element["id"])
+                    elif element["exported"]:
+                        named[module_id].add(element["id"])
+
+            for element in resolver.fetch_export_table(module_id):
+                if element["wildcard"]:
+                    wildcards[module_id].append(element["module_id"])
+                elif element["name"] == "default":
+                    defaults[module_id].add(element["element_id"])
+                else:
+                    named[module_id].add(element["element_id"])
+
+        for module_id in self._modules:
+            for element_id in defaults[module_id]:
+                self._exporters[element_id].add(module_id)
+
+            # Wildcard exports only include the named exports, recursively.
+            module_ids = [module_id]
+            visited = set(module_ids)
+
+            while len(module_ids) > 0:
+                _module_id = module_ids.pop()
+
+                for element_id in named[_module_id]:
+                    self._exporters[element_id].add(module_id)
+
+                for __module_id in wildcards[_module_id]:
+                    if __module_id not in visited:
+                        visited.add(__module_id)
+                        module_ids.append(__module_id)
+
+    @property
+    def modules(self):
+        """Return sorted list of module identifiers within the graph."""
+        return list(self._modules)
+
+    def dependencies(self, module_id):
+        """Return modules which *module_id* imports or exports from."""
+        return frozenset(self._dependencies.get(module_id, ()))
+
+    def dependents(self, module_id):
+        """Return modules which import or export from *module_id*."""
+        return frozenset(self._dependents.get(module_id, ()))
+
+    def exporters(self, element_id):
+        """Return modules which export the element *element_id*.
+
+        The module defining the element is included if the element is
+        exported, as well as each module re-exporting it by name or with a
+        wildcard export.
+
+        """
+        return frozenset(self._exporters.get(element_id, ()))
+
+    def affected_modules(self, file_id):
+        """Return modules affected by a change of the file *file_id*.
+
+        It includes the module defined by the file and all the modules which
+        depend on it, directly or not. Only the module identifiers are
+        returned, finding the pages which document these modules is left to
+        the caller.
+
+        """
+        if file_id not in self._affected:
+            module_id = self._file_modules.get(file_id)
+            if module_id is None:
+                return frozenset()
+
+            module_ids = [module_id]
+            visited = set(module_ids)
+
+            while len(module_ids) > 0:
+                for _module_id in self._dependents.get(module_ids.pop(), ()):
+                    if _module_id not in visited:
+                        visited.add(_module_id)
+                        module_ids.append(_module_id)
+
+            self._affected[file_id] = frozenset(visited)
+
+        return self._affected[file_id]
+
+    def to_adjacency(self):
+        """Return compact adjacency structure of the graph.
+
+        The structure can be serialized in JSON and is in the form of::
+
+            {
+                "modules": ["example", "example.utils"],
+                "dependencies": [[1], []]
+            }
+
+        Each module is referenced by its index in the sorted list of
+        modules, and the dependencies of each module are listed at the same
+        index.
+
+        """
+        indices = dict(
+            (module_id, index) for index, module_id in enumerate(self._modules)
+        )
+
+        return {
+            "modules": list(self._modules),
+            "dependencies": [
+                sorted(
+                    indices[_module_id] for _module_id
+                    in self._dependencies.get(module_id, ())
+                )
+                for module_id in self._modules
+            ]
+        }
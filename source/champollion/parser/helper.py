@@ -1,16 +1,20 @@
 # :coding: utf-8
 
-import re
+import bisect
 
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
 
-#: Regular Expression pattern for single line comments
-_ONE_LINE_COMMENT_PATTERN = re.compile(r"(\n|^| )//.*?\n")
+from . import pattern
 
-#: Regular Expression pattern for multi-line comments
-_MULTI_LINES_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
 
-#: Regular Expression pattern for nested element symbols
-_NESTED_ELEMENT_PATTERN = re.compile(r"{[^{}]*}")
+#: String ending the values truncated by :func:`clean_value`.
+TRUNCATION_MARKER = "..."
+
+#: Characters after which a space is kept when joining the value lines.
+_VALUE_SEPARATORS = ("{", "}", "(", ")", "[", "]", ";", ",")
 
 
 def filter_comments(
@@ -23,6 +27,10 @@ def filter_comments(
 
     If *keep_content_size* is set to True, the size of the content is preserved.
 
+    The comments are found in one scan of the content, so that a comment
+    nested within another comment is ignored, and the filtered content is
+    assembled once from the parts between the comments.
+
     .. note::
 
         The filtered content keep the same number of lines as the
@@ -31,54 +39,60 @@ def filter_comments(
     .. seealso:: https://www.w3schools.com/js/js_comments.asp
 
     """
-    def _replace_comment(element):
-        """Replace matched *element* in content."""
-        replacement = ""
-        matched = element.group()
+    if filter_multiline_comment:
+        comment_pattern = pattern.COMMENT_PATTERN
+    else:
+        comment_pattern = pattern.ONE_LINE_COMMENT_PATTERN
+
+    chunks = []
+    position = 0
 
-        # Ensure that only the comment part is being replaced
-        if not matched.startswith("/"):
-            replacement += matched[0]
-            matched = matched[1:]
+    for match in comment_pattern.finditer(content):
+        start, end = match.span()
+        chunks.append(content[position:start])
 
-        count = matched.count("\n")
+        count = content.count("\n", start, end)
 
         # Add empty spaces with the size of the content if the size
         # must be kept.
         if keep_content_size:
-            _buffer = len(matched) - count
-            replacement += " " * _buffer + "\n" * count
+            chunks.append(" " * (end - start - count) + "\n" * count)
 
         # Otherwise simply keep the number of lines
-        else:
-            replacement += "\n" * count
-
-        return replacement
+        elif count > 0:
+            chunks.append("\n" * count)
 
-    content = _ONE_LINE_COMMENT_PATTERN.sub(_replace_comment, content)
+        position = end
 
-    if filter_multiline_comment:
-        content = _MULTI_LINES_COMMENT_PATTERN.sub(_replace_comment, content)
+    chunks.append(content[position:])
 
-    return content
+    return "".join(chunks)
 
 
 def collapse_all(content, filter_comment=False):
-    """Return tuple of *content* with the top level elements only and dictionary
+    """Return tuple of *content* with the top level elements only and mapping
     containing the collapsed content associated with the *line number*.
 
     If *filter_comment* is set to True, all comment are removed from the content
-    before collapsing the elements. The collapsed content dictionary preserve
+    before collapsing the elements. The collapsed content mapping preserve
     the comments.
 
+    The collapsed content mapping is a :class:`CollapsedBlocks` instance
+    which only records the position of each element within the original
+    *content*, so that the content of an element is only sliced when it is
+    requested.
+
     .. note::
 
         The content with collapsed elements keep the same number of
         lines as the original content.
 
     """
-    _initial_content = content
-    collapsed_content = {}
+    collapsed_content = CollapsedBlocks(content)
+
+    # The positions of the elements matched are the same in the original
+    # content as the replacements keep the content size.
+    line_offsets = fetch_line_offsets(content)
 
     if filter_comment:
         # Filter comment before collapsing elements to prevent comment analysis
@@ -86,17 +100,18 @@ def collapse_all(content, filter_comment=False):
 
     def _replace_element(element):
         """Replace matched *element* in content."""
+        start, end = element.span()
+
         # Guess line number
-        count = element.group().count("\n")
+        count = element.string.count("\n", start, end)
 
         # Ensure that the replacement string keep the same length that
         # the original content to be able to use the match positions
-        _buffer = len(element.group()) - count - 2
+        _buffer = end - start - count - 2
 
-        if len(element.group()) > 2:
-            line_number = content[:element.start()].count("\n")+1
-            collapsed_content[line_number] = (
-                _initial_content[element.start():element.end()]
+        if end - start > 2:
+            collapsed_content.add(
+                start, end, get_line_number(line_offsets, start)
             )
 
         return "<>{buffer}{lines}".format(
@@ -108,14 +123,144 @@ def collapse_all(content, filter_comment=False):
 
     while _content != content:
         _content = content
-        content = _NESTED_ELEMENT_PATTERN.sub(_replace_element, content)
+        content = pattern.NESTED_ELEMENT_PATTERN.sub(_replace_element, content)
 
     # Remove the space buffer before returning the content
-    content = re.sub(r"<> *", lambda x: "{}", content)
+    content = pattern.COLLAPSED_ELEMENT_PATTERN.sub("{}", content)
 
     return content, collapsed_content
 
 
+class CollapsedBlocks(Mapping):
+    """Content of the elements collapsed by :func:`collapse_all`.
+
+    Each element is recorded as a tuple containing its start and end
+    positions within the original content and its line number. The mapping
+    associates each line number with the content of the last element
+    recorded for this line, which is sliced from the original content on
+    demand::
+
+        >>> blocks = CollapsedBlocks("const a = {b: 1};")
+        >>> blocks.add(10, 16, 1)
+        >>> blocks[1]
+        '{b: 1}'
+
+    The memory used is therefore proportional to the number of elements
+    instead of the size of the nested elements.
+
+    """
+
+    def __init__(self, content):
+        """Initiate mapping for elements collapsed from *content*."""
+        self._content = content
+        self._blocks = []
+        self._spans = {}
+
+    @property
+    def blocks(self):
+        """Return list of (start, end, line number) tuples recorded."""
+        return list(self._blocks)
+
+    def add(self, start, end, line_number):
+        """Record element between *start* and *end* at *line_number*."""
+        self._blocks.append((start, end, line_number))
+        self._spans[line_number] = (start, end)
+
+    def span(self, line_number):
+        """Return (start, end) positions of element at *line_number*."""
+        return self._spans[line_number]
+
+    def __getitem__(self, line_number):
+        """Return content of element at *line_number*."""
+        start, end = self._spans[line_number]
+        return self._content[start:end]
+
+    def __contains__(self, line_number):
+        """Indicate whether an element is recorded at *line_number*."""
+        return line_number in self._spans
+
+    def __iter__(self):
+        """Iterate over line numbers of the elements recorded."""
+        return iter(self._spans)
+
+    def __len__(self):
+        """Return number of line numbers with an element recorded."""
+        return len(self._spans)
+
+
+def clean_value(value, max_length=None):
+    """Return *value* cleaned up for display on one line.
+
+    Each line of *value* is stripped and the lines are joined, with a space
+    kept after brackets, semi-colons and commas::
+
+        >>> clean_value("{\n    key: 'value',\n    other: 42\n}")
+        "{ key: 'value', other: 42}"
+
+    If *max_length* is provided, the lines are only cleaned until this length
+    is reached, and the value is then truncated and ended with
+    :data:`TRUNCATION_MARKER`. The value is cleaned entirely by default.
+
+    """
+    chunks = []
+    length = 0
+    position = 0
+
+    while position <= len(value):
+        end = value.find("\n", position)
+        if end == -1:
+            end = len(value)
+
+        line = value[position:end].strip()
+        position = end + 1
+
+        if len(line) == 0:
+            continue
+
+        # Let trailing space to make the code easier to read
+        if len(chunks) > 0 and chunks[-1][-1] in _VALUE_SEPARATORS:
+            chunks.append(" ")
+            length += 1
+
+        chunks.append(line)
+        length += len(line)
+
+        if max_length is not None and length > max_length:
+            return "".join(chunks)[:max_length].rstrip() + TRUNCATION_MARKER
+
+    return "".join(chunks)
+
+
+def fetch_line_offsets(content):
+    """Return sorted list of the positions of each new line in *content*.
+
+    The list can be used with :func:`get_line_number` to find the line number
+    of several positions in *content* without counting the new lines from
+    the start of the content each time.
+
+    """
+    line_offsets = []
+
+    position = content.find("\n")
+    while position != -1:
+        line_offsets.append(position)
+        position = content.find("\n", position + 1)
+
+    return line_offsets
+
+
+def get_line_number(line_offsets, position):
+    """Return line number of *position* from *line_offsets*.
+
+    *line_offsets* is the list of new line positions returned by
+    :func:`fetch_line_offsets`. The result is identical to::
+
+        content[:position].count("\\n") + 1
+
+    """
+    return bisect.bisect_left(line_offsets, position) + 1
+
+
 def get_docstring(line_number, lines):
     """Return docstrings for an element at a specific *line_number*.
 
@@ -160,7 +305,7 @@ def get_docstring(line_number, lines):
         # Start of the docstring (from the end)
         if docstring is None:
             # If the entire docstring fit in one line
-            match = re.search("(?<=/\*\* ).*(?= \*/)", line)
+            match = pattern.ONE_LINE_DOCSTRING_PATTERN.search(line)
             if match is not None:
                 return match.group()
 
@@ -171,7 +316,7 @@ def get_docstring(line_number, lines):
             docstring = []
 
         # Valid docstring line starts with a '*'
-        elif re.search("^\*( *| +.+)$", line) is not None:
+        elif pattern.DOCSTRING_LINE_PATTERN.search(line) is not None:
             indentation = 2 if len(line) > 1 else 1
             docstring.append(line[indentation:].rstrip())
 
@@ -182,3 +327,53 @@ def get_docstring(line_number, lines):
         # Error in the docstring
         else:
             return
+
+
+def fetch_docstrings(lines):
+    """Return dictionary mapping line numbers to docstrings from *lines*.
+
+    Each key is the number of the last line of a docstring, so that the
+    docstring of an element at a specific *line_number* can be retrieved
+    with::
+
+        docstrings = fetch_docstrings(lines)
+        docstrings.get(line_number - 1)
+
+    All docstrings are fetched in one pass and the result is identical to
+    calling :func:`get_docstring` for each line number.
+
+    """
+    docstrings = {}
+
+    # Lines of the docstring currently opened, or None if the previous lines
+    # can not be part of a docstring.
+    docstring = None
+
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+
+        if len(line) == 0 or line.startswith("//"):
+            docstring = None
+            continue
+
+        match = pattern.ONE_LINE_DOCSTRING_PATTERN.search(line)
+        if match is not None:
+            docstrings[line_number] = match.group()
+
+        elif line.startswith("*/") and docstring is not None:
+            docstrings[line_number] = "\n".join(docstring)
+
+        if line.startswith("/**"):
+            docstring = []
+
+        elif (
+            docstring is not None and
+            pattern.DOCSTRING_LINE_PATTERN.search(line) is not None
+        ):
+            indentation = 2 if len(line) > 1 else 1
+            docstring.append(line[indentation:].rstrip())
+
+        else:
+            docstring = None
+
+    return docstrings
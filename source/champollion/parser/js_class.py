@@ -1,49 +1,28 @@
 # :coding: utf-8
 
-import re
-import functools
-
+from . import pattern
 from .helper import filter_comments
 from .helper import collapse_all
-from .helper import get_docstring
-
-
-#: Regular Expression pattern for classes
-_CLASS_PATTERN = re.compile(
-    r"(?P<start_regex>(\n|^)) *(?P<export>export +)?(?P<default>default +)?"
-    r"(class +(?P<class_name>\w+)|(const|let|var) +(?P<data_name>\w+) "
-    r"*= *class +\w+)"
-    r"( +extends +(?P<mother_class>[\w._-]+))? *{"
-)
-
-#: Regular Expression pattern for class methods
-_CLASS_METHOD_PATTERN = re.compile(
-    r"(?P<start_regex>(\n|^)) *(?P<prefix>(static|get|set) +)?"
-    r"(?P<method_name>[\w._-]+) *\([\n ]*(?P<arguments>.*?)[\n ]*\) *{",
-    re.DOTALL
-)
-
-#: Regular Expression pattern for class arrow methods
-_CLASS_METHOD_ARROW_PATTERN = re.compile(
-    r"(?P<start_regex>(\n|^)) *(?P<prefix>static +)?(?P<method_name>\w+) *= *"
-    r"(\([\n ]*(?P<arguments>.*?)[\n ]*\)|(?P<single_argument>[\w._-]+)) *"
-    r"=> *",
-    re.DOTALL
-)
-
-#: Regular Expression pattern for class attribute
-_CLASS_ATTRIBUTE_PATTERN = re.compile(
-    r"(?P<start_regex>(\n|^)) *(?P<prefix>static +)?"
-    r"(?P<name>[\w._-]+) *= *(?P<value>.+?;)",
-    re.DOTALL
-)
-
-
-def fetch_environment(content, module_id):
+from .helper import fetch_docstrings
+from .helper import fetch_line_offsets, get_line_number
+from .helper import clean_value
+
+
+def fetch_environment(
+    content, module_id, docstrings=None, max_value_length=None
+):
     """Return class environment dictionary from *content*.
 
     *module_id* represent the identifier of the module.
 
+    *docstrings* can be the dictionary of docstrings returned by
+    :func:`~champollion.parser.helper.fetch_docstrings` for *content*. It
+    will be computed if not provided.
+
+    *max_value_length* can be the maximum length of the values recorded.
+    Longer values are truncated with
+    :func:`~champollion.parser.helper.clean_value`.
+
     The environment is in the form of::
 
         {
@@ -79,13 +58,34 @@ def fetch_environment(content, module_id):
     """
     environment = {}
 
-    lines = content.split("\n")
+    for class_environment in iter_elements(
+        content, module_id, docstrings=docstrings,
+        max_value_length=max_value_length
+    ):
+        environment[class_environment["id"]] = class_environment
+
+    return environment
+
+
+def iter_elements(
+    content, module_id, docstrings=None, max_value_length=None
+):
+    """Yield class environments from *content*.
+
+    The class environments are yielded in the order in which they are
+    matched. The arguments are the same as for :func:`fetch_environment`.
+
+    """
+    if docstrings is None:
+        docstrings = fetch_docstrings(content.split("\n"))
 
     # The comment filter is made during the collapse content process to
     # preserve the class content with all comments (and docstrings!)
+    initial_content = content
     content, collapsed_content = collapse_all(content, filter_comment=True)
+    line_offsets = fetch_line_offsets(content)
 
-    for match in _CLASS_PATTERN.finditer(content):
+    for match in pattern.CLASS_PATTERN.finditer(content):
         class_name = match.group("class_name")
         if class_name is None:
             class_name = match.group("data_name")
@@ -93,21 +93,26 @@ def fetch_environment(content, module_id):
         class_id = ".".join([module_id, class_name])
 
         line_number = (
-            content[:match.start()].count("\n") +
-            match.group("start_regex").count("\n") + 1
+            get_line_number(line_offsets, match.start()) +
+            match.group("start_regex").count("\n")
         )
 
         method_environment = {}
         attribute_environment = {}
 
-        if line_number in collapsed_content.keys():
-            class_content = collapsed_content[line_number][1:-1]
+        if line_number in collapsed_content:
+            start, end = collapsed_content.span(line_number)
+            class_content = initial_content[start + 1:end - 1]
+            class_docstrings = fetch_docstrings(class_content.split("\n"))
 
             method_environment = fetch_methods_environment(
-                class_content, class_id, line_number=line_number-1
+                class_content, class_id, line_number=line_number-1,
+                docstrings=class_docstrings
             )
             attribute_environment = fetch_attribute_environment(
-                class_content, class_id, line_number=line_number-1
+                class_content, class_id, line_number=line_number-1,
+                docstrings=class_docstrings,
+                max_value_length=max_value_length
             )
 
         class_environment = {
@@ -118,22 +123,26 @@ def fetch_environment(content, module_id):
             "name": class_name,
             "parent": match.group("mother_class"),
             "line_number": line_number,
-            "description": get_docstring(line_number, lines),
+            "description": docstrings.get(line_number - 1),
             "method": method_environment,
             "attribute": attribute_environment
         }
-        environment[class_id] = class_environment
-
-    return environment
+        yield class_environment
 
 
-def fetch_methods_environment(content, class_id, line_number=0):
+def fetch_methods_environment(
+    content, class_id, line_number=0, docstrings=None
+):
     """Return function environment dictionary from *content*.
 
     *class_id* represent the identifier of the method class.
 
     *line_number* is the first line number of content.
 
+    *docstrings* can be the dictionary of docstrings returned by
+    :func:`~champollion.parser.helper.fetch_docstrings` for *content*. It
+    will be computed if not provided.
+
     The environment is in the form of::
 
         {
@@ -152,13 +161,16 @@ def fetch_methods_environment(content, class_id, line_number=0):
     """
     environment = {}
 
-    lines = content.split("\n")
+    if docstrings is None:
+        docstrings = fetch_docstrings(content.split("\n"))
+
     content = filter_comments(content)
     content = collapse_all(content)[0]
+    line_offsets = fetch_line_offsets(content)
 
     for match_iter in (
-        _CLASS_METHOD_ARROW_PATTERN.finditer(content),
-        _CLASS_METHOD_PATTERN.finditer(content)
+        pattern.CLASS_METHOD_ARROW_PATTERN.finditer(content),
+        pattern.CLASS_METHOD_PATTERN.finditer(content)
     ):
         for match in match_iter:
             method_id = ".".join([class_id, match.group("method_name")])
@@ -172,8 +184,8 @@ def fetch_methods_environment(content, class_id, line_number=0):
                     method_id += "." + prefix
 
             _line_number = (
-                content[:match.start()].count("\n") +
-                match.group("start_regex").count("\n") + 1
+                get_line_number(line_offsets, match.start()) +
+                match.group("start_regex").count("\n")
             )
 
             arguments_matched = match.group("arguments")
@@ -192,20 +204,30 @@ def fetch_methods_environment(content, class_id, line_number=0):
                 "prefix": prefix,
                 "arguments": arguments,
                 "line_number": _line_number + line_number,
-                "description": get_docstring(_line_number, lines)
+                "description": docstrings.get(_line_number - 1)
             }
             environment[method_id] = method_environment
 
     return environment
 
 
-def fetch_attribute_environment(content, class_id, line_number=0):
+def fetch_attribute_environment(
+    content, class_id, line_number=0, docstrings=None, max_value_length=None
+):
     """Return attribute environment dictionary from *content*.
 
     *class_id* represent the identifier of the attribute class.
 
     *line_number* is the first line number of content.
 
+    *docstrings* can be the dictionary of docstrings returned by
+    :func:`~champollion.parser.helper.fetch_docstrings` for *content*. It
+    will be computed if not provided.
+
+    *max_value_length* can be the maximum length of the values recorded.
+    Longer values are truncated with
+    :func:`~champollion.parser.helper.clean_value`.
+
     The environment is in the form of::
 
         {
@@ -224,13 +246,15 @@ def fetch_attribute_environment(content, class_id, line_number=0):
     """
     environment = {}
 
-    lines = content.split("\n")
+    if docstrings is None:
+        docstrings = fetch_docstrings(content.split("\n"))
 
     # The comment filter is made during the collapse content process to
     # preserve the entire value (with semi-colons and docstrings!)
     content, collapsed_content = collapse_all(content, filter_comment=True)
+    line_offsets = fetch_line_offsets(content)
 
-    for match in _CLASS_ATTRIBUTE_PATTERN.finditer(content):
+    for match in pattern.CLASS_ATTRIBUTE_PATTERN.finditer(content):
         attribute_id = ".".join([class_id, match.group("name")])
         prefix = match.group("prefix")
         if prefix is not None:
@@ -239,14 +263,14 @@ def fetch_attribute_environment(content, class_id, line_number=0):
         value = match.group("value")
 
         _line_number = (
-            content[:match.start()].count("\n") +
-            match.group("start_regex").count("\n") + 1
+            get_line_number(line_offsets, match.start()) +
+            match.group("start_regex").count("\n")
         )
 
         for _value_line_number in range(
             _line_number, _line_number + value.count("\n") + 1
         ):
-            if "{}" in value and _value_line_number in collapsed_content.keys():
+            if "{}" in value and _value_line_number in collapsed_content:
                 value = value.replace(
                     "{}", collapsed_content[_value_line_number]
                 )
@@ -261,22 +285,10 @@ def fetch_attribute_environment(content, class_id, line_number=0):
             "module_id": class_id.rsplit(".", 1)[0],
             "name": match.group("name"),
             "prefix": prefix,
-            "value": functools.reduce(_clean_value, value.split('\n')).strip(),
+            "value": clean_value(value, max_length=max_value_length),
             "line_number": _line_number + line_number,
-            "description": get_docstring(_line_number, lines)
+            "description": docstrings.get(_line_number - 1)
         }
         environment[attribute_id] = attribute_environment
 
     return environment
-
-
-def _clean_value(line1, line2):
-    """Clean up attribute value for display."""
-    _line1 = line1.strip()
-    _line2 = line2.strip()
-
-    # Let trailing space to make the code easier to read
-    if _line1[-1:] in ["{", "}", "(", ")", "[", "]", ";", ","]:
-        _line1 += " "
-
-    return _line1 + _line2
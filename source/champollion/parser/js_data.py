@@ -1,25 +1,27 @@
 # :coding: utf-8
 
-import re
-import functools
-
+from . import pattern
 from .helper import collapse_all
-from .helper import get_docstring
-
-
-#: Regular Expression pattern for data
-_DATA_PATTERN = re.compile(
-    r"(?P<start_regex>(\n|^)) *(?P<export>export +)?(?P<default>default +)?"
-    r"(?P<type>(const|let|var)) (?P<name>[\w._-]+) *= *(?P<value>.+?;)",
-    re.DOTALL
-)
+from .helper import fetch_docstrings
+from .helper import fetch_line_offsets, get_line_number
+from .helper import clean_value
 
 
-def fetch_environment(content, module_id):
+def fetch_environment(
+    content, module_id, docstrings=None, max_value_length=None
+):
     """Return data environment dictionary from *content*.
 
     *module_id* represent the identifier of the module.
 
+    *docstrings* can be the dictionary of docstrings returned by
+    :func:`~champollion.parser.helper.fetch_docstrings` for *content*. It
+    will be computed if not provided.
+
+    *max_value_length* can be the maximum length of the values recorded.
+    Longer values are truncated with
+    :func:`~champollion.parser.helper.clean_value`.
+
     The environment is in the form of::
 
         {
@@ -39,22 +41,42 @@ def fetch_environment(content, module_id):
     """
     environment = {}
 
-    lines = content.split("\n")
+    for data_environment in iter_elements(
+        content, module_id, docstrings=docstrings,
+        max_value_length=max_value_length
+    ):
+        environment[data_environment["id"]] = data_environment
+
+    return environment
+
+
+def iter_elements(
+    content, module_id, docstrings=None, max_value_length=None
+):
+    """Yield data environments from *content*.
+
+    The data environments are yielded in the order in which they are
+    matched. The arguments are the same as for :func:`fetch_environment`.
+
+    """
+    if docstrings is None:
+        docstrings = fetch_docstrings(content.split("\n"))
 
     # The comment filter is made during the collapse content process to
     # preserve the entire value (with semi-colons and docstrings!)
     content, collapsed_content = collapse_all(content, filter_comment=True)
+    line_offsets = fetch_line_offsets(content)
 
-    for match in _DATA_PATTERN.finditer(content):
+    for match in pattern.DATA_PATTERN.finditer(content):
         data_id = ".".join([module_id, match.group("name")])
 
         line_number = (
-            content[:match.start()].count("\n") +
-            match.group("start_regex").count("\n") + 1
+            get_line_number(line_offsets, match.start()) +
+            match.group("start_regex").count("\n")
         )
 
         value = match.group("value")
-        if "{}" in value and line_number in collapsed_content.keys():
+        if "{}" in value and line_number in collapsed_content:
             value = value.replace("{}", collapsed_content[line_number])
 
         # Do not keep semi-colon in value
@@ -67,23 +89,9 @@ def fetch_environment(content, module_id):
             "exported": match.group("export") is not None,
             "default": match.group("default") is not None,
             "name": match.group("name"),
-            "value": functools.reduce(_clean_value, value.split('\n')).strip(),
+            "value": clean_value(value, max_length=max_value_length),
             "type": match.group("type"),
             "line_number": line_number,
-            "description": get_docstring(line_number, lines)
+            "description": docstrings.get(line_number - 1)
         }
-        environment[data_id] = data_environment
-
-    return environment
-
-
-def _clean_value(line1, line2):
-    """Clean up variable value for display."""
-    _line1 = line1.strip()
-    _line2 = line2.strip()
-
-    # Let trailing space to make the code easier to read
-    if _line1[-1:] in ["{", "}", "(", ")", "[", "]", ";", ","]:
-        _line1 += " "
-
-    return _line1 + _line2
+        yield data_environment
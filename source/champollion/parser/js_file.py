@@ -1,48 +1,42 @@
 # :coding: utf-8
 
 import os
-import re
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
 
 from .js_class import fetch_environment as fetch_class_environment
 from .js_function import fetch_environment as fetch_function_environment
 from .js_data import fetch_environment as fetch_data_environment
 
-from .helper import get_docstring, filter_comments
-
-
-#: Regular Expression pattern for imported element
-_IMPORTED_ELEMENT_PATTERN = re.compile(
-    r"(?P<start_regex>(\n|^)) *import +"
-    r"(?P<expression>({([^{}]|\n)+}|.+))"
-    r" +from +['\"](?P<module>[\w/.\\_-]+)['\"];?"
-)
-
-#: Regular Expression pattern for exported element
-_EXPORTED_ELEMENT_PATTERN = re.compile(
-    r"(?P<start_regex>(\n|^)) *export +(?P<default>default +)?"
-    r"((?P<expression_from_module>({([^{}]|\n)+}|.+))"
-    r" +from +['\"](?P<module>[\w/.\\_-]+)['\"]|"
-    r"(?P<expression_from_variable>({([^{}]|\n)+}|.+)));?"
-)
+from . import pattern
+from .helper import fetch_docstrings, filter_comments
+from .helper import fetch_line_offsets, get_line_number
+from .reader import read_file, file_signature
 
-#: Regular Expression pattern for binding element
-_BINDING_ELEMENT_PATTERN = re.compile(
-    r"^(?P<name>(\w+|\*))( +as +(?P<alias>\w+))?;?$"
-)
 
-#: Regular Expression pattern for file docstring
-_FILE_DOCSTRING_PATTERN = re.compile(r"^/\*\*.*?\*/(?=\n\n)", re.DOTALL)
-
-
-def fetch_environment(file_path, file_id, module_id):
+def fetch_environment(
+    file_path, file_id, module_id, lazy=False, signature=None,
+    max_value_length=None
+):
     """Return file environment dictionary from *file_path*.
 
     *file_id* represent the identifier of the file.
 
     *module_id* represent the identifier of the module.
 
-    Update the *environment* if available and return it as-is if the file
-    is not readable.
+    If *lazy* is set to True, a :class:`LazyFileEnvironment` instance is
+    returned so that the file is only read and parsed when its content or
+    elements are accessed. *signature* can be the file signature previously
+    recorded, as returned by :func:`~champollion.parser.reader.file_signature`.
+
+    *max_value_length* can be the maximum length of the data and attribute
+    values recorded. Longer values are truncated with
+    :func:`~champollion.parser.helper.clean_value`.
+
+    Return None if the file is not readable.
 
     The environment is in the form of::
 
@@ -100,12 +94,81 @@ def fetch_environment(file_path, file_id, module_id):
         }
 
     """
-    try:
-        with open(file_path, "r") as f:
-            content = f.read()
-    except (IOError, OSError):
+    if lazy:
+        if not os.access(file_path, os.R_OK):
+            return
+
+        return LazyFileEnvironment(
+            file_path, file_id, module_id, signature=signature,
+            max_value_length=max_value_length
+        )
+
+    content = read_file(file_path)
+    if content is None:
         return
 
+    return fetch_environment_from_content(
+        content, file_path, file_id, module_id,
+        max_value_length=max_value_length
+    )
+
+
+def fetch_environment_from_content(
+    content, file_path, file_id, module_id, max_value_length=None
+):
+    """Return file environment dictionary from *content*.
+
+    *file_path* is the path of the file which contains the *content*.
+
+    *file_id* represent the identifier of the file.
+
+    *module_id* represent the identifier of the module.
+
+    *max_value_length* can be the maximum length of the data and attribute
+    values recorded.
+
+    .. seealso:: :func:`fetch_environment`
+
+    """
+    # Docstrings are fetched once for all elements of the file.
+    docstrings = fetch_docstrings(content.split("\n"))
+
+    elements = {
+        "export": fetch_export_environment(
+            content, module_id, docstrings=docstrings
+        ),
+        "import": fetch_import_environment(content, module_id),
+        "class": fetch_class_environment(
+            content, module_id, docstrings=docstrings,
+            max_value_length=max_value_length
+        ),
+        "function": fetch_function_environment(
+            content, module_id, docstrings=docstrings
+        ),
+        "data": fetch_data_environment(
+            content, module_id, docstrings=docstrings,
+            max_value_length=max_value_length
+        )
+    }
+
+    return fetch_environment_from_elements(
+        content, file_path, file_id, module_id, elements
+    )
+
+
+def fetch_environment_from_elements(
+    content, file_path, file_id, module_id, elements
+):
+    """Return file environment dictionary from *content* and *elements*.
+
+    *elements* is a dictionary with the export, import, class, function and
+    data environments previously parsed from *content*. The class, function
+    and data environments are updated from the export environment.
+
+    The other arguments are the same as for
+    :func:`fetch_environment_from_content`.
+
+    """
     environment = {
         "id": file_id,
         "module_id": module_id,
@@ -113,26 +176,148 @@ def fetch_environment(file_path, file_id, module_id):
         "path": file_path,
         "content": content,
         "description": fetch_file_description(content),
-        "export": fetch_export_environment(content, module_id),
-        "import": fetch_import_environment(content, module_id),
+        "export": elements["export"],
+        "import": elements["import"],
         "class": {},
         "data": {},
         "function": {}
     }
 
-    for _env_id, _env in fetch_class_environment(content, module_id).items():
-        update_from_exported_elements(_env, environment["export"])
-        environment["class"][_env_id] = _env
+    for category in ("class", "function", "data"):
+        for _env_id, _env in elements[category].items():
+            update_from_exported_elements(_env, environment["export"])
+            environment[category][_env_id] = _env
 
-    for _env_id, _env in fetch_function_environment(content, module_id).items():
-        update_from_exported_elements(_env, environment["export"])
-        environment["function"][_env_id] = _env
+    return environment
 
-    for _env_id, _env in fetch_data_environment(content, module_id).items():
-        update_from_exported_elements(_env, environment["export"])
-        environment["data"][_env_id] = _env
 
-    return environment
+class LazyFileEnvironment(Mapping):
+    """File environment which is parsed on first access.
+
+    The identifiers and the path of the file are available immediately, the
+    content is read when first accessed and the elements are parsed when one
+    of them is first accessed. It can be used as a read-only mapping with
+    the same keys as the dictionary returned by :func:`fetch_environment`.
+
+    Two lazy environments are equal if they refer to the same file which
+    has not been modified in between and if they are parsed with the same
+    maximum value length, so that comparing environments does not require
+    parsing them.
+
+    """
+
+    #: Keys available without reading the file.
+    _METADATA_KEYS = ("id", "module_id", "name", "path")
+
+    #: Keys available once the file is parsed.
+    _PARSED_KEYS = (
+        "content", "description", "export", "import", "class", "data",
+        "function"
+    )
+
+    def __init__(
+        self, file_path, file_id, module_id, signature=None, environment=None,
+        max_value_length=None
+    ):
+        """Initiate environment from *file_path*.
+
+        *file_id* represent the identifier of the file.
+
+        *module_id* represent the identifier of the module.
+
+        *signature* can be the file signature recorded when listing the
+        folder. Otherwise the file is accessed to record it.
+
+        *environment* can be a dictionary with the description and the
+        export, import, class, function and data environments previously
+        parsed from the file, in which case only the content is read when
+        accessed.
+
+        *max_value_length* can be the maximum length of the data and
+        attribute values recorded when the file is parsed.
+
+        """
+        self._environment = {
+            "id": file_id,
+            "module_id": module_id,
+            "name": os.path.basename(file_path),
+            "path": file_path,
+        }
+        self._signature = signature or file_signature(file_path)
+        self._content = None
+        self._max_value_length = max_value_length
+
+        if environment is not None:
+            self._environment.update(environment)
+
+    @property
+    def parsed(self):
+        """Indicate whether the file elements have been parsed."""
+        return "class" in self._environment
+
+    def __getitem__(self, key):
+        """Return value for *key*, reading or parsing the file if necessary.
+        """
+        if key in self._environment:
+            return self._environment[key]
+
+        if key == "content":
+            return self._read()
+
+        if key in self._PARSED_KEYS:
+            self._parse()
+
+        return self._environment[key]
+
+    def __iter__(self):
+        """Iterate over the environment keys."""
+        for key in self._METADATA_KEYS + self._PARSED_KEYS:
+            yield key
+
+    def __len__(self):
+        """Return number of keys in the environment."""
+        return len(self._METADATA_KEYS) + len(self._PARSED_KEYS)
+
+    def __eq__(self, other):
+        """Indicate whether environment is equal to *other*."""
+        if isinstance(other, LazyFileEnvironment):
+            return (
+                self._environment["id"] == other._environment["id"] and
+                self._environment["module_id"] ==
+                other._environment["module_id"] and
+                self._environment["path"] == other._environment["path"] and
+                self._signature is not None and
+                self._signature == other._signature and
+                self._max_value_length == other._max_value_length
+            )
+
+        return super(LazyFileEnvironment, self).__eq__(other)
+
+    def __ne__(self, other):
+        """Indicate whether environment is different from *other*."""
+        return not self == other
+
+    __hash__ = None
+
+    def _read(self):
+        """Return content of the file, reading it if necessary.
+
+        An empty content is returned if the file is not readable anymore.
+
+        """
+        if self._content is None:
+            self._content = read_file(self._environment["path"]) or ""
+
+        return self._content
+
+    def _parse(self):
+        """Parse file content and record all the elements."""
+        environment = fetch_environment_from_content(
+            self._read(), self._environment["path"],
+            self._environment["id"], self._environment["module_id"],
+            max_value_length=self._max_value_length
+        )
+        self._environment.update(environment)
 
 
 def fetch_file_description(content):
@@ -155,7 +340,7 @@ def fetch_file_description(content):
     """
     content = filter_comments(content, filter_multiline_comment=False).strip()
 
-    match = _FILE_DOCSTRING_PATTERN.search(content)
+    match = pattern.FILE_DOCSTRING_PATTERN.search(content)
     if match is None:
         return
 
@@ -171,7 +356,7 @@ def fetch_file_description(content):
         line = line.strip()
 
         # Valid docstring line starts with a '*'
-        if re.search("^\*( *| +.+)$", line) is not None:
+        if pattern.DOCSTRING_LINE_PATTERN.search(line) is not None:
             indentation = 2 if len(line) > 1 else 1
             docstring.append(line[indentation:].rstrip())
 
@@ -250,31 +435,58 @@ def fetch_import_environment(content, module_id):
 
     wildcards_number = 0
 
-    module_path = module_id.replace(".", os.sep)
-
-    for match in _IMPORTED_ELEMENT_PATTERN.finditer(content):
-        from_module_path = os.path.normpath(
-            os.path.join(module_path, match.group("module"))
+    for match in pattern.IMPORTED_ELEMENT_PATTERN.finditer(content):
+        wildcards_number = update_import_environment(
+            environment, match, module_id, wildcards_number=wildcards_number
         )
-        from_module_id = from_module_path.replace(os.sep, ".")
 
-        element_raw = match.group("expression").replace("\n", "")
+    return environment
 
-        _env, wildcards_number = _fetch_expression_environment(
-            element_raw, module_id, from_module_id,
-            wildcards_number=wildcards_number,
-            environment=environment
-        )
-        environment.update(_env)
 
-    return environment
+def update_import_environment(
+    environment, match, module_id, wildcards_number=0
+):
+    """Update import *environment* from import statement *match*.
+
+    *match* is a match of
+    :data:`~champollion.parser.pattern.IMPORTED_ELEMENT_PATTERN`.
+
+    *module_id* represent the identifier of the module.
+
+    *wildcards_number* represent the number of `*` previously found as
+    un-aliased binding. The updated number is returned.
 
+    .. warning::
+
+        The *environment* is mutated.
 
-def fetch_export_environment(content, module_id):
+    """
+    from_module_path = os.path.normpath(
+        os.path.join(module_id.replace(".", os.sep), match.group("module"))
+    )
+    from_module_id = from_module_path.replace(os.sep, ".")
+
+    element_raw = match.group("expression").replace("\n", "")
+
+    _env, wildcards_number = _fetch_expression_environment(
+        element_raw, module_id, from_module_id,
+        wildcards_number=wildcards_number,
+        environment=environment
+    )
+    environment.update(_env)
+
+    return wildcards_number
+
+
+def fetch_export_environment(content, module_id, docstrings=None):
     """Return export environment dictionary from *content*.
 
     *module_id* represent the identifier of the module.
 
+    *docstrings* can be the dictionary of docstrings returned by
+    :func:`~champollion.parser.helper.fetch_docstrings` for *content*. It
+    will be computed if not provided.
+
     The environment is in the form of::
 
         {
@@ -296,44 +508,77 @@ def fetch_export_environment(content, module_id):
 
     wildcards_number = 0
 
-    lines = content.split("\n")
+    if docstrings is None:
+        docstrings = fetch_docstrings(content.split("\n"))
 
-    module_path = module_id.replace(".", os.sep)
+    line_offsets = fetch_line_offsets(content)
 
-    for match in _EXPORTED_ELEMENT_PATTERN.finditer(content):
+    for match in pattern.EXPORTED_ELEMENT_PATTERN.finditer(content):
         line_number = (
-            content[:match.start()].count("\n") +
-            match.group("start_regex").count("\n") + 1
+            get_line_number(line_offsets, match.start()) +
+            match.group("start_regex").count("\n")
         )
 
-        from_module_id = None
+        wildcards_number = update_export_environment(
+            environment, match, module_id, line_number,
+            docstrings.get(line_number - 1),
+            wildcards_number=wildcards_number
+        )
 
-        if match.group("module") is not None:
-            from_module_path = os.path.normpath(
-                os.path.join(module_path, match.group("module"))
-            )
-            from_module_id = from_module_path.replace(os.sep, ".")
+    return environment
+
+
+def update_export_environment(
+    environment, match, module_id, line_number, description,
+    wildcards_number=0
+):
+    """Update export *environment* from export statement *match*.
+
+    *match* is a match of
+    :data:`~champollion.parser.pattern.EXPORTED_ELEMENT_PATTERN` found at
+    *line_number*, and *description* is the docstring of the statement or
+    None.
+
+    *module_id* represent the identifier of the module.
 
-        expression = match.group("expression_from_variable")
-        if expression is None:
-            expression = match.group("expression_from_module")
+    *wildcards_number* represent the number of `*` previously found as
+    un-aliased binding. The updated number is returned.
 
-        element_raw = expression.replace("\n", "")
+    .. warning::
+
+        The *environment* is mutated.
+
+    """
+    from_module_id = None
 
-        _env, wildcards_number = _fetch_expression_environment(
-            element_raw, module_id, from_module_id,
-            wildcards_number=wildcards_number,
+    if match.group("module") is not None:
+        from_module_path = os.path.normpath(
+            os.path.join(
+                module_id.replace(".", os.sep), match.group("module")
+            )
         )
+        from_module_id = from_module_path.replace(os.sep, ".")
 
-        for _env_id, _sub_env in _env.items():
-            environment[_env_id] = {
-                "description": get_docstring(line_number, lines),
-                "line_number": line_number,
-                "default": match.group("default") is not None,
-            }
-            environment[_env_id].update(_sub_env)
+    expression = match.group("expression_from_variable")
+    if expression is None:
+        expression = match.group("expression_from_module")
 
-    return environment
+    element_raw = expression.replace("\n", "")
+
+    _env, wildcards_number = _fetch_expression_environment(
+        element_raw, module_id, from_module_id,
+        wildcards_number=wildcards_number,
+    )
+
+    for _env_id, _sub_env in _env.items():
+        environment[_env_id] = {
+            "description": description,
+            "line_number": line_number,
+            "default": match.group("default") is not None,
+        }
+        environment[_env_id].update(_sub_env)
+
+    return wildcards_number
 
 
 def _fetch_expression_environment(
@@ -357,7 +602,9 @@ def _fetch_expression_environment(
         environment = {}
 
     # Parse partial expressions first
-    for partial_match in re.finditer("{[^{}]+}", expression):
+    for partial_match in pattern.PARTIAL_EXPRESSION_PATTERN.finditer(
+        expression
+    ):
         binding_environments, wildcards_number = _fetch_binding_environment(
             partial_match.group()[1:-1], module_id, wildcards_number
         )
@@ -425,7 +672,7 @@ def _fetch_binding_environment(expression, module_id, wildcards_number=0):
         if len(_element) == 0:
             continue
 
-        match = _BINDING_ELEMENT_PATTERN.match(_element)
+        match = pattern.BINDING_ELEMENT_PATTERN.match(_element)
         if match is None:
             continue
 
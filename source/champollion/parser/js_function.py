@@ -1,43 +1,21 @@
 # :coding: utf-8
 
-import re
-
+from . import pattern
 from .helper import filter_comments
 from .helper import collapse_all
-from .helper import get_docstring
-
-
-#: Regular Expression pattern for function expressions
-_FUNCTION_PATTERN = re.compile(
-    r"(?P<start_regex>(\n|^)) *(?P<export>export +)?(?P<default>default +)?"
-    r"((const|var|let) (?P<data_name>[\w_-]+) *= *)?"
-    r"function *(?P<generator>\* *)?(?P<function_name>[\w_-]+)? "
-    r"*\([\n ]*(?P<arguments>.*?)[\n ]*\) *{",
-    re.DOTALL
-)
-
-#: Regular Expression pattern for arrow functions
-_FUNCTION_ARROW_PATTERN = re.compile(
-    r"(?P<start_regex>(\n|^)) *(?P<export>export +)?(?P<default>default +)?"
-    r"(const|let|var) (?P<function_name>\w+) *= *"
-    r"(\([\n ]*(?P<arguments>.*?)[\n ]*\)|(?P<single_argument>[\w._-]+)) *"
-    r"=> *",
-    re.DOTALL
-)
-
-#: Regular Expression pattern for imported functions
-_IMPORTED_FUNCTION_PATTERN = re.compile(
-    r"(?P<start_regex>(\n|^)) *(?P<export>export +)?(?P<default>default +)?"
-    r"(?P<function_name>[\w_-]+)? *\([\n ]*(?P<arguments>.*?)[\n ]*\);?",
-    re.DOTALL
-)
-
-
-def fetch_environment(content, module_id):
+from .helper import fetch_docstrings
+from .helper import fetch_line_offsets, get_line_number
+
+
+def fetch_environment(content, module_id, docstrings=None):
     """Return function environment dictionary from *content*.
 
     *module_id* represent the identifier of the module.
 
+    *docstrings* can be the dictionary of docstrings returned by
+    :func:`~champollion.parser.helper.fetch_docstrings` for *content*. It
+    will be computed if not provided.
+
     The environment is in the form of::
 
         {
@@ -58,14 +36,34 @@ def fetch_environment(content, module_id):
     """
     environment = {}
 
-    lines = content.split("\n")
+    for function_environment in iter_elements(
+        content, module_id, docstrings=docstrings
+    ):
+        environment[function_environment["id"]] = function_environment
+
+    return environment
+
+
+def iter_elements(content, module_id, docstrings=None):
+    """Yield function environments from *content*.
+
+    The function environments are yielded in the order in which they are
+    matched. A function can be yielded more than once, in which case the
+    last environment yielded prevails. The arguments are the same as for
+    :func:`fetch_environment`.
+
+    """
+    if docstrings is None:
+        docstrings = fetch_docstrings(content.split("\n"))
+
     content = filter_comments(content)
     content = collapse_all(content)[0]
+    line_offsets = fetch_line_offsets(content)
 
     for match_iter in (
-        _FUNCTION_ARROW_PATTERN.finditer(content),
-        _FUNCTION_PATTERN.finditer(content),
-        _IMPORTED_FUNCTION_PATTERN.finditer(content),
+        pattern.FUNCTION_ARROW_PATTERN.finditer(content),
+        pattern.FUNCTION_PATTERN.finditer(content),
+        pattern.IMPORTED_FUNCTION_PATTERN.finditer(content),
     ):
         for match in match_iter:
             name = match.group("function_name")
@@ -91,8 +89,8 @@ def fetch_environment(content, module_id):
             function_id = ".".join([module_id, name])
 
             line_number = (
-                content[:match.start()].count("\n") +
-                match.group("start_regex").count("\n") + 1
+                get_line_number(line_offsets, match.start()) +
+                match.group("start_regex").count("\n")
             )
 
             arguments_matched = match.group("arguments")
@@ -113,8 +111,6 @@ def fetch_environment(content, module_id):
                 "generator": generator,
                 "arguments": arguments,
                 "line_number": line_number,
-                "description": get_docstring(line_number, lines)
+                "description": docstrings.get(line_number - 1)
             }
-            environment[function_id] = function_environment
-
-    return environment
+            yield function_environment
@@ -9,7 +9,7 @@ def fetch_environment(file_id, files=None, module_names=None):
     *files* is an optional list of the other file names stored in the same
     directory as the one analyzed.
 
-    *module_names* is an optional list of all the other module name
+    *module_names* is an optional list or set of all the other module names
     previously fetched to help determine the module name of the current
     file.
 
@@ -61,7 +61,7 @@ def fetch_environment(file_id, files=None, module_names=None):
 def _guess_module_name(name, hierarchy_folders, module_names):
     """Return the full module *name* from *hierarchy_folders*.
 
-    *module_names* is the list of modules already fetched.
+    *module_names* is the list or set of modules already fetched.
 
     """
     for i in range(len(hierarchy_folders)):
@@ -0,0 +1,270 @@
+# :coding: utf-8
+
+"""Registry of all compiled regular expression patterns used by the
+:mod:`~champollion.parser`.
+
+Patterns must be accessed as attributes of this module at call time so that
+the instrumentation can be enabled at any moment::
+
+    from . import pattern
+
+    for match in pattern.CLASS_PATTERN.finditer(content):
+        ...
+
+When the instrumentation is enabled, the number of calls and the cumulative
+time spent in each pattern are recorded::
+
+    >>> enable_instrumentation()
+    >>> fetch_environment("/path/to/example")
+    >>> statistics()
+    {"CLASS_PATTERN": {"calls": 12, "time": 0.0021}, ...}
+
+"""
+
+import re
+import time
+
+
+#: Regular Expression pattern for single line comments
+ONE_LINE_COMMENT_PATTERN = re.compile(r"(?<![^\n ])//[^\n]*(?=\n)")
+
+#: Regular Expression pattern for single line and multi-line comments
+COMMENT_PATTERN = re.compile(
+    r"(?<![^\n ])//[^\n]*(?=\n)|/\*.*?\*/", re.DOTALL
+)
+
+#: Regular Expression pattern for empty lines preceding a line
+EMPTY_LINES_PATTERN = re.compile(r"\n[ \t]*\n\s*")
+
+#: Regular Expression pattern for nested element symbols
+NESTED_ELEMENT_PATTERN = re.compile(r"{[^{}]*}")
+
+#: Regular Expression pattern for opening and closing braces
+BRACE_PATTERN = re.compile(r"[{}]")
+
+#: Regular Expression pattern for collapsed element symbols with space buffer
+COLLAPSED_ELEMENT_PATTERN = re.compile(r"<> *")
+
+#: Regular Expression pattern for docstrings which fit in one line
+ONE_LINE_DOCSTRING_PATTERN = re.compile(r"(?<=/\*\* ).*(?= \*/)")
+
+#: Regular Expression pattern for docstring lines
+DOCSTRING_LINE_PATTERN = re.compile(r"^\*( *| +.+)$")
+
+#: Regular Expression pattern for file docstring
+FILE_DOCSTRING_PATTERN = re.compile(r"^/\*\*.*?\*/(?=\n\n)", re.DOTALL)
+
+#: Regular Expression pattern for imported element
+IMPORTED_ELEMENT_PATTERN = re.compile(
+    r"(?P<start_regex>(\n|^)) *import +"
+    r"(?P<expression>({([^{}]|\n)+}|.+))"
+    r" +from +['\"](?P<module>[\w/.\\_-]+)['\"];?"
+)
+
+#: Regular Expression pattern for exported element
+EXPORTED_ELEMENT_PATTERN = re.compile(
+    r"(?P<start_regex>(\n|^)) *export +(?P<default>default +)?"
+    r"((?P<expression_from_module>({([^{}]|\n)+}|.+))"
+    r" +from +['\"](?P<module>[\w/.\\_-]+)['\"]|"
+    r"(?P<expression_from_variable>({([^{}]|\n)+}|.+)));?"
+)
+
+#: Regular Expression pattern for partial expression within import or export
+PARTIAL_EXPRESSION_PATTERN = re.compile(r"{[^{}]+}")
+
+#: Regular Expression pattern for binding element
+BINDING_ELEMENT_PATTERN = re.compile(
+    r"^(?P<name>(\w+|\*))( +as +(?P<alias>\w+))?;?$"
+)
+
+#: Regular Expression pattern for classes
+CLASS_PATTERN = re.compile(
+    r"(?P<start_regex>(\n|^)) *(?P<export>export +)?(?P<default>default +)?"
+    r"(class +(?P<class_name>\w+)|(const|let|var) +(?P<data_name>\w+) "
+    r"*= *class +\w+)"
+    r"( +extends +(?P<mother_class>[\w._-]+))? *{"
+)
+
+#: Regular Expression pattern for class methods
+CLASS_METHOD_PATTERN = re.compile(
+    r"(?P<start_regex>(\n|^)) *(?P<prefix>(static|get|set) +)?"
+    r"(?P<method_name>[\w._-]+) *\([\n ]*(?P<arguments>.*?)[\n ]*\) *{",
+    re.DOTALL
+)
+
+#: Regular Expression pattern for class arrow methods
+CLASS_METHOD_ARROW_PATTERN = re.compile(
+    r"(?P<start_regex>(\n|^)) *(?P<prefix>static +)?(?P<method_name>\w+) *= *"
+    r"(\([\n ]*(?P<arguments>.*?)[\n ]*\)|(?P<single_argument>[\w._-]+)) *"
+    r"=> *",
+    re.DOTALL
+)
+
+#: Regular Expression pattern for class attribute
+CLASS_ATTRIBUTE_PATTERN = re.compile(
+    r"(?P<start_regex>(\n|^)) *(?P<prefix>static +)?"
+    r"(?P<name>[\w._-]+) *= *(?P<value>.+?;)",
+    re.DOTALL
+)
+
+#: Regular Expression pattern for function expressions
+FUNCTION_PATTERN = re.compile(
+    r"(?P<start_regex>(\n|^)) *(?P<export>export +)?(?P<default>default +)?"
+    r"((const|var|let) (?P<data_name>[\w_-]+) *= *)?"
+    r"function *(?P<generator>\* *)?(?P<function_name>[\w_-]+)? "
+    r"*\([\n ]*(?P<arguments>.*?)[\n ]*\) *{",
+    re.DOTALL
+)
+
+#: Regular Expression pattern for arrow functions
+FUNCTION_ARROW_PATTERN = re.compile(
+    r"(?P<start_regex>(\n|^)) *(?P<export>export +)?(?P<default>default +)?"
+    r"(const|let|var) (?P<function_name>\w+) *= *"
+    r"(\([\n ]*(?P<arguments>.*?)[\n ]*\)|(?P<single_argument>[\w._-]+)) *"
+    r"=> *",
+    re.DOTALL
+)
+
+#: Regular Expression pattern for imported functions
+IMPORTED_FUNCTION_PATTERN = re.compile(
+    r"(?P<start_regex>(\n|^)) *(?P<export>export +)?(?P<default>default +)?"
+    r"(?P<function_name>[\w_-]+)? *\([\n ]*(?P<arguments>.*?)[\n ]*\);?",
+    re.DOTALL
+)
+
+#: Regular Expression pattern for data
+DATA_PATTERN = re.compile(
+    r"(?P<start_regex>(\n|^)) *(?P<export>export +)?(?P<default>default +)?"
+    r"(?P<type>(const|let|var)) (?P<name>[\w._-]+) *= *(?P<value>.+?;)",
+    re.DOTALL
+)
+
+
+#: Number of calls and cumulative time recorded per pattern name.
+_STATISTICS = {}
+
+#: Clock used to record the time spent in patterns.
+_clock = getattr(time, "perf_counter", time.time)
+
+
+def registry():
+    """Return dictionary mapping each pattern name to its compiled pattern.
+    """
+    return dict(
+        (name, getattr(value, "pattern_object", value))
+        for name, value in globals().items()
+        if name.endswith("_PATTERN")
+    )
+
+
+def enable_instrumentation():
+    """Record number of calls and cumulative time spent per pattern.
+
+    .. seealso:: :func:`statistics`
+
+    """
+    for name, compiled_pattern in registry().items():
+        globals()[name] = InstrumentedPattern(name, compiled_pattern)
+
+
+def disable_instrumentation():
+    """Stop recording the pattern calls.
+
+    The statistics recorded are kept until :func:`reset_statistics` is
+    called.
+
+    """
+    for name, compiled_pattern in registry().items():
+        globals()[name] = compiled_pattern
+
+
+def is_instrumented():
+    """Indicate whether the instrumentation is enabled."""
+    return any(
+        isinstance(value, InstrumentedPattern) for value in globals().values()
+    )
+
+
+def statistics():
+    """Return number of calls and cumulative time recorded per pattern.
+
+    The result is in the form of::
+
+        {
+            "CLASS_PATTERN": {"calls": 12, "time": 0.0021},
+            ...
+        }
+
+    The time is expressed in seconds.
+
+    """
+    return dict(
+        (name, dict(_statistics)) for name, _statistics in _STATISTICS.items()
+    )
+
+
+def reset_statistics():
+    """Remove all recorded statistics."""
+    _STATISTICS.clear()
+
+
+class InstrumentedPattern(object):
+    """Compiled pattern wrapper recording number of calls and time spent.
+
+    Only the methods used by the :mod:`~champollion.parser` are recorded. The
+    time spent by :meth:`finditer` includes the time to iterate over all the
+    matches.
+
+    """
+
+    def __init__(self, name, pattern_object):
+        """Initiate wrapper from *name* and compiled *pattern_object*."""
+        self.name = name
+        self.pattern_object = pattern_object
+
+    def __getattr__(self, name):
+        """Return attribute from the wrapped compiled pattern."""
+        return getattr(self.pattern_object, name)
+
+    def search(self, *args, **kwargs):
+        """Record and return :meth:`re.Pattern.search` result."""
+        return self._record(self.pattern_object.search, *args, **kwargs)
+
+    def match(self, *args, **kwargs):
+        """Record and return :meth:`re.Pattern.match` result."""
+        return self._record(self.pattern_object.match, *args, **kwargs)
+
+    def sub(self, *args, **kwargs):
+        """Record and return :meth:`re.Pattern.sub` result."""
+        return self._record(self.pattern_object.sub, *args, **kwargs)
+
+    def finditer(self, *args, **kwargs):
+        """Record and yield :meth:`re.Pattern.finditer` matches."""
+        iterator = self._record(self.pattern_object.finditer, *args, **kwargs)
+
+        while True:
+            start_time = _clock()
+            try:
+                match = next(iterator)
+            except StopIteration:
+                self._update(0, _clock() - start_time)
+                return
+
+            self._update(0, _clock() - start_time)
+            yield match
+
+    def _record(self, method, *args, **kwargs):
+        """Call *method* and record the time spent."""
+        start_time = _clock()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self._update(1, _clock() - start_time)
+
+    def _update(self, calls, duration):
+        """Add number of *calls* and *duration* to the statistics."""
+        _statistics = _STATISTICS.setdefault(
+            self.name, {"calls": 0, "time": 0.0}
+        )
+        _statistics["calls"] += calls
+        _statistics["time"] += duration
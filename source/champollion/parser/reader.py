@@ -0,0 +1,262 @@
+# :coding: utf-8
+
+"""Discover and read the :term:`Javascript` source files.
+
+Folders are listed with :func:`os.scandir` when available and the stat
+result of each source file is recorded while listing, so that it can be used
+as a signature to detect modified files without accessing the files again.
+
+Files can be read concurrently with :func:`read_files`, which is useful when
+the latency of the file system dominates, for instance on network file
+systems. The reader threads read ahead of the consumer, within the limit of a
+bounded queue so that the memory used stays bounded on large source trees.
+
+"""
+
+import os
+import collections
+
+try:
+    import concurrent.futures
+except ImportError:  # Python 2 without the 'futures' backport
+    concurrent = None
+
+
+#: File extensions analyzed within the :term:`Javascript` package directory.
+EXTENSIONS = [".js", ".jsx"]
+
+
+def is_source_file(file_name):
+    """Indicate whether *file_name* should be analyzed."""
+    return (
+        os.path.splitext(file_name)[1] in EXTENSIONS
+        and not file_name.startswith(".")
+    )
+
+
+def list_folder(path):
+    """Return tuple with source files and folder names within *path*.
+
+    Source files are returned as a list of tuples with the file name and its
+    signature, as returned by :func:`file_signature`. Both lists are sorted by
+    name and hidden folders are skipped.
+
+    Symbolic links to folders are skipped as they are not followed.
+
+    Return empty lists if the folder can not be listed.
+
+    """
+    files = []
+    folder_names = []
+
+    try:
+        if hasattr(os, "scandir"):
+            for entry in os.scandir(path):
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        folder_names.append(entry.name)
+
+                elif is_source_file(entry.name) and not entry.is_dir():
+                    files.append((entry.name, _entry_signature(entry)))
+
+        else:  # Python 2
+            for name in os.listdir(path):
+                _path = os.path.join(path, name)
+
+                if os.path.isdir(_path):
+                    if not os.path.islink(_path) and not name.startswith("."):
+                        folder_names.append(name)
+
+                elif is_source_file(name):
+                    files.append((name, file_signature(_path)))
+
+    except OSError:
+        return [], []
+
+    return sorted(files), sorted(folder_names)
+
+
+def scan_files(path, list_function=None):
+    """Yield source files found within *path*.
+
+    Each source file is yielded as a tuple with the file identifier, the file
+    path, the list of source file names within the same folder and the file
+    signature.
+
+    Folders are walked top-down and sorted by name so that the order is
+    deterministic.
+
+    *list_function* can be a function which replaces :func:`list_folder` to
+    list each folder, for instance to reuse listings previously recorded.
+
+    """
+    if list_function is None:
+        list_function = list_folder
+
+    repository_name = os.path.basename(path)
+
+    folders = collections.deque([((repository_name,), path)])
+
+    while len(folders) > 0:
+        hierarchy, folder_path = folders.popleft()
+        files, folder_names = list_function(folder_path)
+
+        file_names = [file_name for file_name, _ in files]
+
+        for file_name, signature in files:
+            yield (
+                "/".join(hierarchy + (file_name,)),
+                os.path.join(folder_path, file_name),
+                file_names,
+                signature
+            )
+
+        # Walk sub-folders depth first, in the same order as os.walk.
+        folders.extendleft(
+            (
+                hierarchy + (folder_name,),
+                os.path.join(folder_path, folder_name)
+            )
+            for folder_name in reversed(folder_names)
+        )
+
+
+def read_file(file_path):
+    """Return content of *file_path* or None if the file is not readable.
+
+    The operating system is advised that the whole file will be read
+    sequentially when :func:`os.posix_fadvise` is available, so that it can be
+    fetched from the disk in one go.
+
+    """
+    try:
+        with open(file_path, "r") as f:
+            _advise(f)
+            return f.read()
+    except (IOError, OSError):
+        return
+
+
+def read_files(source_files, workers=None, queue_size=None, skip=None):
+    """Yield tuple with each source file and its content.
+
+    *source_files* is an iterable of tuples, where the file path is the
+    second element, as yielded by :func:`scan_files`.
+
+    *skip* can be a function called with each source file which indicates
+    whether the file should not be read, in which case its content is None.
+
+    *workers* is the number of threads used to read the files concurrently.
+    The files are read sequentially if it is not provided or if
+    :mod:`concurrent.futures` is not available.
+
+    *queue_size* is the maximum number of files read in advance which are
+    waiting to be consumed. It is twice the number of *workers* by default.
+
+    The content is None if the file is not readable. Files are yielded in the
+    same order as *source_files*, whatever the order in which they are read.
+
+    """
+    if not workers or concurrent is None:
+        for source_file in source_files:
+            if skip is not None and skip(source_file):
+                yield source_file, None
+            else:
+                yield source_file, read_file(source_file[1])
+        return
+
+    if queue_size is None:
+        queue_size = workers * 2
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        for source_file, content in map_ordered(
+            pool, _read_file, (
+                (
+                    source_file,
+                    (source_file[1], skip is not None and skip(source_file))
+                )
+                for source_file in source_files
+            ), queue_size
+        ):
+            yield source_file, content
+
+
+def _read_file(file_path, skip):
+    """Return content of *file_path*, or None if *skip* is True."""
+    if skip:
+        return
+
+    return read_file(file_path)
+
+
+def map_ordered(executor, function, items, queue_size):
+    """Yield tuple with each item and the result of *function* for this item.
+
+    *executor* is a :class:`concurrent.futures.Executor` instance used to
+    call *function*.
+
+    *items* is an iterable of tuples with an item and the arguments to call
+    *function* with for this item.
+
+    *queue_size* is the maximum number of calls submitted to the *executor*
+    which are waiting to be consumed. Items are only pulled from *items* when
+    there is room in the queue, so that a slow consumer blocks the producer.
+
+    Results are yielded in the same order as *items*.
+
+    """
+    queue = collections.deque()
+
+    for item, arguments in items:
+        queue.append((item, executor.submit(function, *arguments)))
+
+        # Block until the oldest result is available when the queue is full.
+        while len(queue) >= max(queue_size, 1):
+            _item, future = queue.popleft()
+            yield _item, future.result()
+
+    while len(queue) > 0:
+        _item, future = queue.popleft()
+        yield _item, future.result()
+
+
+def file_signature(file_path):
+    """Return tuple with modification time and size of *file_path*.
+
+    Return None if the file can not be accessed.
+
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return
+
+    return stat.st_mtime, stat.st_size
+
+
+def _advise(file_object):
+    """Advise the operating system that *file_object* will be read entirely.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    try:
+        file_descriptor = file_object.fileno()
+        os.posix_fadvise(file_descriptor, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(file_descriptor, 0, 0, os.POSIX_FADV_WILLNEED)
+    except (IOError, OSError):  # Advice is not supported by the file system
+        pass
+
+
+def _entry_signature(entry):
+    """Return tuple with modification time and size of directory *entry*.
+
+    Return None if the file can not be accessed.
+
+    """
+    try:
+        stat = entry.stat()
+    except OSError:
+        return
+
+    return stat.st_mtime, stat.st_size
@@ -0,0 +1,236 @@
+# :coding: utf-8
+
+"""Resolve the elements exported by each :term:`Javascript` module.
+
+An element can be exported from another module, which can itself re-export
+it from a third module, and so on. The resolution of these chains is
+memoized per module so that each chain is only followed once, and cyclic
+re-exports are detected so that they can not be followed endlessly::
+
+    >>> resolver = ExportResolver(environment)
+    >>> resolver.fetch_export_table("example")
+    [
+        {
+            "line_number": 3,
+            "name": "AwesomeClass",
+            "module_id": "example.utils",
+            "wildcard": False,
+            "category": "class",
+            "element_id": "example.utils.AwesomeClass"
+        },
+        ...
+    ]
+
+"""
+
+
+#: Element categories which can be exported, in order of resolution.
+EXPORTED_CATEGORIES = ["class", "function", "data"]
+
+
+class ExportResolver(object):
+    """Memoized resolution of the exported elements within *environment*.
+
+    *environment* is the full :term:`Javascript` environment processed in
+    :mod:`~champollion.parser`.
+
+    .. warning::
+
+        The results are not updated if the *environment* is mutated.
+
+    """
+
+    def __init__(self, environment):
+        """Initiate resolver from *environment*."""
+        self.environment = environment
+
+        self._tables = {}
+        self._elements = {}
+        self._resolving = set()
+
+        #: Indicate whether a cyclic re-export has been encountered while
+        #: resolving an element, in which case the result is not memoized.
+        self._cyclic = False
+
+    def fetch_export_table(self, module_id):
+        """Return list of resolved exported elements from *module_id*.
+
+        Elements are sorted by line number of the export statement. Each
+        element is in the form of::
+
+            {
+                "line_number": 3,
+                "name": "AwesomeClass",
+                "module_id": "example.utils",
+                "wildcard": False,
+                "category": "class",
+                "element_id": "example.utils.AwesomeClass"
+            }
+
+        *name* is the name of the element exported, *module_id* is the module
+        the element is exported from. If *wildcard* is True, all elements of
+        the module are exported and *category* and *element_id* are None.
+
+        Exported elements which can not be resolved are skipped.
+
+        """
+        if module_id not in self._tables:
+            self._tables[module_id] = self._fetch_export_table(module_id)
+
+        return self._tables[module_id]
+
+    def resolve(self, module_id, name):
+        """Return tuple with category and identifier of element *name*.
+
+        The element *name* is searched in the elements defined within
+        *module_id*, then in the elements re-exported by *module_id*
+        recursively. *name* can be "default" to resolve the default element.
+
+        Return None if the element can not be resolved, or if it can only be
+        resolved through a cyclic re-export.
+
+        """
+        key = (module_id, name)
+
+        if key in self._elements:
+            return self._elements[key]
+
+        # Prevent following a cyclic re-export endlessly.
+        if key in self._resolving:
+            self._cyclic = True
+            return
+
+        cyclic = self._cyclic
+        self._cyclic = False
+        self._resolving.add(key)
+
+        try:
+            resolved = self._resolve(module_id, name)
+        finally:
+            self._resolving.discard(key)
+
+        # A result depending on a cyclic re-export being resolved is only
+        # memoized once the whole cycle has been resolved.
+        if not self._cyclic or len(self._resolving) == 0:
+            self._elements[key] = resolved
+
+        self._cyclic = self._cyclic or cyclic
+        if len(self._resolving) == 0:
+            self._cyclic = False
+
+        return resolved
+
+    def _fetch_export_table(self, module_id):
+        """Return list of resolved exported elements from *module_id*."""
+        file_environment = self._file_environment(module_id)
+        if file_environment is None:
+            return []
+
+        table = []
+
+        for export_environment, name, from_module_id in self._exports(
+            file_environment
+        ):
+            # Ignore element if the origin module can not be found
+            if from_module_id not in self.environment["module"].keys():
+                continue
+
+            element = {
+                "line_number": export_environment["line_number"],
+                "name": self._alias(export_environment),
+                "module_id": from_module_id,
+                "wildcard": name == "*",
+                "category": None,
+                "element_id": None
+            }
+
+            if name != "*":
+                resolved = self.resolve(from_module_id, name)
+                if resolved is None:
+                    continue
+
+                element["category"], element["element_id"] = resolved
+
+            table.append(element)
+
+        return sorted(table, key=lambda _element: _element["line_number"])
+
+    def _resolve(self, module_id, name):
+        """Return tuple with category and identifier of element *name*."""
+        file_environment = self._file_environment(module_id)
+        if file_environment is None:
+            return
+
+        for category in EXPORTED_CATEGORIES:
+            for element in file_environment[category].values():
+                if name == "default" and element["default"]:
+                    return category, element["id"]
+
+                if element["name"] == name and element["exported"]:
+                    return category, element["id"]
+
+        # Follow the elements re-exported from another module.
+        wildcard_module_ids = []
+
+        for export_environment, _name, from_module_id in self._exports(
+            file_environment
+        ):
+            if _name == "*":
+                wildcard_module_ids.append(from_module_id)
+
+            elif (
+                self._alias(export_environment) == name and
+                from_module_id is not None
+            ):
+                return self.resolve(from_module_id, _name)
+
+        if name == "default":
+            return
+
+        for from_module_id in wildcard_module_ids:
+            resolved = self.resolve(from_module_id, name)
+            if resolved is not None:
+                return resolved
+
+    def _exports(self, file_environment):
+        """Yield each element exported from *file_environment* with origin.
+
+        Each element is yielded as a tuple with the export environment, the
+        name of the element within the origin module and the origin module
+        identifier. The identifier is None if the element is not exported
+        from another module.
+
+        """
+        import_environment = file_environment["import"]
+
+        for export_id, export_environment in (
+            file_environment["export"].items()
+        ):
+            name = export_environment["name"]
+            from_module_id = export_environment["module"]
+
+            # Update module origin and name from import if necessary
+            if (
+                from_module_id is None and
+                export_id in import_environment.keys()
+            ):
+                name = import_environment[export_id]["name"]
+                from_module_id = import_environment[export_id]["module"]
+
+            yield export_environment, name, from_module_id
+
+    def _file_environment(self, module_id):
+        """Return file environment from *module_id* or None."""
+        if module_id not in self.environment["module"].keys():
+            return
+
+        file_id = self.environment["module"][module_id]["file_id"]
+        return self.environment["file"].get(file_id)
+
+    @staticmethod
+    def _alias(export_environment):
+        """Return the name exported from *export_environment*."""
+        if export_environment["alias"] is not None:
+            return export_environment["alias"]
+
+        return export_environment["name"]
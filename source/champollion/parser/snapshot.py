@@ -0,0 +1,251 @@
+# :coding: utf-8
+
+"""Snapshot of the :term:`Javascript` source folders recorded between builds.
+
+The modification time and the listing of each folder are recorded with the
+file environment parsed for each source file, so that a subsequent scan can
+reuse the listing of the folders which have not changed, and the parse
+results of the files which have not changed. The blocks parsed from large
+files are also recorded, so that only the blocks which have changed are
+parsed again when such a file is modified::
+
+    >>> snapshot = DirectorySnapshot("/path/to/champollion-snapshot.pickle")
+    >>> snapshot.load()
+    >>> environment = fetch_environment("/path/to/example", snapshot=snapshot)
+    >>> snapshot.save()
+
+.. warning::
+
+    The modification time of a folder only changes when an entry is added,
+    removed or renamed within the folder. A file modified in place within an
+    unchanged folder is therefore not detected unless the folders are
+    scanned again with the *rescan* option, which lists all folders while
+    still reusing the parse results of the files which have not changed.
+
+"""
+
+import os
+import pickle
+import time
+
+from .._version import __version__
+from .reader import list_folder, scan_files
+
+
+#: Default name of the file storing the snapshot.
+FILE_NAME = "champollion-snapshot.pickle"
+
+#: Number of seconds during which a folder modified before being listed can
+#: not be trusted, as another modification within the granularity of the
+#: file system timestamps would not modify its modification time.
+RACY_INTERVAL = 2.0
+
+
+class DirectorySnapshot(object):
+    """Folder listings and parse results recorded between builds.
+
+    The snapshot is stored in *path* if provided. Folders and files which
+    have not been scanned since the snapshot was loaded are dropped when it
+    is saved.
+
+    *max_value_length* is the maximum length of the data and attribute values
+    within the file environments recorded, as they must be parsed again when
+    it changes.
+
+    """
+
+    def __init__(self, path=None, max_value_length=None):
+        """Initiate empty snapshot which can be stored in *path*."""
+        self.path = path
+        self.max_value_length = max_value_length
+
+        #: Modification time, source files and folder names per folder path.
+        self._folders = {}
+
+        #: Signature, module identifier and file environment per file path.
+        self._files = {}
+
+        #: Module identifier and blocks parsed per path of large files.
+        self._blocks = {}
+
+        self._scanned_folders = set()
+        self._scanned_files = set()
+
+    def load(self):
+        """Load snapshot from :attr:`path` if available.
+
+        The snapshot is ignored if the file can not be read or if it has been
+        recorded with another version of this extension or with another
+        maximum value length.
+
+        """
+        if self.path is None or not os.path.isfile(self.path):
+            return
+
+        try:
+            with open(self.path, "rb") as stream:
+                data = pickle.load(stream)
+        except Exception:
+            return
+
+        if not isinstance(data, dict) or data.get("version") != __version__:
+            return
+
+        if data.get("max_value_length") != self.max_value_length:
+            return
+
+        self._folders = data["folders"]
+        self._files = data["files"]
+        self._blocks = data.get("blocks", {})
+
+    def save(self):
+        """Save snapshot into :attr:`path`.
+
+        Folders and files which have not been scanned are dropped.
+
+        """
+        self._folders = dict(
+            (path, value) for path, value in self._folders.items()
+            if path in self._scanned_folders
+        )
+        self._files = dict(
+            (path, value) for path, value in self._files.items()
+            if path in self._scanned_files
+        )
+        self._blocks = dict(
+            (path, value) for path, value in self._blocks.items()
+            if path in self._scanned_files
+        )
+
+        if self.path is None:
+            return
+
+        with open(self.path, "wb") as stream:
+            pickle.dump(
+                {
+                    "version": __version__,
+                    "max_value_length": self.max_value_length,
+                    "folders": self._folders,
+                    "files": self._files,
+                    "blocks": self._blocks
+                },
+                stream, pickle.HIGHEST_PROTOCOL
+            )
+
+    def scan_files(self, path, rescan=False):
+        """Yield source files found within *path*.
+
+        The source files are yielded as with
+        :func:`~champollion.parser.reader.scan_files`, but the listing of
+        each folder which has not been modified since it was recorded is
+        reused instead of listing the folder again.
+
+        If *rescan* is set to True, all folders are listed again.
+
+        """
+        def _list_folder(folder_path):
+            """Return listing of *folder_path* and record scanned files."""
+            files, folder_names = self.list_folder(folder_path, rescan=rescan)
+
+            self._scanned_files.update(
+                os.path.join(folder_path, file_name) for file_name, _ in files
+            )
+            return files, folder_names
+
+        return scan_files(path, list_function=_list_folder)
+
+    def list_folder(self, path, rescan=False):
+        """Return tuple with source files and folder names within *path*.
+
+        The listing recorded for *path* is returned if the modification time
+        of the folder has not changed, otherwise the folder is listed again
+        with :func:`~champollion.parser.reader.list_folder`. The listing of a
+        folder modified less than :data:`RACY_INTERVAL` seconds before being
+        listed is never reused.
+
+        If *rescan* is set to True, the folder is always listed again.
+
+        """
+        self._scanned_folders.add(path)
+
+        try:
+            modification_time = os.stat(path).st_mtime
+        except OSError:
+            return [], []
+
+        recorded = self._folders.get(path)
+        if (
+            not rescan and recorded is not None and
+            recorded[0] == modification_time
+        ):
+            return recorded[1], recorded[2]
+
+        files, folder_names = list_folder(path)
+
+        # Listing of a folder modified too recently is not reused.
+        if time.time() - modification_time < RACY_INTERVAL:
+            modification_time = None
+
+        self._folders[path] = (modification_time, files, folder_names)
+
+        return files, folder_names
+
+    def is_parsed(self, source_file):
+        """Indicate whether parse result of *source_file* is recorded.
+
+        *source_file* is a tuple as yielded by :meth:`scan_files`. The parse
+        result is only valid if the file signature has not changed.
+
+        """
+        recorded = self._files.get(source_file[1])
+        return recorded is not None and recorded[0] == source_file[3]
+
+    def fetch(self, file_path, signature, module_id):
+        """Return file environment recorded for *file_path* or None.
+
+        The file environment is only returned if it has been recorded with
+        the same *signature* and *module_id*.
+
+        """
+        recorded = self._files.get(file_path)
+        if recorded is None or recorded[:2] != (signature, module_id):
+            return
+
+        return recorded[2]
+
+    def fetch_blocks(self, file_path, module_id):
+        """Return blocks recorded for *file_path* or None.
+
+        The blocks are returned as with
+        :func:`~champollion.parser.block.fetch_environment_from_blocks`, and
+        only if they have been recorded with the same *module_id*. They are
+        returned even if the file has changed since they were recorded.
+
+        """
+        recorded = self._blocks.get(file_path)
+        if recorded is None or recorded[0] != module_id:
+            return
+
+        return recorded[1]
+
+    def record(
+        self, file_path, signature, module_id, file_environment, blocks=None
+    ):
+        """Record *file_environment* parsed from *file_path*.
+
+        *blocks* can be the blocks parsed from the file with
+        :func:`~champollion.parser.block.fetch_environment_from_blocks`.
+
+        Nothing is recorded if the *signature* or the *file_environment* is
+        None.
+
+        """
+        if signature is None or file_environment is None:
+            return
+
+        self._files[file_path] = (signature, module_id, file_environment)
+
+        if blocks is not None:
+            self._blocks[file_path] = (module_id, blocks)
+        else:
+            self._blocks.pop(file_path, None)
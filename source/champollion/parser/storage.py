@@ -0,0 +1,232 @@
+# :coding: utf-8
+
+"""Read-only index of the :term:`Javascript` environment mapped in memory.
+
+The environment is serialized once into a file where each element is
+pickled separately, so that the file can be mapped in memory and each
+element only unpickled when it is first accessed::
+
+    >>> write_index(environment, "/path/to/champollion-index.bin")
+    >>> index = EnvironmentIndex("/path/to/champollion-index.bin")
+    >>> index["class"]["example.utils.AwesomeClass"]
+    {"id": "example.utils.AwesomeClass", ...}
+
+As the memory mapped is backed by the file, it is shared between the
+processes forked by :term:`Sphinx` to read documents in parallel instead of
+being copied into each process, and pickling the index only records the
+path to the file.
+
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+
+#: Default name of the file storing the index.
+FILE_NAME = "champollion-index.bin"
+
+#: Header of the index file, containing the position of the table of
+#: contents at the end of the file.
+_HEADER = struct.Struct("<8sQ")
+
+#: Identifier written at the start of the index file.
+_MAGIC = b"CHAMPIDX"
+
+
+def write_index(environment, path):
+    """Write index of *environment* into *path*.
+
+    Each element is pickled separately, and a table of contents mapping each
+    element identifier to the position of the pickled element is written at
+    the end of the file.
+
+    The index is written into a temporary file which then replaces *path*,
+    so that an index already mapped from *path* stays valid.
+
+    Return digest of the index content.
+
+    """
+    table = {}
+    digest = hashlib.sha1()
+    temporary_path = path + ".tmp"
+
+    with open(temporary_path, "wb") as stream:
+        stream.write(_HEADER.pack(_MAGIC, 0))
+        position = _HEADER.size
+
+        for category in sorted(environment.keys()):
+            elements = table.setdefault(category, {})
+
+            for element_id, element in environment[category].items():
+                data = pickle.dumps(element, pickle.HIGHEST_PROTOCOL)
+                stream.write(data)
+
+                digest.update(
+                    "{0}:{1}".format(category, element_id).encode("utf-8")
+                )
+                digest.update(data)
+
+                elements[element_id] = (position, len(data))
+                position += len(data)
+
+        data = pickle.dumps(
+            (table, digest.hexdigest()), pickle.HIGHEST_PROTOCOL
+        )
+        stream.write(data)
+
+        stream.seek(0)
+        stream.write(_HEADER.pack(_MAGIC, position))
+
+    getattr(os, "replace", os.rename)(temporary_path, path)
+
+    return digest.hexdigest()
+
+
+class EnvironmentIndex(Mapping):
+    """Environment read from an index written with :func:`write_index`.
+
+    The file is mapped in memory and its table of contents is read when the
+    index is created, or when it is first accessed after being unpickled.
+    Each element is unpickled once per process when it is first accessed.
+
+    Two indices are equal if their content is identical, even if the file
+    has been written again in between.
+
+    """
+
+    def __init__(self, path):
+        """Initiate index from *path*.
+
+        Raises :exc:`IOError` if the file can not be read or is not an index.
+
+        """
+        self.path = path
+
+        self._buffer = None
+        self._table = None
+        self._digest = None
+        self._categories = {}
+
+        self._open()
+
+    @property
+    def digest(self):
+        """Return digest of the index content."""
+        return self._digest
+
+    def __getitem__(self, category):
+        """Return mapping of elements for *category*."""
+        if self._table is None:
+            self._open()
+
+        if category not in self._table:
+            raise KeyError(category)
+
+        if category not in self._categories:
+            self._categories[category] = _IndexElementMapping(self, category)
+
+        return self._categories[category]
+
+    def __iter__(self):
+        """Iterate over the environment categories."""
+        if self._table is None:
+            self._open()
+
+        return iter(self._table)
+
+    def __len__(self):
+        """Return number of categories."""
+        if self._table is None:
+            self._open()
+
+        return len(self._table)
+
+    def __eq__(self, other):
+        """Indicate whether index is equal to *other*."""
+        if isinstance(other, EnvironmentIndex):
+            return self._digest == other._digest
+
+        return super(EnvironmentIndex, self).__eq__(other)
+
+    def __ne__(self, other):
+        """Indicate whether index is different from *other*."""
+        return not self == other
+
+    __hash__ = None
+
+    def __getstate__(self):
+        """Return state recorded when the index is pickled."""
+        return {"path": self.path, "digest": self._digest}
+
+    def __setstate__(self, state):
+        """Restore index from *state* without mapping the file."""
+        self.path = state["path"]
+
+        self._buffer = None
+        self._table = None
+        self._digest = state["digest"]
+        self._categories = {}
+
+    def _open(self):
+        """Map the file in memory and read the table of contents."""
+        with open(self.path, "rb") as stream:
+            buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if buffer.size() < _HEADER.size:
+            raise IOError("The index file is incorrect: {0}".format(self.path))
+
+        magic, position = _HEADER.unpack(buffer[:_HEADER.size])
+        if magic != _MAGIC or position == 0:
+            raise IOError("The index file is incorrect: {0}".format(self.path))
+
+        self._buffer = buffer
+        self._table, self._digest = pickle.loads(buffer[position:])
+
+    def _load(self, position, size):
+        """Return element pickled at *position* with *size*."""
+        if self._buffer is None:
+            self._open()
+
+        return pickle.loads(self._buffer[position:position + size])
+
+
+class _IndexElementMapping(Mapping):
+    """Element category of an :class:`EnvironmentIndex`.
+
+    Elements are unpickled on demand and kept for subsequent accesses.
+
+    """
+
+    def __init__(self, index, category):
+        """Initiate mapping for *category* within *index*."""
+        self._index = index
+        self._category = category
+        self._elements = {}
+
+    def __getitem__(self, element_id):
+        """Return element environment from *element_id*."""
+        if element_id not in self._elements:
+            position, size = self._index._table[self._category][element_id]
+            self._elements[element_id] = self._index._load(position, size)
+
+        return self._elements[element_id]
+
+    def __contains__(self, element_id):
+        """Indicate whether *element_id* is in the category."""
+        return element_id in self._index._table[self._category]
+
+    def __iter__(self):
+        """Iterate over element identifiers."""
+        return iter(self._index._table[self._category])
+
+    def __len__(self):
+        """Return number of elements."""
+        return len(self._index._table[self._category])
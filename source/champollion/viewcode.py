@@ -11,15 +11,37 @@ class ViewCode(object):
 
     """
 
-    #: Store the modules elements to link to the code
-    js_modules = None
+    @classmethod
+    def fetch_modules(cls, builder_env):
+        """Return modules elements to link to the code from *builder_env*.
+
+        The modules elements are recorded in the 'js_modules' attribute of
+        the builder environment so that they are pickled with it, and merged
+        from the parallel readers. The result is in the form of::
+
+            {
+                "example.module": {
+                    "pagename": "_modules/example/module",
+                    "entries": {
+                        12: ("AwesomeClass", "api_reference"),
+                        ...
+                    }
+                },
+                ...
+            }
+
+        """
+        if getattr(builder_env, "js_modules", None) is None:
+            builder_env.js_modules = {}
+
+        return builder_env.js_modules
 
     @classmethod
     def add_source_code_links(cls, app, doctree):
         """Parse *doctree* and add source code link when available.
 
-        Create temporary 'js_modules' in *app* builder environment to store all
-        module information which will be used to create the code page links.
+        Record module information in *app* builder environment which will be
+        used to create the code page links.
 
         This function is called with the ``doctree-read`` Sphinx event, emitted
         when a *doctree* has been parsed and read by the  environment, and is
@@ -28,9 +50,7 @@ class ViewCode(object):
         """
         js_env = app.config.js_environment
         builder_env = app.builder.env
-
-        if cls.js_modules is None:
-            cls.js_modules = {}
+        js_modules = cls.fetch_modules(builder_env)
 
         # Loop through all js signature nodes
         for object_node in doctree.traverse(addnodes.desc):
@@ -57,16 +77,15 @@ class ViewCode(object):
                 module_id = js_env_element["module_id"]
                 page_name = "_modules/{0}".format(module_id.replace(".", "/"))
 
-                if module_id not in cls.js_modules.keys():
-                    cls.js_modules[module_id] = {
+                if module_id not in js_modules:
+                    js_modules[module_id] = {
                         "pagename": page_name,
-                        "docname": builder_env.docname,
                         "entries": {}
                     }
 
                 line_number = js_env_element["line_number"]
-                cls.js_modules[module_id]["entries"][line_number] = (
-                    js_env_element["name"]
+                js_modules[module_id]["entries"][line_number] = (
+                    js_env_element["name"], builder_env.docname
                 )
 
                 link_node = addnodes.only(expr="html")
@@ -84,6 +103,45 @@ class ViewCode(object):
                 )
                 node += link_node
 
+    @classmethod
+    def purge_modules(cls, app, builder_env, docname):
+        """Remove entries recorded from *docname* in *builder_env*.
+
+        This function is called with the ``env-purge-doc`` Sphinx event,
+        emitted when a document is removed or about to be read again.
+
+        """
+        js_modules = cls.fetch_modules(builder_env)
+
+        for module_id, element in list(js_modules.items()):
+            element["entries"] = dict(
+                (line_number, entry)
+                for line_number, entry in element["entries"].items()
+                if entry[1] != docname
+            )
+
+            if len(element["entries"]) == 0:
+                del js_modules[module_id]
+
+    @classmethod
+    def merge_modules(cls, app, builder_env, docnames, other):
+        """Merge entries recorded in *other* builder environment.
+
+        This function is called with the ``env-merge-info`` Sphinx event,
+        emitted for each parallel reader when its documents have been read.
+
+        """
+        js_modules = cls.fetch_modules(builder_env)
+
+        for module_id, element in cls.fetch_modules(other).items():
+            if module_id not in js_modules:
+                js_modules[module_id] = {
+                    "pagename": element["pagename"],
+                    "entries": {}
+                }
+
+            js_modules[module_id]["entries"].update(element["entries"])
+
     @classmethod
     def create_code_pages(cls, app):
         """Create all code pages and the links to the documentation.
@@ -93,7 +151,8 @@ class ViewCode(object):
 
         """
         builder_env = app.builder.env
-        if cls.js_modules is None:
+        js_modules = cls.fetch_modules(builder_env)
+        if len(js_modules) == 0:
             return
 
         module_env = app.config.js_environment["module"]
@@ -102,12 +161,11 @@ class ViewCode(object):
         highlighter = app.builder.highlighter
         uri = app.builder.get_relative_uri
 
-        all_pages = [elt["pagename"] for elt in cls.js_modules.values()]
+        all_pages = [elt["pagename"] for elt in js_modules.values()]
 
-        for module_id, element in cls.js_modules.items():
+        for module_id, element in js_modules.items():
             file_id = module_env[module_id]["file_id"]
             page_name = element["pagename"]
-            doc_name = element["docname"]
 
             if builder_env.config.highlight_language in (
                 "js", "default", "none"
@@ -121,7 +179,7 @@ class ViewCode(object):
             )
             lines = highlighted.splitlines()
 
-            for line_number, name in element["entries"].items():
+            for line_number, (name, doc_name) in element["entries"].items():
                 link = uri(page_name, doc_name) + "#" + name
                 lines[line_number-1] = (
                     "<div class='viewcode-block' id='{name}'>"
@@ -168,12 +226,11 @@ class ViewCode(object):
     def create_code_page_index(cls, app):
         """Create page index regrouping all code page links.
         """
-        if cls.js_modules is None:
-            return
+        js_modules = cls.fetch_modules(app.builder.env)
 
         body = ["\n<ul>"]
 
-        for module_id in sorted(cls.js_modules.keys()):
+        for module_id in sorted(js_modules.keys()):
             link_page = "_modules/{0}".format(module_id.replace(".", "/"))
             uri = app.builder.get_relative_uri
 
@@ -0,0 +1,40 @@
+# :coding: utf-8
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+
+@pytest.fixture()
+def temporary_directory(request):
+    """Return a temporary directory path."""
+    path = tempfile.mkdtemp()
+
+    def cleanup():
+        """Remove temporary directory."""
+        shutil.rmtree(path)
+
+    request.addfinalizer(cleanup)
+
+    return path
+
+
+@pytest.fixture()
+def doc_folder(temporary_directory):
+    """Return documentation folder with an empty Javascript source folder."""
+    path = os.path.join(temporary_directory, "doc")
+    os.makedirs(os.path.join(path, "example"))
+
+    with open(os.path.join(path, "conf.py"), "w") as f:
+        f.write(
+            "# :coding: utf-8\n"
+            "extensions=['champollion']\n"
+            "source_suffix = '.rst'\n"
+            "master_doc = 'index'\n"
+            "exclude_patterns = ['Thumbs.db', '.DS_Store']\n"
+            "js_source='{}/example'".format(path)
+        )
+
+    return path
@@ -0,0 +1,288 @@
+# :coding: utf-8
+
+"""End-to-end benchmark of a Sphinx HTML build of a synthetic project.
+
+The benchmarks are not run with the unit tests by default::
+
+    pytest test/benchmark
+
+The benchmark can also be run with custom scale parameters::
+
+    python test/benchmark/test_benchmark_build.py \
+        --modules 200 --members 20 --pages 20
+
+"""
+
+import argparse
+import collections
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pytest
+from sphinx.application import Sphinx
+
+import champollion
+import champollion.viewcode
+
+
+#: Phases of the build which are timed.
+PHASES = [
+    "builder-inited", "read", "doctree-read", "html-collect-pages", "total"
+]
+
+
+def create_project(path, modules, members, pages):
+    """Create synthetic project in *path* and return the source folder.
+
+    *modules* is the number of modules created, each containing a class with
+    *members* methods and attributes, a function and a data. The modules are
+    re-exported from the root module and documented within *pages* pages.
+
+    """
+    js_source = os.path.join(path, "example")
+
+    for index in range(modules):
+        module_path = os.path.join(js_source, "module_{0}".format(index))
+        os.makedirs(module_path)
+
+        with open(os.path.join(module_path, "index.js"), "w") as f:
+            f.write(
+                "/**\n * Module {0}.\n */\n\n"
+                "/** A class. */\n"
+                "export class Class{0} {{\n"
+                "    constructor() {{\n".format(index)
+            )
+
+            for member in range(members):
+                f.write(
+                    "        /** An attribute. */\n"
+                    "        this.attribute{0} = {0};\n".format(member)
+                )
+
+            f.write("    }\n\n")
+
+            for member in range(members):
+                f.write(
+                    "    /** A method. */\n"
+                    "    method{0}(arg) {{\n"
+                    "        return arg + {0};\n"
+                    "    }}\n\n".format(member)
+                )
+
+            f.write(
+                "}}\n\n"
+                "/** A function. */\n"
+                "export function doSomething{0}(arg) {{}}\n\n"
+                "/** A data. */\n"
+                "export const DATA_{0} = {0};\n".format(index)
+            )
+
+    with open(os.path.join(js_source, "index.js"), "w") as f:
+        f.write("/**\n * Root module.\n */\n\n")
+
+        for index in range(modules):
+            if index % 2 == 0:
+                f.write("export * from './module_{0}';\n".format(index))
+            else:
+                f.write(
+                    "export {{Class{0} as Aliased{0}}} "
+                    "from './module_{0}';\n".format(index)
+                )
+
+    with open(os.path.join(path, "conf.py"), "w") as f:
+        f.write(
+            "# :coding: utf-8\n"
+            "extensions=['champollion']\n"
+            "source_suffix = '.rst'\n"
+            "master_doc = 'index'\n"
+            "js_source='{}'\n".format(js_source)
+        )
+
+    with open(os.path.join(path, "index.rst"), "w") as f:
+        f.write(".. toctree::\n\n")
+
+        for page in range(pages):
+            f.write("    page_{0}\n".format(page))
+
+        f.write("\n.. js:automodule:: example\n    :members:\n")
+
+    for page in range(pages):
+        with open(
+            os.path.join(path, "page_{0}.rst".format(page)), "w"
+        ) as f:
+            f.write("Page {0}\n=======\n".format(page))
+
+            for index in range(page, modules, pages):
+                f.write(
+                    "\n.. js:automodule:: example.module_{0}\n"
+                    "    :members: doSomething{0}, DATA_{0}\n"
+                    "\n.. js:autoclass:: example.module_{0}.Class{0}\n"
+                    "    :members:\n".format(index)
+                )
+
+    return js_source
+
+
+@contextlib.contextmanager
+def record_phases(durations):
+    """Record time spent in each phase of the build within *durations*."""
+    original = {
+        "builder-inited": champollion.fetch_javascript_environment,
+        "doctree-read": champollion.viewcode.ViewCode.add_source_code_links,
+        "html-collect-pages": champollion.viewcode.ViewCode.create_code_pages,
+    }
+
+    def _timed(phase, function):
+        """Return *function* recording its duration for *phase*."""
+        def _function(*args):
+            start_time = time.time()
+            result = function(*args)
+
+            # Pages are generated lazily.
+            if phase == "html-collect-pages":
+                result = list(result)
+
+            durations[phase] += time.time() - start_time
+            return result
+
+        return _function
+
+    champollion.fetch_javascript_environment = _timed(
+        "builder-inited", original["builder-inited"]
+    )
+    champollion.viewcode.ViewCode.add_source_code_links = _timed(
+        "doctree-read", original["doctree-read"]
+    )
+    champollion.viewcode.ViewCode.create_code_pages = _timed(
+        "html-collect-pages", original["html-collect-pages"]
+    )
+
+    try:
+        yield
+
+    finally:
+        champollion.fetch_javascript_environment = original["builder-inited"]
+        champollion.viewcode.ViewCode.add_source_code_links = (
+            original["doctree-read"]
+        )
+        champollion.viewcode.ViewCode.create_code_pages = (
+            original["html-collect-pages"]
+        )
+
+
+def run_build(path):
+    """Run HTML build of project in *path* and return phase durations.
+
+    The duration of the "read" phase excludes the source code links added
+    with the "doctree-read" event.
+
+    """
+    durations = collections.OrderedDict((phase, 0.0) for phase in PHASES)
+    read_times = {}
+
+    with record_phases(durations):
+        start_time = time.time()
+
+        app = Sphinx(
+            path, path, os.path.join(path, "_build", "html"),
+            os.path.join(path, "_build", "doctrees"), "html",
+            status=None, warning=None, freshenv=True
+        )
+
+        def _record(name):
+            """Return event callback recording time as *name*."""
+            def _callback(*args):
+                read_times.setdefault(name, time.time())
+
+            return _callback
+
+        app.connect("env-before-read-docs", _record("start"))
+        app.connect("env-updated", _record("end"))
+
+        app.build()
+
+        durations["total"] = time.time() - start_time
+
+    durations["read"] = (
+        read_times["end"] - read_times["start"] - durations["doctree-read"]
+    )
+
+    return durations
+
+
+def report(durations, modules, members, pages):
+    """Return report of phase *durations*."""
+    lines = [
+        "build with {0} modules, {1} members, {2} pages:".format(
+            modules, members, pages
+        )
+    ]
+
+    for phase, duration in durations.items():
+        lines.append("    {0}: {1:.4f}s".format(phase, duration))
+
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("modules, members, pages", [
+    (10, 5, 2),
+    (40, 5, 8),
+], ids=[
+    "10-modules",
+    "40-modules",
+])
+def test_benchmark_build(temporary_directory, modules, members, pages):
+    """Report time spent in each phase of an HTML build."""
+    create_project(temporary_directory, modules, members, pages)
+    durations = run_build(temporary_directory)
+
+    print("\n" + report(durations, modules, members, pages))
+
+    for page in range(pages):
+        assert os.path.isfile(
+            os.path.join(
+                temporary_directory, "_build", "html",
+                "page_{0}.html".format(page)
+            )
+        )
+
+    assert os.path.isfile(
+        os.path.join(
+            temporary_directory, "_build", "html", "_modules", "index.html"
+        )
+    )
+    assert all(duration >= 0 for duration in durations.values())
+
+
+def main(arguments=None):
+    """Run benchmark with scale parameters from command line *arguments*."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--modules", type=int, default=100)
+    parser.add_argument("--members", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=10)
+    namespace = parser.parse_args(arguments)
+
+    path = tempfile.mkdtemp()
+
+    try:
+        create_project(
+            path, namespace.modules, namespace.members, namespace.pages
+        )
+        durations = run_build(path)
+
+    finally:
+        shutil.rmtree(path)
+
+    print(
+        report(
+            durations, namespace.modules, namespace.members, namespace.pages
+        )
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# :coding: utf-8
+
+"""Benchmark of the directives parsing many members.
+
+The benchmarks are not run with the unit tests by default::
+
+    pytest test/benchmark
+
+"""
+
+import os
+import time
+
+import pytest
+import docutils.parsers.rst.states
+from sphinx.cmd.build import main as sphinx_main
+from sphinx.util.osutil import cd
+
+import champollion.directive.js_module
+
+
+def _create_module(path, members):
+    """Create module with *members* functions and data in *path*."""
+    with open(os.path.join(path, "index.js"), "w") as f:
+        f.write("/**\n * A large module.\n */\n\n")
+
+        for index in range(members):
+            f.write(
+                "/** A function. */\n"
+                "export function doSomething{0}(arg) {{}}\n"
+                "\n"
+                "/** A data. */\n"
+                "export const DATA_{0} = {0};\n"
+                "\n".format(index)
+            )
+
+
+@pytest.mark.parametrize("members", [50, 200], ids=["50", "200"])
+def test_benchmark_automodule(doc_folder, mocker, members):
+    """Parse all the module members at once."""
+    _create_module(os.path.join(doc_folder, "example"), members)
+
+    with open(os.path.join(doc_folder, "index.rst"), "w") as f:
+        f.write(".. js:automodule:: example\n    :members:\n")
+
+    durations = []
+    run = champollion.directive.js_module.AutoModuleDirective.run
+
+    def _run(self):
+        """Record time spent in the directive."""
+        start_time = time.time()
+        result = run(self)
+        durations.append(time.time() - start_time)
+        return result
+
+    mocker.patch.object(
+        champollion.directive.js_module.AutoModuleDirective, "run", _run
+    )
+    nested_parse = mocker.spy(
+        docutils.parsers.rst.states.RSTState, "nested_parse"
+    )
+
+    with cd(doc_folder):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build"])
+
+    print(
+        "\nautomodule with {0} members: {1:.4f}s, {2} nested parses".format(
+            members * 2, sum(durations), nested_parse.call_count
+        )
+    )
+
+    # One parse for the module description and the members, and one for
+    # the content of each member directive.
+    assert nested_parse.call_count == members * 2 + 2
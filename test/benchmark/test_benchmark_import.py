@@ -0,0 +1,30 @@
+# :coding: utf-8
+
+"""Benchmark of the import of the parser.
+
+The benchmarks are not run with the unit tests by default::
+
+    pytest test/benchmark
+
+"""
+
+import json
+import subprocess
+import sys
+
+
+def test_benchmark_import_parser():
+    """Import parser quickly without importing Sphinx or docutils."""
+    script = (
+        "import json, time\n"
+        "start_time = time.time()\n"
+        "import champollion.parser\n"
+        "print(json.dumps(time.time() - start_time))\n"
+    )
+
+    output = subprocess.check_output([sys.executable, "-c", script])
+    duration = json.loads(output.decode("utf-8"))
+
+    print("\nimport champollion.parser: {0:.4f}s".format(duration))
+
+    assert duration < 0.5
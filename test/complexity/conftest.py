@@ -0,0 +1,20 @@
+# :coding: utf-8
+
+import shutil
+import tempfile
+
+import pytest
+
+
+@pytest.fixture()
+def temporary_directory(request):
+    """Return a temporary directory path."""
+    path = tempfile.mkdtemp()
+
+    def cleanup():
+        """Remove temporary directory."""
+        shutil.rmtree(path)
+
+    request.addfinalizer(cleanup)
+
+    return path
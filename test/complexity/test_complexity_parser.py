@@ -0,0 +1,220 @@
+# :coding: utf-8
+
+"""Check that the parser entry points scale at most linearithmically.
+
+Each entry point is run with doubling input sizes and the growth exponent
+is fitted from the durations recorded, so that a quadratic behaviour
+introduced in the parser is detected before release.
+
+As the durations depend on the machine, these tests are not run with the
+unit tests by default::
+
+    pytest test/complexity
+
+"""
+
+import math
+import os
+import timeit
+
+import pytest
+
+import champollion.parser
+import champollion.parser.helper
+import champollion.parser.js_class
+import champollion.parser.js_data
+import champollion.parser.js_file
+import champollion.parser.js_function
+from champollion.parser.environment import IncrementalEnvironment
+
+
+#: Input sizes used to fit the growth exponent.
+SIZES = [200, 400, 800, 1600]
+
+#: Maximum growth exponent accepted. A linearithmic growth is fitted with an
+#: exponent of about 1.16 for these sizes, and a margin is kept for the
+#: measurement noise.
+MAX_EXPONENT = 1.4
+
+#: Number of times each entry point is run per size.
+REPEAT = 3
+
+
+def fit_exponent(sizes, durations):
+    """Return growth exponent fitted from *sizes* and *durations*.
+
+    The exponent is the slope of the least squares line fitted in log-log
+    space.
+
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(duration, 1e-6)) for duration in durations]
+
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+
+    return (
+        sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) /
+        sum((x - x_mean) ** 2 for x in xs)
+    )
+
+
+def measure(function, inputs):
+    """Return minimum duration of *function* called with each of *inputs*.
+    """
+    durations = []
+
+    for arguments in inputs:
+        durations.append(
+            min(
+                timeit.repeat(
+                    lambda: function(*arguments), number=1, repeat=REPEAT
+                )
+            )
+        )
+
+    return durations
+
+
+def create_content(size):
+    """Return content with *size* classes, functions and data."""
+    return "".join(
+        "/**\n"
+        " * A class.\n"
+        " */\n"
+        "export class AwesomeClass{0} extends MotherClass {{\n"
+        "    constructor() {{\n"
+        "        // An attribute.\n"
+        "        this.attribute = {{key: 'value'}};\n"
+        "    }}\n"
+        "\n"
+        "    /** A method. */\n"
+        "    method(arg) {{\n"
+        "        if (arg) {{ return {{value: arg}}; }}\n"
+        "    }}\n"
+        "}}\n"
+        "\n"
+        "/** A function. */\n"
+        "export function doSomething{0}(arg) {{\n"
+        "    return arg;\n"
+        "}}\n"
+        "\n"
+        "/** A data. */\n"
+        "export const DATA_{0} = {{\n"
+        "    key: 'value', /* A comment. */\n"
+        "}};\n"
+        "\n"
+        "import {{element{0}}} from './module{0}';\n"
+        "export {{element{0}}};\n"
+        "\n".format(index)
+        for index in range(size)
+    )
+
+
+def create_package(path, size):
+    """Create javascript package with *size* modules in *path*.
+
+    Return path to the package.
+
+    """
+    path = os.path.join(path, "example_{0}".format(size))
+
+    for index in range(size):
+        folder = os.path.join(path, "module_{0}".format(index // 10))
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+            with open(os.path.join(folder, "index.js"), "w") as f:
+                f.write("export * from './file_{0}';\n".format(index))
+
+        with open(
+            os.path.join(folder, "file_{0}.js".format(index)), "w"
+        ) as f:
+            f.write(create_content(1))
+
+    return path
+
+
+def assert_linearithmic(name, durations):
+    """Ensure that *durations* grows at most linearithmically."""
+    exponent = fit_exponent(SIZES, durations)
+
+    print(
+        "\n{0}: exponent {1:.2f} ({2})".format(
+            name, exponent,
+            ", ".join("{0:.4f}s".format(duration) for duration in durations)
+        )
+    )
+
+    assert exponent < MAX_EXPONENT, (
+        "{0} grows with an exponent of {1:.2f}".format(name, exponent)
+    )
+
+
+def test_fit_exponent():
+    """Fit growth exponent from durations."""
+    assert round(fit_exponent(SIZES, SIZES), 2) == 1
+    assert round(
+        fit_exponent(SIZES, [size ** 2 for size in SIZES]), 2
+    ) == 2
+
+
+@pytest.mark.parametrize("function", [
+    lambda content: champollion.parser.helper.filter_comments(content),
+    lambda content: champollion.parser.helper.collapse_all(
+        content, filter_comment=True
+    ),
+    lambda content: [
+        champollion.parser.helper.get_docstring(line_number, lines)
+        for lines in [content.split("\n")]
+        for line_number in range(1, len(lines) + 1)
+    ],
+    lambda content: champollion.parser.helper.fetch_docstrings(
+        content.split("\n")
+    ),
+    lambda content: champollion.parser.js_class.fetch_environment(
+        content, "example"
+    ),
+    lambda content: champollion.parser.js_function.fetch_environment(
+        content, "example"
+    ),
+    lambda content: champollion.parser.js_data.fetch_environment(
+        content, "example"
+    ),
+    lambda content: champollion.parser.js_file.fetch_environment_from_content(
+        content, "/path/to/example.js", "example.js", "example"
+    ),
+], ids=[
+    "filter_comments",
+    "collapse_all",
+    "get_docstring",
+    "fetch_docstrings",
+    "js_class.fetch_environment",
+    "js_function.fetch_environment",
+    "js_data.fetch_environment",
+    "js_file.fetch_environment",
+])
+def test_complexity_content(request, function):
+    """Parse content in linearithmic time."""
+    durations = measure(
+        function, [(create_content(size),) for size in SIZES]
+    )
+    assert_linearithmic(request.node.callspec.id, durations)
+
+
+@pytest.mark.parametrize("function", [
+    lambda path: champollion.parser.fetch_environment(path),
+    lambda path: champollion.parser.fetch_environment(path, lazy=True),
+    lambda path: IncrementalEnvironment(path),
+], ids=[
+    "parser.fetch_environment",
+    "parser.fetch_environment-lazy",
+    "IncrementalEnvironment",
+])
+def test_complexity_package(request, temporary_directory, function):
+    """Parse package in linearithmic time."""
+    durations = measure(
+        function, [
+            (create_package(temporary_directory, size),) for size in SIZES
+        ]
+    )
+    assert_linearithmic(request.node.callspec.id, durations)
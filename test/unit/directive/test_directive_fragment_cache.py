@@ -0,0 +1,289 @@
+# :coding: utf-8
+
+import os
+
+import docutils.nodes
+import pytest
+from sphinx.cmd.build import main as sphinx_main
+from sphinx.util.osutil import cd
+
+import utility
+import champollion.directive.fragment_cache
+import champollion.directive.js_module
+
+
+@pytest.fixture()
+def doc_folder_with_cache(doc_folder_with_class_members):
+    """Return Doc folder with fragment cache enabled."""
+    js_source = os.path.join(doc_folder_with_class_members, "example")
+
+    with open(os.path.join(js_source, "index.js"), "w") as f:
+        f.write(
+            "/**\n"
+            " * A cool module.\n"
+            " */\n"
+            "\n"
+            "/** A class. */\n"
+            "export class AwesomeClass {\n"
+            "    /** A method. */\n"
+            "    run(arg) {}\n"
+            "}\n"
+            "\n"
+            "/** A data. */\n"
+            "export const DATA = 42;\n"
+        )
+
+    index_file = os.path.join(doc_folder_with_class_members, "index.rst")
+    with open(index_file, "w") as f:
+        f.write(
+            ".. js:automodule:: example\n"
+            "    :members:\n"
+        )
+
+    conf_file = os.path.join(doc_folder_with_class_members, "conf.py")
+    with open(conf_file, "a") as f:
+        f.write("\njs_fragment_cache = True\n")
+
+    return doc_folder_with_class_members
+
+
+def test_compute_key():
+    """Return same key for same elements."""
+    key = champollion.directive.fragment_cache.compute_key(
+        "autoclass", {"id": "example.AwesomeClass", "line_number": 2}
+    )
+
+    assert key == champollion.directive.fragment_cache.compute_key(
+        "autoclass", {"line_number": 2, "id": "example.AwesomeClass"}
+    )
+    assert key != champollion.directive.fragment_cache.compute_key(
+        "autoclass", {"id": "example.AwesomeClass", "line_number": 3}
+    )
+
+
+def test_fetch_digest(mocker):
+    """Compute key from elements once per identifier."""
+    app = mocker.Mock(js_dependency_digests={})
+    generator = mocker.Mock(return_value=[{"id": "example"}])
+
+    key = champollion.directive.fragment_cache.fetch_digest(
+        app, ("module", "example"), generator
+    )
+    assert key == champollion.directive.fragment_cache.compute_key(
+        [{"id": "example"}]
+    )
+
+    assert key == champollion.directive.fragment_cache.fetch_digest(
+        app, ("module", "example"), generator
+    )
+    assert generator.call_count == 1
+
+
+def test_fetch_dependency_digest(mocker):
+    """Serialize each file environment once per build."""
+    environment = {
+        "module": {
+            module_id: {"id": module_id, "file_id": module_id + ".js"}
+            for module_id in ["a", "b", "c"]
+        },
+        "file": {
+            module_id + ".js": {
+                "content": "A large content.",
+                "import": {
+                    "element": {"module": "c"}
+                } if module_id != "c" else {},
+                "export": {},
+            }
+            for module_id in ["a", "b", "c"]
+        },
+    }
+
+    app = mocker.Mock(js_dependency_digests={})
+    app.config.js_environment = environment
+
+    compute_key = mocker.spy(
+        champollion.directive.fragment_cache, "compute_key"
+    )
+
+    key_a = champollion.directive.js_module._fetch_dependency_digest(
+        app, "a"
+    )
+    key_b = champollion.directive.js_module._fetch_dependency_digest(
+        app, "b"
+    )
+    assert key_a != key_b
+
+    file_calls = [
+        call for call in compute_key.call_args_list
+        if call[0][0] is environment["file"]["c.js"]
+    ]
+    assert len(file_calls) == 1
+
+    # The digest changes with the content of a dependency.
+    environment["file"]["c.js"]["content"] = "Another content."
+    app.js_dependency_digests = {}
+
+    assert key_a != champollion.directive.js_module._fetch_dependency_digest(
+        app, "a"
+    )
+
+
+def test_fragment_cache_record_domain_entries(mocker):
+    """Record only the domain entries set while rendering the nodes."""
+    domain_data = {
+        "objects": {"example.A": ("other", "class")},
+        "modules": {"example": ("other", "", "", False)},
+    }
+
+    env = mocker.Mock(spec=["docname", "domaindata", "ref_context"])
+    env.docname = "index"
+    env.domaindata = {"js": domain_data}
+    env.ref_context = {}
+
+    directive = mocker.Mock()
+    directive.state.document.ids = {}
+    directive.state.document.settings.env = env
+
+    def _generator():
+        """Render nodes and register objects in the domain."""
+        objects = env.domaindata["js"]["objects"]
+        objects["example.A"] = ("index", "class")
+        objects["example.B"] = ("index", "function")
+        return [docutils.nodes.paragraph(text="A paragraph.")]
+
+    cache = champollion.directive.fragment_cache.FragmentCache()
+    nodes = cache.fetch(directive, "key", _generator)
+
+    assert len(nodes) == 1
+    assert type(domain_data["objects"]) is dict
+    assert type(domain_data["modules"]) is dict
+    assert domain_data["objects"] == {
+        "example.A": ("index", "class"),
+        "example.B": ("index", "function"),
+    }
+
+    cache.update(env)
+    assert env.js_fragment_records is None
+
+    assert cache._fragments["key"]["objects"] == [
+        ("example.A", ("index", "class")),
+        ("example.B", ("index", "function")),
+    ]
+    assert cache._fragments["key"]["modules"] == []
+
+
+def test_fragment_cache(doc_folder_with_cache, mocker):
+    """Restore nodes rendered in a previous build."""
+    restore = mocker.spy(champollion.directive.fragment_cache, "_restore")
+
+    with cd(doc_folder_with_cache):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build"])
+
+    cache_path = os.path.join(
+        doc_folder_with_cache, "_build", ".doctrees", "champollion.pickle"
+    )
+    assert os.path.isfile(cache_path)
+    assert restore.call_count == 0
+
+    with open(
+        os.path.join(doc_folder_with_cache, "_build", "index.txt"), "rb"
+    ) as f:
+        expected = utility.sanitize_value(f.read())
+
+    with cd(doc_folder_with_cache):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build"])
+
+    assert restore.call_count == 1
+
+    with open(
+        os.path.join(doc_folder_with_cache, "_build", "index.txt"), "rb"
+    ) as f:
+        content = utility.sanitize_value(f.read())
+
+    assert "A method." in content
+    assert content == expected
+
+
+def test_fragment_cache_element_changed(doc_folder_with_cache, mocker):
+    """Render nodes again when an element is modified."""
+    with cd(doc_folder_with_cache):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build"])
+
+    restore = mocker.spy(champollion.directive.fragment_cache, "_restore")
+
+    js_file = os.path.join(doc_folder_with_cache, "example", "index.js")
+    with open(js_file, "a") as f:
+        f.write("\n/** Another data. */\nexport const OTHER_DATA = 43;\n")
+
+    with cd(doc_folder_with_cache):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build"])
+
+    # Only the class nodes are restored within the module rendered again.
+    assert restore.call_count == 1
+
+    with open(
+        os.path.join(doc_folder_with_cache, "_build", "index.txt"), "rb"
+    ) as f:
+        content = utility.sanitize_value(f.read())
+
+    assert "A method." in content
+    assert "Another data." in content
+
+
+def test_fragment_cache_parallel(doc_folder_with_cache):
+    """Record nodes rendered by parallel readers."""
+    with open(os.path.join(doc_folder_with_cache, "index.rst"), "w") as f:
+        f.write(".. toctree::\n\n")
+
+        for index in range(6):
+            f.write("    page_{0}\n".format(index))
+
+    for index in range(6):
+        with open(
+            os.path.join(doc_folder_with_cache, "page_{0}.rst".format(index)),
+            "w"
+        ) as f:
+            f.write("Page {0}\n======\n".format(index))
+
+    with open(os.path.join(doc_folder_with_cache, "page_0.rst"), "a") as f:
+        f.write(
+            "\n"
+            ".. js:automodule:: example\n"
+            "    :members:\n"
+        )
+
+    cache_path = os.path.join(
+        doc_folder_with_cache, "_build", ".doctrees", "champollion.pickle"
+    )
+
+    with cd(doc_folder_with_cache):
+        sphinx_main(
+            ["-c", ".", "-b", "text", "-E", "-j", "2", ".", "_build"]
+        )
+
+    cache = champollion.directive.fragment_cache.FragmentCache(cache_path)
+    cache.load()
+    assert len(cache) == 2
+
+    with open(
+        os.path.join(doc_folder_with_cache, "_build", "page_0.txt"), "rb"
+    ) as f:
+        expected = utility.sanitize_value(f.read())
+
+    with cd(doc_folder_with_cache):
+        sphinx_main(
+            ["-c", ".", "-b", "text", "-E", "-j", "2", ".", "_build"]
+        )
+
+    # Only the module nodes are restored, so the class nodes are dropped.
+    cache = champollion.directive.fragment_cache.FragmentCache(cache_path)
+    cache.load()
+    assert len(cache) == 1
+
+    with open(
+        os.path.join(doc_folder_with_cache, "_build", "page_0.txt"), "rb"
+    ) as f:
+        content = utility.sanitize_value(f.read())
+
+    assert "A method." in content
+    assert content == expected
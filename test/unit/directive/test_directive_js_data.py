@@ -340,3 +340,47 @@ def test_directive_autodata_with_value_skipped(doc_folder_with_code):
             "\n"
             "   \"import {VARIABLE_STRING} from \"example\"\"\n"
         )
+
+
+@pytest.mark.parametrize("options", [
+    "js_snapshot = True",
+    "js_lazy_parsing = True",
+], ids=[
+    "snapshot",
+    "lazy",
+])
+def test_directive_autodata_with_max_value_length(
+    doc_folder_with_code, options
+):
+    """Generate documentation from data variables with truncated values.
+    """
+    conf_file = os.path.join(doc_folder_with_code, "conf.py")
+    with open(conf_file, "r") as f:
+        configuration = f.read()
+
+    index_file = os.path.join(doc_folder_with_code, "index.rst")
+    with open(index_file, "w") as f:
+        f.write(".. js:autodata:: example.VARIABLE_OBJECT\n")
+
+    for max_value_length, expected in [
+        (10, "{ key1: v..."),
+        (None, "{ key1: value1, key2: value2, key3: value3, }"),
+    ]:
+        with open(conf_file, "w") as f:
+            f.write(
+                configuration + "\n" + options +
+                "\njs_value_max_length = {0!r}\n".format(max_value_length)
+            )
+
+        # Documents must be read again when the maximum length changes.
+        with cd(doc_folder_with_code):
+            sphinx_main(["-c", ".", "-b", "text", ".", "_build"])
+
+        with open(
+            os.path.join(doc_folder_with_code, "_build", "index.txt"), "rb"
+        ) as f:
+            content = utility.sanitize_value(f.read())
+
+        assert content.startswith(
+            "var example.VARIABLE_OBJECT = {0}\n".format(expected)
+        )
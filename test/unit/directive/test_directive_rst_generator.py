@@ -1492,3 +1492,27 @@ def test_get_rst_data_elements(options, expected):
     assert champollion.directive.rst_generator.get_rst_data_elements(
         environment, "test.module", "test/module", **options
     ) == expected
+
+
+def test_rst_element_cache(mocker):
+    """Generate elements once per key and environment."""
+    cache = champollion.directive.rst_generator.RstElementCache()
+    generator = mocker.Mock(side_effect=lambda: [StringList(["element"])])
+
+    environment = {"module": {}}
+    elements = cache.fetch(environment, ("test", False), generator)
+    assert elements == [StringList(["element"])]
+    assert cache.fetch(environment, ("test", False), generator) is elements
+    assert generator.call_count == 1
+
+    cache.fetch(environment, ("test", True), generator)
+    assert generator.call_count == 2
+
+    assert cache.fetch(
+        {"module": {}}, ("test", False), generator
+    ) is not elements
+    assert generator.call_count == 3
+
+    cache.clear()
+    cache.fetch(environment, ("test", False), generator)
+    assert generator.call_count == 4
@@ -7,6 +7,7 @@ from sphinx.cmd.build import main as sphinx_main
 from sphinx.util.osutil import cd
 
 import utility
+import champollion.directive.js_module
 
 
 @pytest.fixture()
@@ -192,6 +193,45 @@ def test_directive_automodule(doc_folder_with_code):
         )
 
 
+def test_directive_automodule_in_several_pages(doc_folder_with_code):
+    """Generate documentation from modules documented in several pages.
+    """
+    with open(os.path.join(doc_folder_with_code, "index.rst"), "w") as f:
+        f.write(
+            ".. toctree::\n"
+            "\n"
+            "    page_attribute\n"
+            "    page_class\n"
+            "\n"
+            ":js:mod:`example.test_class`\n"
+        )
+
+    for name in ("attribute", "class"):
+        with open(
+            os.path.join(doc_folder_with_code, "page_{0}.rst".format(name)),
+            "w"
+        ) as f:
+            f.write(
+                "Page\n"
+                "====\n"
+                "\n"
+                ".. js:automodule:: example.test_{0}\n".format(name)
+            )
+
+    with cd(doc_folder_with_code):
+        assert sphinx_main(
+            ["-c", ".", "-b", "html", "-E", ".", "_build"]
+        ) == 0
+
+    with open(os.path.join(doc_folder_with_code, "_build", "index.html")) as f:
+        assert "page_class.html#module-example.test_class" in f.read()
+
+    with open(
+        os.path.join(doc_folder_with_code, "_build", "page_class.html")
+    ) as f:
+        assert "A file with a great class." in f.read()
+
+
 def test_directive_automodule_with_members(doc_folder_with_code):
     """Generate documentation from modules with members.
     """
@@ -1677,3 +1717,240 @@ def test_directive_automodule_with_attribute_value_skipped(
             "\n"
             "      another attribute.\n"
         )
+
+
+def test_directive_automodule_with_lazy_parsing(doc_folder_with_code):
+    """Generate same documentation when files are parsed lazily.
+    """
+    index_file = os.path.join(doc_folder_with_code, "index.rst")
+    with open(index_file, "w") as f:
+        f.write(
+            ".. js:automodule:: example\n"
+            "    :members:\n"
+        )
+
+    with cd(doc_folder_with_code):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build"])
+
+    with open(
+        os.path.join(doc_folder_with_code, "_build", "index.txt"), "rb"
+    ) as f:
+        expected = utility.sanitize_value(f.read())
+
+    conf_file = os.path.join(doc_folder_with_code, "conf.py")
+    with open(conf_file, "a") as f:
+        f.write("\njs_lazy_parsing = True\n")
+
+    with cd(doc_folder_with_code):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build_lazy"])
+
+    with open(
+        os.path.join(doc_folder_with_code, "_build_lazy", "index.txt"), "rb"
+    ) as f:
+        content = utility.sanitize_value(f.read())
+
+    assert len(expected) > 0
+    assert content == expected
+
+
+def test_directive_automodule_with_memoized_members(
+    doc_folder_with_code, mocker
+):
+    """Generate module members once per module and options."""
+    index_file = os.path.join(doc_folder_with_code, "index.rst")
+    with open(index_file, "w") as f:
+        f.write(
+            ".. js:automodule:: example\n"
+            "    :members:\n"
+            "\n"
+            ".. js:automodule:: example\n"
+            "    :members:\n"
+            "\n"
+            ".. js:automodule:: example\n"
+            "    :members:\n"
+            "    :undoc-members:\n"
+        )
+
+    generate_rst_elements = mocker.spy(
+        champollion.directive.js_module.AutoModuleDirective,
+        "generate_rst_elements"
+    )
+
+    with cd(doc_folder_with_code):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build"])
+
+    module_ids = [
+        call[0][1]["id"] for call in generate_rst_elements.call_args_list
+    ]
+    assert module_ids.count("example") == 2
+
+    with open(
+        os.path.join(doc_folder_with_code, "_build", "index.txt"), "rb"
+    ) as f:
+        content = utility.sanitize_value(f.read())
+
+    assert content.count("A cool application.") == 3
+
+
+def test_directive_automodule_with_direct_rendering(doc_folder_with_code):
+    """Generate same documentation when members are rendered directly.
+    """
+    index_file = os.path.join(doc_folder_with_code, "index.rst")
+    with open(index_file, "w") as f:
+        f.write(
+            ".. js:automodule:: example\n"
+            "    :members:\n"
+            "    :undoc-members:\n"
+            "    :private-members:\n"
+        )
+
+    with cd(doc_folder_with_code):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build"])
+
+    with open(
+        os.path.join(doc_folder_with_code, "_build", "index.txt"), "rb"
+    ) as f:
+        expected = utility.sanitize_value(f.read())
+
+    conf_file = os.path.join(doc_folder_with_code, "conf.py")
+    with open(conf_file, "a") as f:
+        f.write("\njs_direct_rendering = True\n")
+
+    with cd(doc_folder_with_code):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build_direct"])
+
+    with open(
+        os.path.join(doc_folder_with_code, "_build_direct", "index.txt"), "rb"
+    ) as f:
+        content = utility.sanitize_value(f.read())
+
+    assert "import {" in expected
+    assert content == expected
+
+
+def test_directive_automodule_with_cyclic_exports(doc_folder):
+    """Generate documentation from cyclic re-exports only once.
+    """
+    js_source = os.path.join(doc_folder, "example")
+    os.makedirs(os.path.join(js_source, "other"))
+
+    with open(os.path.join(js_source, "index.js"), "w") as f:
+        f.write(
+            "/** A module. */\n"
+            "export * from './other';\n"
+            "\n"
+            "/** A data. */\n"
+            "export const DATA = 1;\n"
+        )
+
+    with open(os.path.join(js_source, "other", "index.js"), "w") as f:
+        f.write(
+            "/** Another module. */\n"
+            "export * from '..';\n"
+            "\n"
+            "/** Another data. */\n"
+            "export const OTHER_DATA = 2;\n"
+        )
+
+    index_file = os.path.join(doc_folder, "index.rst")
+    with open(index_file, "w") as f:
+        f.write(
+            ".. js:automodule:: example\n"
+            "    :members:\n"
+        )
+
+    with cd(doc_folder):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build"])
+
+    with open(os.path.join(doc_folder, "_build", "index.txt"), "rb") as f:
+        content = utility.sanitize_value(f.read())
+
+    assert content.count("Another data.") == 1
+    assert content.count("A data.") == 1
+
+
+def test_directive_automodule_parallel_with_environment_index(doc_folder):
+    """Generate documentation and source code pages from parallel readers.
+    """
+    js_source = os.path.join(doc_folder, "example")
+
+    with open(os.path.join(doc_folder, "conf.py"), "a") as f:
+        f.write("\njs_environment_index = True\n")
+
+    with open(os.path.join(doc_folder, "index.rst"), "w") as f:
+        f.write(".. toctree::\n\n")
+
+        for index in range(6):
+            f.write("    page_{0}\n".format(index))
+
+    for index in range(6):
+        module_path = os.path.join(js_source, "module_{0}".format(index))
+        os.makedirs(module_path)
+
+        with open(os.path.join(module_path, "index.js"), "w") as f:
+            f.write(
+                "/** A data. */\n"
+                "export const DATA_{0} = {0};\n".format(index)
+            )
+
+        with open(
+            os.path.join(doc_folder, "page_{0}.rst".format(index)), "w"
+        ) as f:
+            f.write(
+                "Page {0}\n"
+                "======\n"
+                "\n"
+                ".. js:automodule:: example.module_{0}\n"
+                "    :members:\n".format(index)
+            )
+
+    with cd(doc_folder):
+        sphinx_main(["-c", ".", "-b", "html", "-E", "-j", "2", ".", "_build"])
+
+    assert os.path.isfile(
+        os.path.join(
+            doc_folder, "_build", ".doctrees", "champollion-index.bin"
+        )
+    )
+
+    for index in range(6):
+        with open(
+            os.path.join(doc_folder, "_build", "page_{0}.html".format(index))
+        ) as f:
+            assert "DATA_{0}".format(index) in f.read()
+
+        with open(
+            os.path.join(
+                doc_folder, "_build", "_modules", "example",
+                "module_{0}.html".format(index)
+            )
+        ) as f:
+            assert "page_{0}.html#".format(index) in f.read()
+
+
+def test_directive_automodule_with_background_parsing(doc_folder_with_code):
+    """Generate same documentation with environment parsed in background.
+    """
+    index_file = os.path.join(doc_folder_with_code, "index.rst")
+    with open(index_file, "w") as f:
+        f.write(
+            ".. js:automodule:: example\n"
+            "    :members:\n"
+        )
+
+    with cd(doc_folder_with_code):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build"])
+
+    with open(os.path.join(doc_folder_with_code, "_build", "index.txt")) as f:
+        expected = f.read()
+
+    assert "A cool application." in expected
+
+    with open(os.path.join(doc_folder_with_code, "conf.py"), "a") as f:
+        f.write("\njs_background_parsing = True\n")
+
+    with cd(doc_folder_with_code):
+        sphinx_main(["-c", ".", "-b", "text", "-E", ".", "_build"])
+
+    with open(os.path.join(doc_folder_with_code, "_build", "index.txt")) as f:
+        assert f.read() == expected
@@ -1,10 +1,30 @@
 # :coding: utf-8
 
+import json
+import os
+import subprocess
+import sys
+
 import pytest
 
 import champollion.parser
 
 
+def test_import_without_sphinx():
+    """Import parser without importing Sphinx or docutils."""
+    script = (
+        "import json, sys\n"
+        "import champollion.parser\n"
+        "print(json.dumps(sorted(\n"
+        "    name for name in sys.modules\n"
+        "    if name.split('.')[0] in ['sphinx', 'docutils']\n"
+        ")))\n"
+    )
+
+    output = subprocess.check_output([sys.executable, "-c", script])
+    assert json.loads(output.decode("utf-8")) == []
+
+
 def test_get_environment_error():
     """Raise an error if the path is incorrect."""
     with pytest.raises(OSError):
@@ -25,3 +45,97 @@ def test_get_environment_empty(temporary_directory):
     assert champollion.parser.fetch_environment(
         temporary_directory
     ) == environment
+
+
+def test_get_environment_lazy(temporary_directory):
+    """Parse files only when their elements are accessed."""
+    path = os.path.join(temporary_directory, "example")
+    os.makedirs(os.path.join(path, "test"))
+
+    with open(os.path.join(path, "index.js"), "w") as f:
+        f.write(
+            "/** A class. */\n"
+            "export class AwesomeClass {\n"
+            "    /** A method. */\n"
+            "    run() {}\n"
+            "}\n"
+        )
+
+    with open(os.path.join(path, "test", "index.js"), "w") as f:
+        f.write("/** A function. */\nfunction doSomething() {}\n")
+
+    environment = champollion.parser.fetch_environment(path, lazy=True)
+    assert sorted(environment["module"].keys()) == [
+        "example", "example.test"
+    ]
+
+    file_environment = environment["file"]["example/index.js"]
+    test_file_environment = environment["file"]["example/test/index.js"]
+    assert not file_environment.parsed
+    assert not test_file_environment.parsed
+
+    assert "example.AwesomeClass.run" in environment["method"]
+    assert "example.AwesomeClass.missing" not in environment["method"]
+    assert file_environment.parsed
+    assert not test_file_environment.parsed
+
+    assert environment == champollion.parser.fetch_environment(path)
+    assert test_file_environment.parsed
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"lazy": True},
+    {"parse_workers": 2},
+    {"parse_workers": 2, "batch_size": 2},
+    {"parse_workers": 2, "stream_size": 0},
+], ids=[
+    "sequential",
+    "lazy",
+    "several-workers",
+    "batch-several-workers",
+    "stream-several-workers",
+])
+def test_get_environment_truncated(temporary_directory, mocker, options):
+    """Truncate values to maximum length within each parser process."""
+    # Parser processes started with 'spawn' do not inherit any module state
+    # from the main process.
+    if sys.version_info >= (3, 7):
+        import concurrent.futures
+        import functools
+        import multiprocessing
+
+        mocker.patch.object(
+            concurrent.futures, "ProcessPoolExecutor", functools.partial(
+                concurrent.futures.ProcessPoolExecutor,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        )
+
+    path = os.path.join(temporary_directory, "example")
+    os.makedirs(path)
+
+    for name in ("index.js", "other.js"):
+        with open(os.path.join(path, name), "w") as f:
+            f.write(
+                "/** A data. */\n"
+                "export const DATA = '{0}';\n"
+                "\n"
+                "/** A class. */\n"
+                "export class AwesomeClass {{\n"
+                "    /** An attribute. */\n"
+                "    static value = '{0}';\n"
+                "}}\n".format("a" * 200)
+            )
+
+    environment = champollion.parser.fetch_environment(
+        path, max_value_length=20, **options
+    )
+
+    for module_id in ("example", "example.other"):
+        assert environment["data"][module_id + ".DATA"]["value"] == (
+            "'" + "a" * 19 + "..."
+        )
+        assert environment["attribute"][
+            module_id + ".AwesomeClass.value"
+        ]["value"] == "'" + "a" * 19 + "..."
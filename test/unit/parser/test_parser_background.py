@@ -0,0 +1,126 @@
+# :coding: utf-8
+
+import os
+import pickle
+import threading
+
+import pytest
+
+import champollion.parser
+import champollion.parser.background
+
+
+@pytest.fixture()
+def js_package(temporary_directory):
+    """Return path to a javascript package with two modules."""
+    path = os.path.join(temporary_directory, "example")
+    os.makedirs(os.path.join(path, "other"))
+
+    for file_path, content in [
+        (("index.js",), "/** A data. */\nexport const DATA = 1;\n"),
+        (
+            ("other", "index.js"),
+            "/** A function. */\nexport function run() {}\n"
+        ),
+    ]:
+        with open(os.path.join(path, *file_path), "w") as f:
+            f.write(content)
+
+    return path
+
+
+def test_background_environment(js_package):
+    """Fetch same environment as the parser."""
+    environment = champollion.parser.background.BackgroundEnvironment(
+        js_package
+    )
+
+    assert environment.future.result() is environment._environment
+    assert environment.is_done() is True
+    assert environment == champollion.parser.fetch_environment(js_package)
+
+
+def test_background_environment_incorrect_path(temporary_directory):
+    """Fail to fetch environment from an incorrect path."""
+    with pytest.raises(OSError):
+        champollion.parser.background.BackgroundEnvironment(
+            os.path.join(temporary_directory, "unknown")
+        )
+
+
+def test_background_environment_wait(js_package, mocker):
+    """Look up identifiers as soon as their module is parsed."""
+    iter_environment = champollion.parser.iter_environment
+    event = threading.Event()
+
+    def _iter_environment(path, **options):
+        """Block after first module until event is set."""
+        for index, item in enumerate(iter_environment(path, **options)):
+            if index == 1:
+                event.wait(10)
+
+            yield item
+
+    mocker.patch.object(
+        champollion.parser.background, "iter_environment", _iter_environment
+    )
+
+    environment = champollion.parser.background.BackgroundEnvironment(
+        js_package
+    )
+
+    assert environment["data"]["example.DATA"]["value"] == "1"
+    assert "example" in environment["module"]
+    assert environment.is_done() is False
+
+    event.set()
+
+    assert "example.other.run" in environment["function"]
+    assert "example.unknown" not in environment["function"]
+    assert environment.is_done() is True
+
+    with pytest.raises(KeyError):
+        environment["function"]["example.unknown"]
+
+
+def test_background_environment_error(js_package, mocker):
+    """Raise exception raised while fetching the environment."""
+    mocker.patch.object(
+        champollion.parser.background, "iter_environment",
+        side_effect=ValueError("Oops")
+    )
+
+    environment = champollion.parser.background.BackgroundEnvironment(
+        js_package
+    )
+
+    with pytest.raises(ValueError):
+        environment["data"]["example.DATA"]
+
+    with pytest.raises(ValueError):
+        environment.future.result()
+
+
+def test_background_environment_callback(js_package):
+    """Call callbacks when the environment is fetched."""
+    results = []
+
+    environment = champollion.parser.background.BackgroundEnvironment(
+        js_package
+    )
+    environment.add_done_callback(results.append)
+    environment.wait()
+
+    environment.add_done_callback(results.append)
+    assert results == [environment, environment]
+
+
+def test_background_environment_pickle(js_package):
+    """Pickle entirely fetched environment."""
+    environment = champollion.parser.background.BackgroundEnvironment(
+        js_package
+    )
+
+    _environment = pickle.loads(pickle.dumps(environment))
+    assert _environment.is_done() is True
+    assert _environment == environment
@@ -0,0 +1,173 @@
+# :coding: utf-8
+
+import os
+
+import pytest
+
+import champollion.parser
+import champollion.parser.batch
+from champollion.parser.js_file import fetch_environment_from_content
+
+
+#: Contents of small files parsed within a batch.
+CONTENTS = [
+    (
+        "/**\n"
+        " * Constants.\n"
+        " */\n"
+        "\n"
+        "/** A data. */\n"
+        "export const DATA = {\n"
+        "    key: 'value',\n"
+        "};\n"
+    ),
+    (
+        "import {DATA as OTHER} from './constants';\n"
+        "import * from '../other';\n"
+        "\n"
+        "/** A class. */\n"
+        "export class Helper extends Base {\n"
+        "    /** A method. */\n"
+        "    run(a, b) {}\n"
+        "\n"
+        "    /** An attribute. */\n"
+        "    static value = 42;\n"
+        "}\n"
+    ),
+    (
+        "/** A function. */\n"
+        "function run(arg) {\n"
+        "    return arg;\n"
+        "}\n"
+        "\n"
+        "export const DATA = 'other';\n"
+        "export {run};\n"
+        "export * from './helper';\n"
+    ),
+]
+
+
+def _entries(contents):
+    """Return parser arguments for each content of *contents*."""
+    return [
+        (
+            content, "/path/to/example/module{0}.js".format(index),
+            "example/module{0}.js".format(index),
+            "example.module{0}".format(index)
+        )
+        for index, content in enumerate(contents)
+    ]
+
+
+def test_is_batchable():
+    """Indicate whether a content can be parsed within a batch."""
+    assert champollion.parser.batch.is_batchable("const a = 1;\n") is True
+    assert champollion.parser.batch.is_batchable("const a = 1;") is False
+    assert champollion.parser.batch.is_batchable("'\x00';\n") is False
+    assert champollion.parser.batch.is_batchable(None) is False
+    assert champollion.parser.batch.is_batchable(
+        "const a = 1;\n" * 1000
+    ) is False
+
+
+def test_fetch_environments_from_contents(mocker):
+    """Return same file environments as when files are parsed on their own.
+    """
+    parse = mocker.spy(
+        champollion.parser.batch, "fetch_environment_from_content"
+    )
+    entries = _entries(CONTENTS) + [
+        (None, "/path/to/missing.js", "missing.js", "missing")
+    ]
+
+    environments = (
+        champollion.parser.batch.fetch_environments_from_contents(entries)
+    )
+    assert parse.call_count == 0
+
+    assert environments == [
+        fetch_environment_from_content(*entry) for entry in entries[:-1]
+    ] + [None]
+
+    assert sorted(environments[0]["data"].keys()) == ["example.module0.DATA"]
+    assert environments[1]["class"]["example.module1.Helper"][
+        "line_number"
+    ] == 5
+    assert environments[1]["class"]["example.module1.Helper"]["method"][
+        "example.module1.Helper.run"
+    ]["line_number"] == 7
+    assert environments[2]["function"]["example.module2.run"] == {
+        "id": "example.module2.run",
+        "module_id": "example.module2",
+        "exported": True,
+        "default": False,
+        "name": "run",
+        "anonymous": False,
+        "generator": False,
+        "arguments": ["arg"],
+        "line_number": 2,
+        "description": "A function."
+    }
+
+
+@pytest.mark.parametrize("content", [
+    "const DATA = 1\n",
+    "export function broken(a, b\n",
+    "const broken = (a, b\n",
+    "run(\n",
+    "/* Unclosed comment\n",
+    "}\nconst DATA = {\n",
+    "export {\n",
+    "const DATA = 'value'",
+], ids=[
+    "data-without-semi-colon",
+    "function-without-parenthesis",
+    "arrow-function-without-parenthesis",
+    "call-without-parenthesis",
+    "unclosed-comment",
+    "unbalanced-braces",
+    "unclosed-export",
+    "without-new-line",
+])
+def test_fetch_environments_from_contents_spanning(content):
+    """Return same file environments when a statement is left opened."""
+    entries = _entries(CONTENTS[:2] + [content] + CONTENTS + [content])
+
+    assert champollion.parser.batch.fetch_environments_from_contents(
+        entries
+    ) == [fetch_environment_from_content(*entry) for entry in entries]
+
+
+def test_fetch_environments_from_contents_truncated():
+    """Return same file environments when values are truncated."""
+    entries = _entries(["const DATA = 'a long value'\n"] + CONTENTS)
+
+    assert champollion.parser.batch.fetch_environments_from_contents(
+        entries, max_value_length=5
+    ) == [
+        fetch_environment_from_content(*entry, max_value_length=5)
+        for entry in entries
+    ]
+
+
+@pytest.mark.parametrize("options", [
+    {"batch_size": 2},
+    {"batch_size": 10},
+    {"batch_size": 2, "parse_workers": 2},
+], ids=[
+    "small-batches",
+    "large-batch",
+    "several-workers",
+])
+def test_fetch_environment(temporary_directory, options):
+    """Return same environment when the files are parsed within batches."""
+    path = os.path.join(temporary_directory, "example")
+    os.makedirs(path)
+
+    for index, content in enumerate(CONTENTS * 2):
+        with open(os.path.join(path, "module{0}.js".format(index)), "w") as f:
+            f.write(content)
+
+    assert champollion.parser.fetch_environment(path, **options) == (
+        champollion.parser.fetch_environment(path)
+    )
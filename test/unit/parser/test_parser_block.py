@@ -0,0 +1,339 @@
+# :coding: utf-8
+
+import copy
+import io
+import os
+
+import pytest
+
+import champollion.parser
+import champollion.parser.block
+import champollion.parser.reader
+from champollion.parser.js_file import fetch_environment_from_content
+
+
+#: Content of a large file with several top-level blocks.
+CONTENT = (
+    "import {DATA as OTHER} from './constants';\n"
+    "import * from '../other';\n"
+    "\n"
+    "/** A data. */\n"
+    "export const DATA = {\n"
+    "    key: 'value',\n"
+    "\n"
+    "    other: 42,\n"
+    "};\n"
+    "\n"
+    "/**\n"
+    " * A class.\n"
+    " *\n"
+    " * With a description.\n"
+    " */\n"
+    "export class Helper extends Base {\n"
+    "    /** A method. */\n"
+    "    run(a, b) {}\n"
+    "\n"
+    "    /** An attribute. */\n"
+    "    static value = 42;\n"
+    "}\n"
+    "\n"
+    "/** A function. */\n"
+    "function run(arg) {\n"
+    "    return arg;\n"
+    "}\n"
+    "\n"
+    "export {run};\n"
+    "export * from './helper';\n"
+)
+
+#: Arguments of the file parsed.
+ARGUMENTS = ("/path/to/example/index.js", "example/index.js", "example")
+
+
+def test_split_blocks():
+    """Split content between top-level statements."""
+    blocks = champollion.parser.block.split_blocks(CONTENT)
+
+    assert [CONTENT[start:end].split("\n")[0] for start, end in blocks] == [
+        "import {DATA as OTHER} from './constants';",
+        "/** A data. */",
+        "/**",
+        "/** A function. */",
+        "export {run};",
+    ]
+    assert "".join(CONTENT[start:end] for start, end in blocks) == CONTENT
+
+
+def test_fetch_environment_from_blocks(mocker):
+    """Return same file environment as when the file is parsed at once."""
+    parse = mocker.spy(champollion.parser.block, "_parse_block")
+
+    environment, blocks = (
+        champollion.parser.block.fetch_environment_from_blocks(
+            CONTENT, *ARGUMENTS
+        )
+    )
+    assert environment == fetch_environment_from_content(CONTENT, *ARGUMENTS)
+    assert len(blocks) == 5
+    assert parse.call_count == 5
+
+    # Parse modified block only, and shift line numbers of following blocks.
+    content = CONTENT.replace(
+        "    return arg;\n", "    const result = arg;\n    return result;\n"
+    ).replace(
+        "/** A data. */\n", "/**\n * A data.\n */\n"
+    )
+
+    environment, blocks = (
+        champollion.parser.block.fetch_environment_from_blocks(
+            content, *ARGUMENTS, blocks=blocks
+        )
+    )
+    assert environment == fetch_environment_from_content(content, *ARGUMENTS)
+    assert len(blocks) == 5
+    assert parse.call_count == 7
+
+    assert environment["class"]["example.Helper"]["line_number"] == 18
+    assert environment["class"]["example.Helper"]["method"][
+        "example.Helper.run"
+    ]["line_number"] == 20
+    assert environment["export"]["example.WILDCARD_1"]["line_number"] == 33
+
+
+def test_fetch_environment_from_blocks_not_mutated():
+    """Do not mutate the elements of the blocks recorded."""
+    _, blocks = champollion.parser.block.fetch_environment_from_blocks(
+        CONTENT, *ARGUMENTS
+    )
+    expected = copy.deepcopy(blocks)
+    content = "\n\n" + CONTENT
+
+    environment, _ = champollion.parser.block.fetch_environment_from_blocks(
+        content, *ARGUMENTS, blocks=blocks
+    )
+    assert environment == fetch_environment_from_content(content, *ARGUMENTS)
+    assert environment["data"]["example.DATA"]["line_number"] == 7
+    assert blocks == expected
+
+
+#: Contents with an element left opened at the end of a block.
+OPENED_CONTENTS = [
+    "const DATA = 1\n\nexport const OTHER = 2;\n",
+    "const DATA = 1\n\nexport function other() {}\n",
+    "export function broken(a, b\n\nconst DATA = 1;\n",
+    "const broken = (a, b\n\n) => {};\n",
+    "call(\n\nfunction other() {});\n",
+    "export {\n\n    DATA\n};\n",
+    "import {\n\n    DATA\n} from './other';\n",
+    "const DATA = {\n\n    key: 'value'\n};\n",
+    "/* Comment\n\nfunction run() {} */\n",
+    "function run() {}\n\nrun = () => {};\n",
+    "const DATA = 'value'\n\n// Comment",
+]
+
+#: Identifiers of the contents with an element left opened.
+OPENED_CONTENT_IDS = [
+    "data-without-semi-colon",
+    "data-without-semi-colon-at-the-end",
+    "function-without-parenthesis",
+    "arrow-function-without-parenthesis",
+    "call-without-parenthesis",
+    "export-over-several-blocks",
+    "import-over-several-blocks",
+    "nested-element",
+    "comment",
+    "function-in-several-blocks",
+    "without-new-line",
+]
+
+
+@pytest.mark.parametrize("content", OPENED_CONTENTS, ids=OPENED_CONTENT_IDS)
+def test_fetch_environment_from_blocks_opened(content):
+    """Return same file environment when an element is left opened."""
+    for _content in [
+        CONTENT + "\n" + content,
+        CONTENT + "\n" + content + "\n" + CONTENT.replace("run", "execute")
+    ]:
+        environment, blocks = (
+            champollion.parser.block.fetch_environment_from_blocks(
+                _content, *ARGUMENTS
+            )
+        )
+        assert environment == fetch_environment_from_content(
+            _content, *ARGUMENTS
+        )
+
+        environment, _ = (
+            champollion.parser.block.fetch_environment_from_blocks(
+                _content, *ARGUMENTS, blocks=blocks
+            )
+        )
+        assert environment == fetch_environment_from_content(
+            _content, *ARGUMENTS
+        )
+
+
+def test_fetch_environment_from_blocks_truncated():
+    """Return same file environment when values are truncated."""
+    content = (
+        "const DATA = 'a long value'\n\n" + CONTENT +
+        "\nconst OTHER = 'a long value'\n\n" +
+        CONTENT.replace("run", "execute")
+    )
+
+    environment, blocks = (
+        champollion.parser.block.fetch_environment_from_blocks(
+            content, *ARGUMENTS, max_value_length=5
+        )
+    )
+    assert environment == fetch_environment_from_content(
+        content, *ARGUMENTS, max_value_length=5
+    )
+    assert environment["data"]["example.OTHER"]["value"] == "'a lo..."
+
+    # Blocks parsed with another maximum length are not reused.
+    environment, _ = (
+        champollion.parser.block.fetch_environment_from_blocks(
+            content, *ARGUMENTS, blocks=blocks
+        )
+    )
+    assert environment == fetch_environment_from_content(content, *ARGUMENTS)
+
+
+def test_fetch_environment_from_blocks_truncated_with_semicolon(
+    temporary_directory, mocker
+):
+    """Return data truncated on the line of the last semi-colon."""
+    content = (
+        "export const LIMIT = computeLimit(1000);\n"
+        "\n"
+        "export function run() {\n"
+        "    return LIMIT;\n"
+        "}\n"
+    )
+
+    expected = fetch_environment_from_content(
+        content, *ARGUMENTS, max_value_length=5
+    )
+    assert expected["data"]["example.LIMIT"]["value"] == "compu..."
+
+    environment, _ = champollion.parser.block.fetch_environment_from_blocks(
+        content, *ARGUMENTS, max_value_length=5
+    )
+    assert environment == expected
+
+    mocker.patch.object(champollion.parser.block, "CHUNK_SIZE", 1)
+
+    file_path = os.path.join(temporary_directory, "index.js")
+    with open(file_path, "w") as f:
+        f.write(content)
+
+    environment = champollion.parser.block.fetch_stream_environment(
+        file_path, *ARGUMENTS[1:], max_value_length=5
+    )
+    assert environment == champollion.parser.js_file.fetch_environment(
+        file_path, *ARGUMENTS[1:], max_value_length=5
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100, 10000], ids=[
+    "one-block-per-chunk",
+    "several-blocks-per-chunk",
+    "one-chunk",
+])
+@pytest.mark.parametrize("content", OPENED_CONTENTS, ids=OPENED_CONTENT_IDS)
+def test_fetch_stream_environment(
+    temporary_directory, mocker, content, chunk_size
+):
+    """Return same file environment when the file is read as a stream."""
+    mocker.patch.object(champollion.parser.block, "CHUNK_SIZE", chunk_size)
+
+    file_path = os.path.join(temporary_directory, "index.js")
+    with open(file_path, "w") as f:
+        f.write(
+            CONTENT + "\n" + content + "\n" +
+            CONTENT.replace("run", "execute")
+        )
+
+    read_file = mocker.spy(champollion.parser.js_file, "read_file")
+
+    environment = champollion.parser.block.fetch_stream_environment(
+        file_path, *ARGUMENTS[1:]
+    )
+    assert environment.parsed is True
+    assert read_file.call_count == 0
+
+    assert environment == champollion.parser.js_file.fetch_environment(
+        file_path, *ARGUMENTS[1:]
+    )
+
+
+def test_fetch_stream_environment_missing(temporary_directory):
+    """Return None if the file is not readable."""
+    assert champollion.parser.block.fetch_stream_environment(
+        os.path.join(temporary_directory, "missing.js"), *ARGUMENTS[1:]
+    ) is None
+
+
+def test_iter_elements_from_stream(mocker):
+    """Yield elements of each chunk before the next chunk is read."""
+    mocker.patch.object(champollion.parser.block, "CHUNK_SIZE", 1)
+    lines = []
+
+    def _stream():
+        """Yield lines of the content and record them."""
+        for line in io.StringIO(CONTENT):
+            lines.append(line)
+            yield line
+
+    for category, element in (
+        champollion.parser.block.iter_elements_from_stream(
+            _stream(), "example"
+        )
+    ):
+        if category == "class":
+            assert element["line_number"] == 16
+            assert len(lines) < CONTENT.count("\n")
+
+
+def test_fetch_stream_environment_peak_memory(temporary_directory, mocker):
+    """Only hold a chunk of the file in memory while it is parsed."""
+    tracemalloc = pytest.importorskip("tracemalloc")
+    mocker.patch.object(champollion.parser.block, "CHUNK_SIZE", 10000)
+
+    body = "".join(
+        "    const value{0} = compute(arg, {0});\n".format(index)
+        for index in range(100)
+    )
+
+    file_path = os.path.join(temporary_directory, "index.js")
+    with open(file_path, "w") as f:
+        for index in range(200):
+            f.write(
+                "/** A function. */\n"
+                "export function run{0}(arg) {{\n{1}}}\n\n".format(
+                    index, body
+                )
+            )
+
+    peaks = []
+
+    for fetch_environment in [
+        champollion.parser.block.fetch_stream_environment,
+        champollion.parser.js_file.fetch_environment,
+    ]:
+        tracemalloc.start()
+
+        try:
+            environment = fetch_environment(file_path, *ARGUMENTS[1:])
+            peaks.append(tracemalloc.get_traced_memory()[1])
+
+        finally:
+            tracemalloc.stop()
+
+        assert len(environment["function"]) == 200
+
+    # The whole file content is copied several times when parsed at once,
+    # whereas the stream only holds the elements and a chunk of the file.
+    assert peaks[0] < os.path.getsize(file_path) / 2
+    assert peaks[0] < peaks[1] / 4
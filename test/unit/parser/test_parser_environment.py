@@ -0,0 +1,238 @@
+# :coding: utf-8
+
+import os
+
+import pytest
+
+import champollion.parser
+import champollion.parser.environment
+import champollion.parser.reader
+
+
+@pytest.fixture()
+def js_package(temporary_directory):
+    """Return path to a small javascript package."""
+    path = os.path.join(temporary_directory, "example")
+    os.makedirs(os.path.join(path, "utils"))
+
+    with open(os.path.join(path, "index.js"), "w") as f:
+        f.write(
+            "/** A data. */\n"
+            "export const DATA = 42;\n"
+        )
+
+    with open(os.path.join(path, "utils", "helper.js"), "w") as f:
+        f.write(
+            "/** A class. */\n"
+            "export class Helper {\n"
+            "    /** A method. */\n"
+            "    run() {}\n"
+            "}\n"
+        )
+
+    return path
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"workers": 2},
+    {"workers": 2, "queue_size": 1},
+    {"batch_size": 2},
+    {"workers": 2, "batch_size": 2},
+    {"stream_size": 0},
+    {"workers": 2, "stream_size": 0},
+], ids=[
+    "sequential",
+    "several-workers",
+    "small-queue",
+    "batch",
+    "batch-several-workers",
+    "stream",
+    "stream-several-workers",
+])
+def test_parse_files(js_package, options):
+    """Yield module and file environments in the same order as the entries.
+    """
+    source_files = list(champollion.parser.reader.scan_files(js_package))
+    entries = champollion.parser.reader.read_files(source_files)
+    entries = list(entries) + [(
+        ("example/missing.js", "/path/to/missing.js", ["missing.js"], None),
+        None
+    )]
+
+    results = list(
+        champollion.parser.environment.parse_files(entries, **options)
+    )
+    assert [result[0]["id"] for result in results] == [
+        "example", "example.utils.helper", "example.missing"
+    ]
+    assert sorted(results[0][1]["data"].keys()) == ["example.DATA"]
+    assert sorted(results[1][1]["class"].keys()) == [
+        "example.utils.helper.Helper"
+    ]
+    assert results[2][1] is None
+
+
+def test_incremental_environment_error():
+    """Raise an error if the path is incorrect."""
+    with pytest.raises(OSError):
+        champollion.parser.IncrementalEnvironment("")
+
+
+def test_incremental_environment(js_package):
+    """Return same environment as the full parser."""
+    incremental = champollion.parser.IncrementalEnvironment(js_package)
+    assert incremental.environment == champollion.parser.fetch_environment(
+        js_package
+    )
+
+
+def test_incremental_environment_file_changed(js_package):
+    """Update the environment in place when a file is changed."""
+    incremental = champollion.parser.IncrementalEnvironment(js_package)
+    environment = incremental.environment
+    class_environment = environment["class"]
+
+    file_path = os.path.join(js_package, "utils", "helper.js")
+    with open(file_path, "w") as f:
+        f.write(
+            "/** A class. */\n"
+            "export class Helper {\n"
+            "    /** Another method. */\n"
+            "    start() {}\n"
+            "}\n"
+        )
+
+    changes = incremental.file_changed(file_path)
+    assert changes == {
+        "module": set(),
+        "file": {"example/utils/helper.js"},
+        "class": {"example.utils.helper.Helper"},
+        "method": {
+            "example.utils.helper.Helper.run",
+            "example.utils.helper.Helper.start"
+        },
+        "attribute": set(),
+        "function": set(),
+        "data": set()
+    }
+
+    assert incremental.environment is environment
+    assert environment["class"] is class_environment
+    assert environment == champollion.parser.fetch_environment(js_package)
+
+
+def test_incremental_environment_file_added_and_removed(js_package):
+    """Add and remove a file from the environment."""
+    incremental = champollion.parser.IncrementalEnvironment(js_package)
+
+    file_path = os.path.join(js_package, "utils", "other.js")
+    with open(file_path, "w") as f:
+        f.write("/** A function. */\nfunction doSomething() {}\n")
+
+    changes = incremental.file_added(file_path)
+    assert changes["module"] == {"example.utils.other"}
+    assert changes["file"] == {"example/utils/other.js"}
+    assert changes["function"] == {"example.utils.other.doSomething"}
+    assert incremental.environment == champollion.parser.fetch_environment(
+        js_package
+    )
+
+    os.remove(file_path)
+
+    changes = incremental.file_removed(file_path)
+    assert changes["module"] == {"example.utils.other"}
+    assert changes["file"] == {"example/utils/other.js"}
+    assert changes["function"] == {"example.utils.other.doSomething"}
+    assert incremental.environment == champollion.parser.fetch_environment(
+        js_package
+    )
+
+
+def test_incremental_environment_index_added(js_package):
+    """Update module identifiers of the folder when an index file is added.
+    """
+    incremental = champollion.parser.IncrementalEnvironment(js_package)
+
+    file_path = os.path.join(js_package, "utils", "index.js")
+    with open(file_path, "w") as f:
+        f.write("export * from './helper';\n")
+
+    changes = incremental.file_added(file_path)
+    assert changes["module"] == {"example.utils", "example.utils.helper"}
+    assert incremental.environment == champollion.parser.fetch_environment(
+        js_package
+    )
+
+
+def test_incremental_environment_ignored_file(js_package):
+    """Ignore files which are not part of the environment."""
+    incremental = champollion.parser.IncrementalEnvironment(js_package)
+
+    file_path = os.path.join(js_package, "utils", "README.md")
+    with open(file_path, "w") as f:
+        f.write("Nothing to see.\n")
+
+    changes = incremental.file_added(file_path)
+    assert not any(changes.values())
+
+
+def test_incremental_environment_poll(js_package):
+    """Detect added, changed and removed files by polling."""
+    incremental = champollion.parser.IncrementalEnvironment(js_package)
+    assert not any(incremental.poll().values())
+
+    os.remove(os.path.join(js_package, "utils", "helper.js"))
+
+    file_path = os.path.join(js_package, "index.js")
+    with open(file_path, "w") as f:
+        f.write("/** A data. */\nexport const DATA = 43;\n")
+    os.utime(file_path, (0, 0))
+
+    changes = incremental.poll()
+    assert changes["file"] == {
+        "example/index.js", "example/utils/helper.js"
+    }
+    assert changes["data"] == {"example.DATA"}
+    assert changes["class"] == {"example.utils.helper.Helper"}
+    assert incremental.environment == champollion.parser.fetch_environment(
+        js_package
+    )
+
+
+def test_lazy_environment_error():
+    """Raise an error if the path is incorrect."""
+    with pytest.raises(OSError):
+        champollion.parser.LazyEnvironment("")
+
+
+def test_lazy_environment(js_package, mocker):
+    """Resolve elements by listing only the required folders."""
+    os.makedirs(os.path.join(js_package, "unrelated"))
+    list_folder = mocker.spy(champollion.parser.environment, "list_folder")
+
+    environment = champollion.parser.LazyEnvironment(js_package)
+    assert list_folder.call_count == 0
+
+    assert "example.utils.helper.Helper" in environment["class"]
+    assert environment["method"]["example.utils.helper.Helper.run"][
+        "description"
+    ] == "A method."
+    assert sorted(call[0][0] for call in list_folder.call_args_list) == [
+        js_package, os.path.join(js_package, "utils")
+    ]
+
+    file_environment = environment["file"]["example/index.js"]
+    assert not file_environment.parsed
+
+    assert "example.utils.helper.Missing" not in environment["class"]
+    assert file_environment.parsed
+
+    assert "other.Helper" not in environment["class"]
+    assert "example.unrelated" not in environment["module"]
+
+
+def test_lazy_environment_iteration(js_package):
+    """Return same elements as the full parser when iterating."""
+    environment = champollion.parser.LazyEnvironment(js_package)
+    assert environment == champollion.parser.fetch_environment(js_package)
@@ -0,0 +1,149 @@
+# :coding: utf-8
+
+import json
+import os
+
+import pytest
+
+import champollion.parser
+import champollion.parser.graph
+
+
+@pytest.fixture()
+def environment(temporary_directory):
+    """Return environment with modules depending on each other."""
+    path = os.path.join(temporary_directory, "example")
+    os.makedirs(os.path.join(path, "utils"))
+    os.makedirs(os.path.join(path, "other"))
+
+    for file_path, content in [
+        (
+            ("index.js",),
+            "import React from 'react';\n"
+            "export * from './utils';\n"
+            "export {default as Other} from './other';\n"
+        ),
+        (
+            ("utils", "index.js"),
+            "import {AwesomeClass} from './helper';\n"
+            "export {AwesomeClass};\n"
+            "export const DATA = 42;\n"
+        ),
+        (
+            ("utils", "helper.js"),
+            "export class AwesomeClass {}\n"
+        ),
+        (
+            ("other", "index.js"),
+            "export default function doSomething() {}\n"
+        ),
+    ]:
+        with open(os.path.join(path, *file_path), "w") as f:
+            f.write(content)
+
+    return champollion.parser.fetch_environment(path)
+
+
+def test_module_graph(environment):
+    """Return forward and reverse dependencies between modules."""
+    graph = champollion.parser.graph.ModuleGraph(environment)
+
+    assert graph.modules == [
+        "example", "example.other", "example.utils", "example.utils.helper"
+    ]
+
+    assert graph.dependencies("example") == {"example.utils", "example.other"}
+    assert graph.dependencies("example.utils") == {"example.utils.helper"}
+    assert graph.dependencies("example.utils.helper") == set()
+    assert graph.dependencies("unknown") == set()
+
+    assert graph.dependents("example") == set()
+    assert graph.dependents("example.utils") == {"example"}
+    assert graph.dependents("example.utils.helper") == {"example.utils"}
+
+
+def test_module_graph_exporters(environment):
+    """Return modules exporting each element."""
+    graph = champollion.parser.graph.ModuleGraph(environment)
+
+    assert graph.exporters("example.utils.helper.AwesomeClass") == {
+        "example", "example.utils", "example.utils.helper"
+    }
+    assert graph.exporters("example.utils.DATA") == {
+        "example", "example.utils"
+    }
+    assert graph.exporters("example.other.doSomething") == {
+        "example", "example.other"
+    }
+    assert graph.exporters("unknown") == set()
+
+
+def test_module_graph_exporters_default_with_wildcard(temporary_directory):
+    """Return modules exporting a default element behind a wildcard."""
+    path = os.path.join(temporary_directory, "example")
+    os.makedirs(os.path.join(path, "a"))
+
+    with open(os.path.join(path, "index.js"), "w") as f:
+        f.write("export * from './a';\n")
+
+    with open(os.path.join(path, "a", "index.js"), "w") as f:
+        f.write(
+            "export default class Foo {}\n"
+            "export const BAR = 'bar';\n"
+        )
+
+    environment = champollion.parser.fetch_environment(path)
+    graph = champollion.parser.graph.ModuleGraph(environment)
+
+    assert graph.exporters("example.a.Foo") == {"example.a"}
+    assert graph.exporters("example.a.BAR") == {"example", "example.a"}
+
+
+def test_module_graph_affected_modules(environment):
+    """Return modules affected by a file change."""
+    graph = champollion.parser.graph.ModuleGraph(environment)
+
+    assert graph.affected_modules("example/utils/helper.js") == {
+        "example", "example.utils", "example.utils.helper"
+    }
+    assert graph.affected_modules("example/other/index.js") == {
+        "example", "example.other"
+    }
+    assert graph.affected_modules("unknown.js") == set()
+
+
+def test_module_graph_cyclic(temporary_directory):
+    """Return dependencies between modules depending on each other."""
+    path = os.path.join(temporary_directory, "example")
+    os.makedirs(os.path.join(path, "a"))
+
+    with open(os.path.join(path, "index.js"), "w") as f:
+        f.write("export * from './a';\nexport const B = 'b';\n")
+
+    with open(os.path.join(path, "a", "index.js"), "w") as f:
+        f.write("export * from '..';\nexport const A = 'a';\n")
+
+    environment = champollion.parser.fetch_environment(path)
+    graph = champollion.parser.graph.ModuleGraph(environment)
+
+    assert graph.exporters("example.A") == set()
+    assert graph.exporters("example.a.A") == {"example", "example.a"}
+    assert graph.exporters("example.B") == {"example", "example.a"}
+    assert graph.affected_modules("example/index.js") == {
+        "example", "example.a"
+    }
+
+
+def test_module_graph_adjacency(environment):
+    """Export graph as a compact adjacency structure."""
+    graph = champollion.parser.graph.ModuleGraph(environment)
+
+    adjacency = graph.to_adjacency()
+    assert adjacency == {
+        "modules": [
+            "example", "example.other", "example.utils",
+            "example.utils.helper"
+        ],
+        "dependencies": [[1, 2], [], [3], []]
+    }
+    assert json.loads(json.dumps(adjacency)) == adjacency
@@ -117,6 +117,44 @@ def test_get_docstrings(content_lines, line_number, expected):
     ) == expected
 
 
+def test_fetch_docstrings():
+    """Return all docstrings from content lines in one pass."""
+    content_lines = [
+        "/**",
+        " * A class.",
+        " *",
+        " * Detailed description.",
+        " */",
+        "class AwesomeClass {",
+        "    /** A method. */",
+        "    awesomeMethod() {}",
+        "",
+        "    /*",
+        "     * Incorrect docstring",
+        "     */",
+        "    anotherMethod() {}",
+        "",
+        "    /**",
+        "     * Separated docstring",
+        "     */",
+        "",
+        "    lastMethod() {}",
+        "}",
+    ]
+
+    docstrings = champollion.parser.helper.fetch_docstrings(content_lines)
+    assert docstrings == {
+        5: "A class.\n\nDetailed description.",
+        7: "A method.",
+        17: "Separated docstring",
+    }
+
+    for line_number in range(1, len(content_lines) + 1):
+        assert docstrings.get(line_number - 1) == (
+            champollion.parser.helper.get_docstring(line_number, content_lines)
+        )
+
+
 def test_filter_comments():
     """Remove all comments from content"""
     content = (
@@ -287,6 +325,47 @@ def test_filter_comments_without_multiline_comments():
     ) == expected
 
 
+@pytest.mark.parametrize(
+    ("content", "expected", "keep_content_size"),
+    [
+        (
+            "// first comment\n// second comment\nconst DATA = 1;\n",
+            "\n\nconst DATA = 1;\n",
+            False
+        ),
+        (
+            "// first comment\n// second comment\nconst DATA = 1;\n",
+            (
+                "                \n                 \n"
+                "const DATA = 1;\n"
+            ),
+            True
+        ),
+        (
+            "/* a // comment */ const DATA = 1;\n/* other */\n",
+            " const DATA = 1;\n\n",
+            False
+        ),
+        (
+            "// a /* comment\nconst DATA = 1; /* other */\n",
+            "\nconst DATA = 1; \n",
+            False
+        ),
+    ],
+    ids=[
+        "consecutive one line comments",
+        "consecutive one line comments keeping size",
+        "one line comment within multi-line comment",
+        "multi-line comment within one line comment",
+    ]
+)
+def test_filter_comments_nested(content, expected, keep_content_size):
+    """Remove comments found in one scan of the content."""
+    assert champollion.parser.helper.filter_comments(
+        content, keep_content_size=keep_content_size
+    ) == expected
+
+
 @pytest.mark.parametrize(
     ("content", "expected_content", "expected_collapsed_content"),
     [
@@ -400,3 +479,80 @@ def test_collapse_all(content, expected_content, expected_collapsed_content):
     assert champollion.parser.helper.collapse_all(content) == (
         expected_content, expected_collapsed_content
     )
+
+
+def test_get_line_number():
+    """Return line number of each position from new line offsets."""
+    content = "const A = 1;\n\nconst B = 2;\nconst C = 3;"
+    line_offsets = champollion.parser.helper.fetch_line_offsets(content)
+    assert line_offsets == [12, 13, 26]
+
+    for position in range(len(content) + 1):
+        assert champollion.parser.helper.get_line_number(
+            line_offsets, position
+        ) == content[:position].count("\n") + 1
+
+
+def test_collapse_all_blocks():
+    """Record position and line number of each collapsed element."""
+    content = (
+        "class AwesomeClass {\n"
+        "    method() {\n"
+        "        return {key: 'value'}; // comment {}\n"
+        "    }\n"
+        "}\n"
+    )
+
+    collapsed_content = champollion.parser.helper.collapse_all(
+        content, filter_comment=True
+    )[1]
+
+    assert collapsed_content.blocks == [
+        (51, 65, 3), (34, 86, 2), (19, 88, 1)
+    ]
+    assert 2 in collapsed_content
+    assert 4 not in collapsed_content
+    assert collapsed_content.span(3) == (51, 65)
+    assert collapsed_content[3] == "{key: 'value'}"
+    assert collapsed_content[1] == content[19:88]
+    assert sorted(collapsed_content) == [1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    ("value", "max_length", "expected"),
+    [
+        ("42", None, "42"),
+        ("  'value'  ", None, "'value'"),
+        (
+            "{\n    key: 'value',\n\n    other: [1, 2],\n}",
+            None,
+            "{ key: 'value', other: [1, 2], }"
+        ),
+        ("{\n    key: 'value',\n    other: 42\n}", 12, "{ key: 'valu..."),
+        ("{\n    key: 'value',\n}", 15, "{ key: 'value',..."),
+        ("'value'", 7, "'value'"),
+    ],
+    ids=[
+        "number",
+        "surrounding spaces",
+        "multiple lines",
+        "truncated",
+        "truncated before space",
+        "maximum length",
+    ]
+)
+def test_clean_value(value, max_length, expected):
+    """Clean up value for display."""
+    assert champollion.parser.helper.clean_value(
+        value, max_length=max_length
+    ) == expected
+
+
+def test_clean_value_large():
+    """Truncate large values without cleaning the remaining lines."""
+    value = "[\n" + "    'element',\n" * 100000 + "]"
+
+    assert champollion.parser.helper.clean_value(value, max_length=20) == (
+        "[ 'element', 'elemen..."
+    )
+    assert len(champollion.parser.helper.clean_value(value)) == 1100003
@@ -3,6 +3,7 @@
 import pytest
 
 import champollion.parser.js_class
+import champollion.parser.pattern
 
 
 @pytest.mark.parametrize(
@@ -412,7 +413,7 @@ def test_get_class_environment(content, expected):
 )
 def test_class_pattern(content, expected):
     """Match a class."""
-    match = champollion.parser.js_class._CLASS_PATTERN.search(content)
+    match = champollion.parser.pattern.CLASS_PATTERN.search(content)
     if expected is None:
         assert match is None
     else:
@@ -505,7 +506,7 @@ def test_class_pattern(content, expected):
 )
 def test_class_method_pattern(content, expected):
     """Match a class method."""
-    match = champollion.parser.js_class._CLASS_METHOD_PATTERN.search(
+    match = champollion.parser.pattern.CLASS_METHOD_PATTERN.search(
         content
     )
     if expected is None:
@@ -605,7 +606,7 @@ def test_class_method_pattern(content, expected):
 )
 def test_class_method_arrow_pattern(content, expected):
     """Match a class arrow-type method."""
-    match = champollion.parser.js_class._CLASS_METHOD_ARROW_PATTERN.search(
+    match = champollion.parser.pattern.CLASS_METHOD_ARROW_PATTERN.search(
         content
     )
     if expected is None:
@@ -680,7 +681,7 @@ def test_class_method_arrow_pattern(content, expected):
 )
 def test_class_attribute_pattern(content, expected):
     """Match a class attribute."""
-    match = champollion.parser.js_class._CLASS_ATTRIBUTE_PATTERN.search(
+    match = champollion.parser.pattern.CLASS_ATTRIBUTE_PATTERN.search(
         content
     )
     if expected is None:
@@ -3,6 +3,7 @@
 import pytest
 
 import champollion.parser.js_data
+import champollion.parser.pattern
 
 
 @pytest.mark.parametrize(
@@ -203,7 +204,7 @@ def test_get_data_environment(content, expected):
 )
 def test_data_pattern(content, expected):
     """Match an variable."""
-    match = champollion.parser.js_data._DATA_PATTERN.search(
+    match = champollion.parser.pattern.DATA_PATTERN.search(
         content
     )
     if expected is None:
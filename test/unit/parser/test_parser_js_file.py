@@ -808,3 +808,50 @@ def test_fetch_binding_environment(expression, expected):
     assert champollion.parser.js_file._fetch_binding_environment(
         expression, "test.module"
     ) == expected
+
+
+def test_get_lazy_file_environment(request):
+    """Return lazy environment parsed on first access."""
+    file_handle, path = tempfile.mkstemp(suffix=".js")
+    os.close(file_handle)
+
+    def cleanup():
+        """Remove temporary file."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    request.addfinalizer(cleanup)
+
+    with open(path, "w") as f:
+        f.write("/** A function. */\nfunction doSomething() {}\n")
+
+    environment = champollion.parser.js_file.fetch_environment(
+        path, "path/to/example.js", "test.module", lazy=True
+    )
+    assert isinstance(
+        environment, champollion.parser.js_file.LazyFileEnvironment
+    )
+    assert environment["id"] == "path/to/example.js"
+    assert environment["content"] == (
+        "/** A function. */\nfunction doSomething() {}\n"
+    )
+    assert not environment.parsed
+
+    assert environment == champollion.parser.js_file.fetch_environment(
+        path, "path/to/example.js", "test.module"
+    )
+    assert environment.parsed
+    assert sorted(environment["function"].keys()) == ["test.module.doSomething"]
+
+    assert environment == champollion.parser.js_file.fetch_environment(
+        path, "path/to/example.js", "test.module", lazy=True
+    )
+
+
+def test_get_lazy_file_environment_unreadable():
+    """Return None if the file is not readable."""
+    assert champollion.parser.js_file.fetch_environment(
+        "/path/to/missing.js", "path/to/missing.js", "test.module", lazy=True
+    ) is None
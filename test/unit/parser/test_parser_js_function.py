@@ -2,6 +2,7 @@
 
 import pytest
 import champollion.parser.js_function
+import champollion.parser.pattern
 
 
 @pytest.mark.parametrize(
@@ -322,7 +323,7 @@ def test_get_function_environment(content, expected):
 )
 def test_function_pattern(content, expected):
     """Match a function."""
-    match = champollion.parser.js_function._FUNCTION_PATTERN.search(content)
+    match = champollion.parser.pattern.FUNCTION_PATTERN.search(content)
     if expected is None:
         assert match is None
     else:
@@ -427,7 +428,7 @@ def test_function_pattern(content, expected):
 )
 def test_function_arrow_pattern(content, expected):
     """Match an arrow-type function."""
-    match = champollion.parser.js_function._FUNCTION_ARROW_PATTERN.search(
+    match = champollion.parser.pattern.FUNCTION_ARROW_PATTERN.search(
         content
     )
     if expected is None:
@@ -493,7 +494,7 @@ def test_function_arrow_pattern(content, expected):
 )
 def test_imported_function_pattern(content, expected):
     """Match an imported function."""
-    match = champollion.parser.js_function._IMPORTED_FUNCTION_PATTERN.search(
+    match = champollion.parser.pattern.IMPORTED_FUNCTION_PATTERN.search(
         content
     )
     if expected is None:
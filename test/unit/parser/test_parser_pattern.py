@@ -0,0 +1,97 @@
+# :coding: utf-8
+
+import io
+import re
+
+import pytest
+
+import champollion.parser.pattern
+import champollion.parser.block
+import champollion.parser.js_file
+
+
+@pytest.fixture()
+def instrumentation(request):
+    """Enable the pattern instrumentation for the test."""
+    champollion.parser.pattern.reset_statistics()
+    champollion.parser.pattern.enable_instrumentation()
+
+    def cleanup():
+        """Disable the pattern instrumentation."""
+        champollion.parser.pattern.disable_instrumentation()
+        champollion.parser.pattern.reset_statistics()
+
+    request.addfinalizer(cleanup)
+
+
+def test_registry():
+    """Return all compiled patterns."""
+    registry = champollion.parser.pattern.registry()
+    assert "CLASS_PATTERN" in registry.keys()
+    assert "PARTIAL_EXPRESSION_PATTERN" in registry.keys()
+
+    for compiled_pattern in registry.values():
+        assert isinstance(compiled_pattern, type(re.compile("")))
+
+
+def test_instrumentation(instrumentation):
+    """Record number of calls and time spent per pattern."""
+    assert champollion.parser.pattern.is_instrumented()
+
+    content = (
+        "/** A class. */\n"
+        "export class AwesomeClass {\n"
+        "    /** A method. */\n"
+        "    run() {}\n"
+        "}\n"
+    )
+
+    environment = champollion.parser.js_file.fetch_environment_from_content(
+        content, "/path/to/example.js", "example.js", "example"
+    )
+    assert sorted(environment["class"].keys()) == ["example.AwesomeClass"]
+
+    statistics = champollion.parser.pattern.statistics()
+    assert statistics["CLASS_PATTERN"]["calls"] == 1
+    assert statistics["CLASS_METHOD_PATTERN"]["calls"] == 1
+    assert statistics["ONE_LINE_DOCSTRING_PATTERN"]["calls"] > 1
+
+    for _statistics in statistics.values():
+        assert _statistics["time"] >= 0
+
+    champollion.parser.pattern.disable_instrumentation()
+    assert not champollion.parser.pattern.is_instrumented()
+    assert isinstance(
+        champollion.parser.pattern.CLASS_PATTERN, type(re.compile(""))
+    )
+
+    champollion.parser.js_file.fetch_environment_from_content(
+        content, "/path/to/example.js", "example.js", "example"
+    )
+    assert champollion.parser.pattern.statistics() == statistics
+
+
+def test_instrumentation_blocks(instrumentation, mocker):
+    """Record patterns used to split content into top-level blocks."""
+    mocker.patch.object(champollion.parser.block, "CHUNK_SIZE", 1)
+
+    content = (
+        "/** A data. */\n"
+        "export const DATA = 42;\n"
+        "\n"
+        "/** A function. */\n"
+        "export function run() {\n"
+        "    return DATA;\n"
+        "}\n"
+    )
+
+    elements = list(
+        champollion.parser.block.iter_elements_from_stream(
+            io.StringIO(content), "example"
+        )
+    )
+    assert len(elements) == 2
+
+    statistics = champollion.parser.pattern.statistics()
+    assert statistics["EMPTY_LINES_PATTERN"]["calls"] > 0
+    assert statistics["BRACE_PATTERN"]["calls"] > 0
@@ -0,0 +1,158 @@
+# :coding: utf-8
+
+import os
+
+import pytest
+
+import champollion.parser.reader
+
+
+@pytest.fixture()
+def js_package(temporary_directory):
+    """Return path to a javascript package with nested folders."""
+    path = os.path.join(temporary_directory, "example")
+
+    for folders in [("b",), ("a", "c"), (".hidden",)]:
+        os.makedirs(os.path.join(path, *folders))
+
+    for file_path, content in [
+        (("index.js",), "export * from './a';\n"),
+        (("README.md",), "Not a source file.\n"),
+        (("b", "index.js"), "export const B = 'b';\n"),
+        (("a", "index.js"), "export const A = 'a';\n"),
+        (("a", "helper.jsx"), "export const HELPER = 'helper';\n"),
+        (("a", "c", "index.js"), "export const C = 'c';\n"),
+        ((".hidden", "index.js"), "export const HIDDEN = 'hidden';\n"),
+    ]:
+        with open(os.path.join(path, *file_path), "w") as f:
+            f.write(content)
+
+    return path
+
+
+def test_list_folder(js_package):
+    """List source files with their signature and folders sorted by name."""
+    files, folder_names = champollion.parser.reader.list_folder(js_package)
+    assert folder_names == ["a", "b"]
+    assert files == [
+        (
+            "index.js", champollion.parser.reader.file_signature(
+                os.path.join(js_package, "index.js")
+            )
+        )
+    ]
+
+
+def test_list_folder_error():
+    """Return empty lists if the folder can not be listed."""
+    assert champollion.parser.reader.list_folder("/incorrect") == ([], [])
+
+
+def test_scan_files(js_package):
+    """Yield source files in a deterministic order."""
+    source_files = list(champollion.parser.reader.scan_files(js_package))
+
+    assert [source_file[0] for source_file in source_files] == [
+        "example/index.js",
+        "example/a/helper.jsx",
+        "example/a/index.js",
+        "example/a/c/index.js",
+        "example/b/index.js",
+    ]
+
+    for file_id, file_path, _, signature in source_files:
+        assert file_path == os.path.join(
+            os.path.dirname(js_package), *file_id.split("/")
+        )
+        assert signature == champollion.parser.reader.file_signature(
+            file_path
+        )
+
+    assert source_files[1][2] == ["helper.jsx", "index.js"]
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "posix_fadvise"), reason="requires os.posix_fadvise"
+)
+def test_read_file_advice(js_package, mocker):
+    """Advise the operating system that the file will be read entirely."""
+    posix_fadvise = mocker.spy(os, "posix_fadvise")
+
+    content = champollion.parser.reader.read_file(
+        os.path.join(js_package, "index.js")
+    )
+    assert content == "export * from './a';\n"
+    assert [call[0][3] for call in posix_fadvise.call_args_list] == [
+        os.POSIX_FADV_SEQUENTIAL, os.POSIX_FADV_WILLNEED
+    ]
+
+
+def test_file_signature(js_package):
+    """Return modification time and size of a file."""
+    file_path = os.path.join(js_package, "index.js")
+    os.utime(file_path, (0, 0))
+
+    assert champollion.parser.reader.file_signature(file_path) == (0, 21)
+    assert champollion.parser.reader.file_signature("/incorrect") is None
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"workers": 1},
+    {"workers": 4},
+    {"workers": 4, "queue_size": 1},
+], ids=[
+    "sequential",
+    "one-worker",
+    "several-workers",
+    "small-queue",
+])
+def test_read_files(js_package, options):
+    """Yield the content of each file in the same order as the source files.
+    """
+    source_files = list(champollion.parser.reader.scan_files(js_package))
+    source_files.append(
+        ("example/missing.js", os.path.join(js_package, "missing.js"))
+    )
+
+    results = list(
+        champollion.parser.reader.read_files(source_files, **options)
+    )
+    assert [result[0] for result in results] == source_files
+
+    contents = [result[1] for result in results]
+    assert contents[0] == "export * from './a';\n"
+    assert contents[-2] == "export const B = 'b';\n"
+    assert contents[-1] is None
+
+
+def test_read_files_queue_size(js_package, mocker):
+    """Do not read more files in advance than the queue size."""
+    source_files = list(champollion.parser.reader.scan_files(js_package))
+    read_file = mocker.spy(champollion.parser.reader, "read_file")
+
+    results = champollion.parser.reader.read_files(
+        iter(source_files), workers=2, queue_size=2
+    )
+
+    next(results)
+    assert read_file.call_count <= 2
+
+    assert len(list(results)) == len(source_files) - 1
+    assert read_file.call_count == len(source_files)
+
+
+def test_fetch_environment_with_workers(js_package):
+    """Return same environment whether files are read concurrently or not."""
+    environment = champollion.parser.fetch_environment(js_package)
+
+    assert champollion.parser.fetch_environment(
+        js_package, workers=4
+    ) == environment
+    assert champollion.parser.fetch_environment(
+        js_package, workers=2, parse_workers=2, queue_size=1
+    ) == environment
+    assert sorted(environment["data"].keys()) == [
+        "example.a.A", "example.a.c.C", "example.a.helper.HELPER",
+        "example.b.B"
+    ]
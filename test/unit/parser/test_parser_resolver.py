@@ -0,0 +1,139 @@
+# :coding: utf-8
+
+import os
+
+import pytest
+
+import champollion.parser
+import champollion.parser.resolver
+
+
+def _create_package(path, files):
+    """Create javascript package with *files* in *path*."""
+    for file_path, content in files:
+        folder = os.path.join(path, *file_path[:-1])
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+
+        with open(os.path.join(folder, file_path[-1]), "w") as f:
+            f.write(content)
+
+
+@pytest.fixture()
+def environment(temporary_directory):
+    """Return environment with re-export chains."""
+    path = os.path.join(temporary_directory, "example")
+
+    _create_package(path, [
+        (
+            ("index.js",),
+            "export {Foo as Bar} from './a';\n"
+            "export * from './b';\n"
+            "export {default as DefaultFunction} from './c';\n"
+            "export {Unknown} from './a';\n"
+            "export {Missing} from './missing';\n"
+        ),
+        (
+            ("a", "index.js"),
+            "export {Foo} from './foo';\n"
+        ),
+        (
+            ("a", "foo.js"),
+            "export class Foo {}\n"
+        ),
+        (
+            ("b", "index.js"),
+            "export const DATA = 42;\n"
+        ),
+        (
+            ("c", "index.js"),
+            "export default function doSomething() {}\n"
+        ),
+    ])
+
+    return champollion.parser.fetch_environment(path)
+
+
+def test_fetch_export_table(environment):
+    """Return resolved exported elements sorted by line number."""
+    resolver = champollion.parser.resolver.ExportResolver(environment)
+
+    assert resolver.fetch_export_table("example") == [
+        {
+            "line_number": 1,
+            "name": "Bar",
+            "module_id": "example.a",
+            "wildcard": False,
+            "category": "class",
+            "element_id": "example.a.foo.Foo"
+        },
+        {
+            "line_number": 2,
+            "name": "*",
+            "module_id": "example.b",
+            "wildcard": True,
+            "category": None,
+            "element_id": None
+        },
+        {
+            "line_number": 3,
+            "name": "DefaultFunction",
+            "module_id": "example.c",
+            "wildcard": False,
+            "category": "function",
+            "element_id": "example.c.doSomething"
+        }
+    ]
+
+    # The table is memoized.
+    assert (
+        resolver.fetch_export_table("example") is
+        resolver.fetch_export_table("example")
+    )
+
+
+def test_resolve(environment):
+    """Resolve element through re-export chains."""
+    resolver = champollion.parser.resolver.ExportResolver(environment)
+
+    assert resolver.resolve("example", "Bar") == (
+        "class", "example.a.foo.Foo"
+    )
+    assert resolver.resolve("example", "DATA") == (
+        "data", "example.b.DATA"
+    )
+    assert resolver.resolve("example", "Foo") is None
+    assert resolver.resolve("unknown", "Foo") is None
+
+
+def test_resolve_cyclic(temporary_directory):
+    """Resolve elements through cyclic re-exports."""
+    path = os.path.join(temporary_directory, "example")
+
+    _create_package(path, [
+        (
+            ("index.js",),
+            "export * from './a';\n"
+            "export {Loop} from './a';\n"
+            "export const B = 'b';\n"
+        ),
+        (
+            ("a", "index.js"),
+            "export * from '..';\n"
+            "export {Loop} from '..';\n"
+            "export const A = 'a';\n"
+        ),
+    ])
+
+    environment = champollion.parser.fetch_environment(path)
+    resolver = champollion.parser.resolver.ExportResolver(environment)
+
+    assert resolver.resolve("example.a", "B") == ("data", "example.B")
+    assert resolver.resolve("example", "A") == ("data", "example.a.A")
+    assert resolver.resolve("example", "Loop") is None
+    assert resolver.resolve("example.a", "Unknown") is None
+
+    assert [
+        element["module_id"] for element
+        in resolver.fetch_export_table("example")
+    ] == ["example.a"]
@@ -0,0 +1,297 @@
+# :coding: utf-8
+
+import os
+import time
+
+import pytest
+
+import champollion.parser
+import champollion.parser.block
+import champollion.parser.environment
+import champollion.parser.snapshot
+
+
+@pytest.fixture()
+def js_package(temporary_directory):
+    """Return path to a javascript package with nested folders."""
+    path = os.path.join(temporary_directory, "example")
+    os.makedirs(os.path.join(path, "a"))
+
+    for file_path, content in [
+        (("index.js",), "export * from './a';\n"),
+        (("a", "index.js"), "/** A data. */\nexport const A = 'a';\n"),
+        (("a", "helper.js"), "export const HELPER = 'helper';\n"),
+    ]:
+        with open(os.path.join(path, *file_path), "w") as f:
+            f.write(content)
+
+    # Folders modified too recently are always listed again.
+    for folder in [path, os.path.join(path, "a")]:
+        _set_past_modification_time(folder)
+
+    return path
+
+
+def _set_past_modification_time(path, offset=0):
+    """Set modification time of *path* one minute in the past."""
+    modification_time = int(time.time()) - 60 + offset
+    os.utime(path, (modification_time, modification_time))
+
+
+def _modify(file_path, content):
+    """Modify *file_path* in place without modifying its folder."""
+    folder_stat = os.stat(os.path.dirname(file_path))
+    file_stat = os.stat(file_path)
+
+    with open(file_path, "w") as f:
+        f.write(content)
+
+    os.utime(file_path, (file_stat.st_atime, file_stat.st_mtime + 10))
+    os.utime(
+        os.path.dirname(file_path),
+        (folder_stat.st_atime, folder_stat.st_mtime)
+    )
+
+
+def test_list_folder(js_package, mocker):
+    """Reuse listing of folders which have not been modified."""
+    list_folder = mocker.spy(champollion.parser.snapshot, "list_folder")
+    snapshot = champollion.parser.snapshot.DirectorySnapshot()
+
+    expected = champollion.parser.reader.list_folder(js_package)
+    assert snapshot.list_folder(js_package) == expected
+    assert list_folder.call_count == 1
+
+    assert snapshot.list_folder(js_package) == expected
+    assert list_folder.call_count == 1
+
+    assert snapshot.list_folder(js_package, rescan=True) == expected
+    assert list_folder.call_count == 2
+
+    # Adding a file modifies the folder.
+    with open(os.path.join(js_package, "other.js"), "w") as f:
+        f.write("export const OTHER = 'other';\n")
+    _set_past_modification_time(js_package, offset=10)
+
+    files, _ = snapshot.list_folder(js_package)
+    assert [file_name for file_name, _ in files] == ["index.js", "other.js"]
+    assert list_folder.call_count == 3
+
+
+def test_scan_files(js_package):
+    """Yield same source files as the reader."""
+    snapshot = champollion.parser.snapshot.DirectorySnapshot()
+
+    expected = list(champollion.parser.reader.scan_files(js_package))
+    assert list(snapshot.scan_files(js_package)) == expected
+    assert list(snapshot.scan_files(js_package)) == expected
+
+
+def test_fetch_environment(js_package, temporary_directory, mocker):
+    """Reuse file environments of files which have not been modified."""
+    path = os.path.join(temporary_directory, "snapshot.pickle")
+    parse = mocker.spy(
+        champollion.parser.environment, "fetch_environment_from_content"
+    )
+
+    snapshot = champollion.parser.snapshot.DirectorySnapshot(path)
+    snapshot.load()
+
+    expected = champollion.parser.fetch_environment(js_package)
+    assert parse.call_count == 3
+
+    environment = champollion.parser.fetch_environment(
+        js_package, snapshot=snapshot
+    )
+    assert environment == expected
+    assert parse.call_count == 6
+
+    snapshot.save()
+    assert os.path.isfile(path)
+
+    snapshot = champollion.parser.snapshot.DirectorySnapshot(path)
+    snapshot.load()
+
+    environment = champollion.parser.fetch_environment(
+        js_package, snapshot=snapshot
+    )
+    assert environment == expected
+    assert parse.call_count == 6
+
+    # A file modified in place is only detected when folders are scanned
+    # again.
+    _modify(
+        os.path.join(js_package, "a", "helper.js"),
+        "export const HELPER = 'modified';\n"
+    )
+
+    environment = champollion.parser.fetch_environment(
+        js_package, snapshot=snapshot
+    )
+    assert environment["data"]["example.a.helper.HELPER"]["value"] == (
+        "'helper'"
+    )
+    assert parse.call_count == 6
+
+    environment = champollion.parser.fetch_environment(
+        js_package, snapshot=snapshot, rescan=True
+    )
+    assert environment["data"]["example.a.helper.HELPER"]["value"] == (
+        "'modified'"
+    )
+    assert parse.call_count == 7
+
+
+def test_fetch_environment_with_workers(js_package, mocker):
+    """Reuse file environments when files are read concurrently."""
+    read_file = mocker.spy(champollion.parser.reader, "read_file")
+    snapshot = champollion.parser.snapshot.DirectorySnapshot()
+
+    expected = champollion.parser.fetch_environment(
+        js_package, snapshot=snapshot, workers=2
+    )
+    assert read_file.call_count == 3
+
+    environment = champollion.parser.fetch_environment(
+        js_package, snapshot=snapshot, workers=2
+    )
+    assert environment == expected
+    assert read_file.call_count == 3
+
+
+def test_fetch_environment_per_block(js_package, temporary_directory, mocker):
+    """Only parse blocks which have been modified within large files."""
+    mocker.patch.object(champollion.parser.block, "MIN_FILE_SIZE", 100)
+    parse = mocker.spy(champollion.parser.block, "_parse_block")
+
+    file_path = os.path.join(js_package, "a", "helper.js")
+    content = (
+        "/** A data. */\n"
+        "export const HELPER = 'helper';\n"
+        "\n"
+        "/** A function. */\n"
+        "export function run(arg) {\n"
+        "    return arg;\n"
+        "}\n"
+        "\n"
+        "/** A class. */\n"
+        "export class Helper {}\n"
+    )
+    _modify(file_path, content)
+
+    path = os.path.join(temporary_directory, "snapshot.pickle")
+    snapshot = champollion.parser.snapshot.DirectorySnapshot(path)
+    snapshot.load()
+
+    environment = champollion.parser.fetch_environment(
+        js_package, snapshot=snapshot
+    )
+    assert environment == champollion.parser.fetch_environment(js_package)
+    assert parse.call_count == 3
+
+    snapshot.save()
+    snapshot = champollion.parser.snapshot.DirectorySnapshot(path)
+    snapshot.load()
+
+    _modify(file_path, content.replace("return arg;", "return arg + 1;"))
+
+    environment = champollion.parser.fetch_environment(
+        js_package, snapshot=snapshot, rescan=True
+    )
+    assert environment == champollion.parser.fetch_environment(js_package)
+    assert parse.call_count == 4
+
+    _modify(file_path, "export const HELPER = 'modified';\n")
+
+    environment = champollion.parser.fetch_environment(
+        js_package, snapshot=snapshot, rescan=True
+    )
+    assert environment["data"]["example.a.helper.HELPER"]["value"] == (
+        "'modified'"
+    )
+    assert parse.call_count == 4
+    assert snapshot.fetch_blocks(file_path, "example.a.helper") is None
+
+
+def test_fetch_environment_truncated(js_package, temporary_directory):
+    """Ignore file environments recorded with another maximum value length.
+    """
+    path = os.path.join(temporary_directory, "snapshot.pickle")
+
+    snapshot = champollion.parser.snapshot.DirectorySnapshot(path)
+    champollion.parser.fetch_environment(js_package, snapshot=snapshot)
+    snapshot.save()
+
+    snapshot = champollion.parser.snapshot.DirectorySnapshot(
+        path, max_value_length=5
+    )
+    snapshot.load()
+    assert len(snapshot._files) == 0
+
+    environment = champollion.parser.fetch_environment(
+        js_package, snapshot=snapshot, max_value_length=5
+    )
+    assert environment["data"]["example.a.helper.HELPER"]["value"] == (
+        "'help..."
+    )
+    snapshot.save()
+
+    snapshot = champollion.parser.snapshot.DirectorySnapshot(
+        path, max_value_length=5
+    )
+    snapshot.load()
+    assert len(snapshot._files) == 3
+
+
+def test_save(js_package, temporary_directory):
+    """Drop folders and files which have not been scanned."""
+    path = os.path.join(temporary_directory, "snapshot.pickle")
+
+    snapshot = champollion.parser.snapshot.DirectorySnapshot(path)
+    champollion.parser.fetch_environment(js_package, snapshot=snapshot)
+    snapshot.save()
+
+    os.remove(os.path.join(js_package, "a", "helper.js"))
+    _set_past_modification_time(os.path.join(js_package, "a"), offset=10)
+
+    snapshot = champollion.parser.snapshot.DirectorySnapshot(path)
+    snapshot.load()
+    assert len(snapshot._files) == 3
+
+    champollion.parser.fetch_environment(js_package, snapshot=snapshot)
+    snapshot.save()
+
+    snapshot = champollion.parser.snapshot.DirectorySnapshot(path)
+    snapshot.load()
+
+    assert sorted(snapshot._files.keys()) == [
+        os.path.join(js_package, "a", "index.js"),
+        os.path.join(js_package, "index.js"),
+    ]
+
+
+def test_load_other_version(js_package, temporary_directory, mocker):
+    """Ignore snapshot recorded with another version."""
+    path = os.path.join(temporary_directory, "snapshot.pickle")
+
+    snapshot = champollion.parser.snapshot.DirectorySnapshot(path)
+    champollion.parser.fetch_environment(js_package, snapshot=snapshot)
+    snapshot.save()
+
+    mocker.patch.object(champollion.parser.snapshot, "__version__", "0.0.0")
+
+    snapshot = champollion.parser.snapshot.DirectorySnapshot(path)
+    snapshot.load()
+    assert snapshot._files == {}
+
+
+def test_list_folder_modified_recently(js_package, mocker):
+    """List folder again if it was modified right before being listed."""
+    list_folder = mocker.spy(champollion.parser.snapshot, "list_folder")
+    snapshot = champollion.parser.snapshot.DirectorySnapshot()
+
+    os.utime(js_package, None)
+
+    snapshot.list_folder(js_package)
+    snapshot.list_folder(js_package)
+    assert list_folder.call_count == 2
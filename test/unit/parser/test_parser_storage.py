@@ -0,0 +1,108 @@
+# :coding: utf-8
+
+import os
+import pickle
+
+import pytest
+
+import champollion.parser
+import champollion.parser.storage
+
+
+@pytest.fixture()
+def environment(temporary_directory):
+    """Return environment with a class, a function and a data."""
+    path = os.path.join(temporary_directory, "example")
+    os.makedirs(path)
+
+    with open(os.path.join(path, "index.js"), "w") as f:
+        f.write(
+            "/** A class. */\n"
+            "export class AwesomeClass {\n"
+            "    /** A method. */\n"
+            "    run(arg) {}\n"
+            "}\n"
+            "\n"
+            "/** A function. */\n"
+            "export function doSomething() {}\n"
+            "\n"
+            "/** A data. */\n"
+            "export const DATA = 42;\n"
+        )
+
+    return champollion.parser.fetch_environment(path)
+
+
+def test_environment_index(environment, temporary_directory):
+    """Read environment from index."""
+    path = os.path.join(temporary_directory, "index.bin")
+    champollion.parser.storage.write_index(environment, path)
+
+    index = champollion.parser.storage.EnvironmentIndex(path)
+    assert index == environment
+    assert sorted(index) == sorted(environment)
+
+    assert "example.AwesomeClass" in index["class"]
+    assert "example.Unknown" not in index["class"]
+    assert index["class"]["example.AwesomeClass"] == (
+        environment["class"]["example.AwesomeClass"]
+    )
+
+    with pytest.raises(KeyError):
+        index["unknown"]
+
+
+def test_environment_index_load_on_demand(
+    environment, temporary_directory, mocker
+):
+    """Unpickle elements once when first accessed."""
+    path = os.path.join(temporary_directory, "index.bin")
+    champollion.parser.storage.write_index(environment, path)
+
+    index = champollion.parser.storage.EnvironmentIndex(path)
+    loads = mocker.spy(champollion.parser.storage.pickle, "loads")
+
+    assert len(index["data"]) == 1
+    assert list(index["function"]) == ["example.doSomething"]
+    assert loads.call_count == 0
+
+    index["data"]["example.DATA"]
+    index["data"]["example.DATA"]
+    assert loads.call_count == 1
+
+
+def test_environment_index_pickle(environment, temporary_directory):
+    """Pickle index without its content."""
+    path = os.path.join(temporary_directory, "index.bin")
+    digest = champollion.parser.storage.write_index(environment, path)
+
+    index = champollion.parser.storage.EnvironmentIndex(path)
+    assert index.digest == digest
+
+    data = pickle.dumps(index)
+    assert len(data) < 200
+
+    _index = pickle.loads(data)
+    assert _index.digest == digest
+    assert _index == index
+    assert _index["data"]["example.DATA"]["value"] == "42"
+
+    # Index written again with another content.
+    environment["data"]["example.DATA"]["value"] = "43"
+    champollion.parser.storage.write_index(environment, path)
+
+    other = champollion.parser.storage.EnvironmentIndex(path)
+    assert other != index
+    assert index["data"]["example.DATA"]["value"] == "42"
+    assert other["data"]["example.DATA"]["value"] == "43"
+
+
+def test_environment_index_incorrect(temporary_directory):
+    """Fail to read an incorrect index file."""
+    path = os.path.join(temporary_directory, "index.bin")
+
+    with open(path, "wb") as f:
+        f.write(b"incorrect content")
+
+    with pytest.raises(IOError):
+        champollion.parser.storage.EnvironmentIndex(path)